@@ -8,129 +8,99 @@ import json
 import os
 from datetime import datetime
 
+from modules.publisher.template_engine import Section, Theme, compile_template
 
-def load_latest_json():
-    """
-    加载最新的full_result_*.json文件
-    """
-    datas_dir = "datas"
-    json_files = [f for f in os.listdir(datas_dir) if f.startswith("full_result_") and f.endswith(".json")]
-    
-    if not json_files:
-        raise FileNotFoundError("在datas目录中未找到任何full_result_*.json文件")
-    
-    # 按文件名排序，获取最新的文件
-    json_files.sort(reverse=True)
-    latest_file = json_files[0]
-    
-    file_path = os.path.join(datas_dir, latest_file)
-    with open(file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    print(f"已加载文件: {latest_file}")
-    return data
-
-
-def generate_html(news_data):
-    """
-    根据新闻数据生成HTML内容，适用于微信公众号
-    """
-    date_str = news_data['date']
-    # 将日期格式化为更友好的形式
-    try:
-        date_obj = datetime.strptime(date_str, "%Y%m%d")
-        formatted_date = date_obj.strftime("%Y年%m月%d日")
-    except ValueError:
-        formatted_date = date_str
-
-    html_content = f"""<!DOCTYPE html>
-<html lang="zh-CN">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>新闻联播摘要 - {formatted_date}</title>
-    <style>
-        body {{
+# 样式表
+CSS = """
+        body {
             font-family: "Microsoft YaHei", Arial, sans-serif;
             line-height: 1.6;
             max-width: 800px;
             margin: 0 auto;
             padding: 20px;
             background-color: #f9f9f9;
-        }}
-        .header {{
+        }
+        .header {
             text-align: center;
             margin-bottom: 30px;
             padding: 20px;
             background-color: #fff;
             border-radius: 8px;
             box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-        }}
-        h1 {{
+        }
+        h1 {
             color: #333;
             margin-bottom: 10px;
             font-size: 24px;
-        }}
-        .date {{
+        }
+        .date {
             color: #666;
             font-size: 16px;
-        }}
-        .news-section {{
+        }
+        .news-section {
             background-color: #fff;
             margin-bottom: 25px;
             padding: 20px;
             border-radius: 8px;
             box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-        }}
-        h2 {{
+        }
+        h2 {
             color: #d43c33;
             border-bottom: 2px solid #d43c33;
             padding-bottom: 10px;
             margin-top: 0;
             font-size: 20px;
-        }}
-        .news-item {{
+        }
+        .news-item {
             margin-bottom: 25px;
             padding-bottom: 15px;
             border-bottom: 1px dashed #eee;
-        }}
-        .news-item:last-child {{
+        }
+        .news-item:last-child {
             border-bottom: none;
             margin-bottom: 0;
-        }}
-        .news-title {{
+        }
+        .news-title {
             color: #333;
             margin-top: 0;
             margin-bottom: 10px;
             font-size: 18px;
             font-weight: bold;
-        }}
-        .summary {{
+        }
+        .summary {
             background-color: #f8f8f8;
             padding: 15px;
             border-left: 4px solid #d43c33;
             margin: 15px 0;
-        }}
-        .keywords {{
+        }
+        .keywords {
             color: #7f8c8d;
             font-size: 14px;
             margin: 10px 0;
-        }}
-        .keywords span {{
+        }
+        .keywords span {
             background-color: #ecf0f1;
             padding: 3px 8px;
             border-radius: 12px;
             margin-right: 5px;
             display: inline-block;
             margin-bottom: 5px;
-        }}
-        .footer {{
+        }
+        .footer {
             text-align: center;
             margin-top: 30px;
             color: #7f8c8d;
             font-size: 14px;
-        }}
-    </style>
+        }
+    """
+
+PAGE_HEAD = """<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>新闻联播摘要 - {formatted_date}</title>
+    {style}
 </head>
 <body>
     <div class="header">
@@ -138,78 +108,123 @@ def generate_html(news_data):
         <div class="date">{formatted_date}</div>
     </div>
 
-    <div class="news-section">
-        <h2>国内要闻</h2>
 """
 
-    # 添加国内新闻
-    domestic_news = [item for item in news_data['domestic'] if item.get('summary', {}).get('category') != 'international']
-    for i, item in enumerate(domestic_news, 1):
-        summary = item.get('summary', {})
-        
-        html_content += f"""
-        <div class="news-item">
-            <h3 class="news-title">{i}. {summary.get('title', '无标题')}</h3>
-            <div class="summary">
-                <p>{summary.get('summary', '无摘要')}</p>
-            </div>
-"""
-        
-        # 添加关键词
-        keywords = summary.get('keywords', [])
-        if keywords:
-            html_content += f"""
-            <div class="keywords">
+SECTION_HEAD = """    <div class="news-section">
+        <h2>{heading}</h2>
 """
-            for keyword in keywords:
-                html_content += f"                <span>{keyword}</span>\n"
-            html_content += "            </div>\n"
-        
-        html_content += "        </div>\n"
 
-    html_content += """
+SECTION_TAIL = """
     </div>
 
-    <div class="news-section">
-        <h2>国际动态</h2>
 """
 
-    # 添加国际新闻（包括分类错误的）
-    international_news = news_data['international'] + [item for item in news_data['domestic'] if item.get('summary', {}).get('category') == 'international']
-    for i, item in enumerate(international_news, 1):
-        summary = item.get('summary', {})
-        
-        html_content += f"""
+NEWS_ITEM = """
         <div class="news-item">
-            <h3 class="news-title">{i}. {summary.get('title', '无标题')}</h3>
+            <h3 class="news-title">{index}. {title}</h3>
             <div class="summary">
-                <p>{summary.get('summary', '无摘要')}</p>
+                <p>{summary}</p>
             </div>
+{keywords}        </div>
 """
-        
-        # 添加关键词
-        keywords = summary.get('keywords', [])
-        if keywords:
-            html_content += f"""
+
+KEYWORDS_BLOCK = compile_template("""
             <div class="keywords">
-"""
-            for keyword in keywords:
-                html_content += f"                <span>{keyword}</span>\n"
-            html_content += "            </div>\n"
-        
-        html_content += "        </div>\n"
+{spans}            </div>
+""")
 
-    html_content += """
-    </div>
+KEYWORD_SPAN = compile_template("                <span>{keyword}</span>\n")
 
-    <div class="footer">
+PAGE_TAIL = """    <div class="footer">
         <p>© 2025 新闻联播摘要 | 数据来源：央视新闻</p>
     </div>
 </body>
 </html>
 """
+
+
+def _news_item_context(summary, index):
+    """
+    单条新闻的模板字段
+    """
+    keywords = summary.get('keywords', [])
+    keywords_html = ''
+    if keywords:
+        spans = ''.join(KEYWORD_SPAN.render(keyword=keyword) for keyword in keywords)
+        keywords_html = KEYWORDS_BLOCK.render(spans=spans)
+    return {
+        "index": index,
+        "title": summary.get('title', '无标题'),
+        "summary": summary.get('summary', '无摘要'),
+        "keywords": keywords_html,
+    }
+
+
+THEME = Theme('news_html', PAGE_HEAD, PAGE_TAIL, NEWS_ITEM, _news_item_context,
+              section_head=SECTION_HEAD, section_tail=SECTION_TAIL, css=CSS)
+
+
+def load_latest_json():
+    """
+    加载最新的full_result_*.json文件
+    """
+    datas_dir = "datas"
+    json_files = [f for f in os.listdir(datas_dir) if f.startswith("full_result_") and f.endswith(".json")]
+    
+    if not json_files:
+        raise FileNotFoundError("在datas目录中未找到任何full_result_*.json文件")
+    
+    # 按文件名排序，获取最新的文件
+    json_files.sort(reverse=True)
+    latest_file = json_files[0]
     
-    return html_content
+    file_path = os.path.join(datas_dir, latest_file)
+    with open(file_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
+    print(f"已加载文件: {latest_file}")
+    return data
+
+
+def _page_context(news_data):
+    """
+    页头和页尾模板的字段
+    """
+    date_str = news_data['date']
+    # 将日期格式化为更友好的形式
+    try:
+        date_obj = datetime.strptime(date_str, "%Y%m%d")
+        formatted_date = date_obj.strftime("%Y年%m月%d日")
+    except ValueError:
+        formatted_date = date_str
+    return {"formatted_date": formatted_date}
+
+
+def generate_html(news_data, renderer=None):
+    """
+    根据新闻数据生成HTML内容，适用于微信公众号
+    编辑预览时可传入长期存在的 PreviewRenderer，未改动的条目复用缓存的片段
+    """
+    return (renderer or THEME).render(_page_context(news_data), _sections(news_data))
+
+
+def write_html(news_data, file_path, renderer=None):
+    """
+    生成HTML并逐段写入文件（不在内存中拼出整页）
+    """
+    return (renderer or THEME).write(file_path, _page_context(news_data), _sections(news_data))
+
+
+def _sections(news_data):
+    """
+    国内、国际两个分区，国内新闻中分类为国际的条目移到国际分区
+    """
+    domestic_news = [item for item in news_data['domestic'] if item.get('summary', {}).get('category') != 'international']
+    international_news = news_data['international'] + [item for item in news_data['domestic'] if item.get('summary', {}).get('category') == 'international']
+    return [
+        Section([item.get('summary', {}) for item in domestic_news], {"heading": "国内要闻"}),
+        Section([item.get('summary', {}) for item in international_news], {"heading": "国际动态"}),
+    ]
 
 
 def save_html(html_content, date_str):
@@ -238,12 +253,11 @@ def main():
         # 加载最新的JSON数据
         news_data = load_latest_json()
         
-        # 生成HTML内容
-        html_content = generate_html(news_data)
-        
-        # 保存HTML文件
-        date_str = news_data['date']
-        file_path = save_html(html_content, date_str)
+        # 生成HTML并逐段写入文件，按照规范保存到datas目录
+        output_dir = "datas"
+        os.makedirs(output_dir, exist_ok=True)
+        file_path = write_html(news_data, os.path.join(output_dir, f"news_summary_{news_data['date']}.html"))
+        print(f"HTML文件已保存到: {file_path}")
         
         print(f"成功生成新闻摘要HTML文件: {file_path}")
         
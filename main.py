@@ -8,32 +8,79 @@
 import json
 import re
 import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-import akshare as ak
 import requests
+from requests.adapters import HTTPAdapter
 import os
+import time
+from modules.utils.keyword_automaton import KeywordAutomaton
+from modules.utils.summary_cache import SummaryCache
+from modules.scraper.raw_transcript_store import fetch_news_contents
+from modules.processor.boilerplate_engine import BoilerplateEngine
+from modules.utils.pipeline_logger import get_logger, log_stage, setup_logging
+from modules.utils.llm_backend import get_backend, is_llm_available
+from modules.utils.ollama_client import OllamaStreamClient
+from modules.analyzer.batch_summarizer import (BATCH_PROMPT_VERSION, DEFAULT_CONTEXT_TOKENS, OUTPUT_TOKENS_PER_ITEM,
+                                               iter_batches, summarize_in_batches)
 
-# 检查是否可以连接到 Ollama
-try:
-    response = requests.get("http://localhost:11434/api/tags", timeout=5)
-    LLM_AVAILABLE = response.status_code == 200
-    if LLM_AVAILABLE:
-        print("Ollama 服务可用，将使用大模型进行摘要")
-    else:
-        print("Ollama 服务不可用，将使用简化版摘要功能")
-except:
-    LLM_AVAILABLE = False
-    print("提示: 无法连接到 Ollama，将使用简化版摘要功能")
+logger = get_logger()
+
+# Ollama 生成接口地址
+OLLAMA_GENERATE_URL = "http://localhost:11434/api/generate"
+
+# 摘要使用的模型，以及提示词版本（修改提示词时递增，使旧缓存失效）
+OLLAMA_MODEL = "qwen2:7b"
+SUMMARY_PROMPT_VERSION = 1
+
+# 批量摘要使用另一套提示词，输出与单条摘要不同，缓存分开
+BATCH_SUMMARY_PROMPT_VERSION = f"batch-{BATCH_PROMPT_VERSION}"
+
+# 单条摘要最多生成的 token 数（JSON 闭合后会提前结束）
+SUMMARY_MAX_TOKENS = 256
+
+# 默认的大模型摘要并发数
+DEFAULT_LLM_WORKERS = 4
+
+# 默认每次请求摘要的新闻条数（1 表示不合并请求）
+DEFAULT_LLM_BATCH_SIZE = 1
+
+# 批量摘要时模型的上下文长度（token）
+LLM_CONTEXT_TOKENS = DEFAULT_CONTEXT_TOKENS
+
+# 批量回填时默认的并发下载数
+DEFAULT_FETCH_WORKERS = 4
+
+# 流水线各阶段（按数据流动顺序），用于统计条数和耗时
+PIPELINE_STAGES = ('raw_lines', 'cleaned_lines', 'segments', 'processed', 'classified')
 
 
 class NewsProcessor:
-    def __init__(self):
+    def __init__(self, llm_workers=DEFAULT_LLM_WORKERS, use_cache=True, boilerplate_file=None,
+                 print_raw=False, llm_batch_size=DEFAULT_LLM_BATCH_SIZE):
         """
         初始化新闻处理器
+
+        Args:
+            llm_workers (int): 并发请求 Ollama 的最大线程数
+            use_cache (bool): 是否使用 datas/ 下的摘要缓存
+            boilerplate_file (str): 可选，TemplateGenerator.save_patterns 生成的模板文件
+            print_raw (bool): 是否逐行输出原始数据
+            llm_batch_size (int): 每次请求 Ollama 摘要的最多新闻条数，大于 1 时多条新闻共用一个提示词
         """
+        self.llm_workers = max(1, llm_workers)
+        self.llm_batch_size = max(1, llm_batch_size)
+        self.print_raw = print_raw
+        self._session = None
+        self._llm_client = None
+
         # 确保 datas 和 xinwen 目录存在
         os.makedirs("datas", exist_ok=True)
         os.makedirs("xinwen", exist_ok=True)
+
+        # 大模型摘要缓存（按文本哈希、模型和提示词版本索引）
+        self.summary_cache = SummaryCache() if use_cache else None
         
         # 定义 boilerplate 模板（新闻联播固定模式）
         self.boilerplate_patterns = [
@@ -52,8 +99,10 @@ class NewsProcessor:
             r'^据新华社消息.*$',                             # 新闻来源提示
         ]
 
-        # 编译正则表达式
-        self.boilerplate_regex = [re.compile(p) for p in self.boilerplate_patterns]
+        # 将所有模板编译为一个匹配引擎，每行只需匹配一次
+        self.boilerplate_engine = BoilerplateEngine(self.boilerplate_patterns)
+        if boilerplate_file:
+            self.boilerplate_engine.load_file(boilerplate_file)
 
         # 定义分割点的正则表达式（更全面的新闻分割标识）
         self.split_re = re.compile(
@@ -67,6 +116,9 @@ class NewsProcessor:
             r'^(?:以色列|美国|俄罗斯|日本|韩国|英国|法国|德国|意大利|加拿大|澳大利亚|巴西|印度|埃及|南非|墨西哥|马来西亚|加沙|联合国|东盟|欧盟).*?'  # 国际地名和组织开头的新闻
         )
 
+        # 数字标识（包括中文数字），如"1: 2:"
+        self.numeric_marker_re = re.compile(r'(?:(?:[一二三四五六七八九十]+|[1-9]\d*)[:：]\s*)')
+
         # 国际新闻起始标识
         self.international_start = re.compile(r'^下面.*?国际')
 
@@ -115,89 +167,131 @@ class NewsProcessor:
             '总统', '首相', '总理', '外长', '大使', '联合国秘书长', '欧盟', '北约', '世卫组织'
         ]
 
-    def fetch_news(self, date_str):
+        # 国际活动标识
+        self.international_indicators = ['当地时间', ' foreign ', ' international ']
+
+        # 国外地名和国际组织（用于判断国际新闻）
+        self.foreign_locations = [
+            '美国', '俄罗斯', '日本', '韩国', '英国', '法国', '德国', '意大利',
+            '加拿大', '澳大利亚', '巴西', '印度', '埃及', '南非', '墨西哥', '马来西亚',
+            '以色列', '加沙', '联合国', '东盟', '欧盟', '芬兰'
+        ]
+
+        # 人名识别使用的职务关键词
+        self.ner_person_keywords = [
+            '总书记', '主席', '总理', '委员长', '部长', '省长', '市长', '书记', '代表', '委员', '总统', '首相'
+        ]
+
+        # 简单摘要使用的关键词和国际分类关键词
+        self.summary_keywords = ['经济', '政治', '国际', '国内', '发展', '建设', '会议', '政策', '合作', '科技']
+        self.summary_international_keywords = ['国际', '外交', '合作', '美国', '俄罗斯', '日本', '韩国', '欧盟', '联合国']
+
+        # 将所有关键词表编译为一个多模式匹配自动机，每段文本只需扫描一次
+        self.keyword_automaton = KeywordAutomaton({
+            'location': self.location_keywords,
+            'organization': self.org_keywords,
+            'domestic': self.domestic_keywords,
+            'international': self.international_keywords,
+            'domestic_person': self.domestic_person_keywords,
+            'international_person': self.international_person_keywords,
+            'international_indicator': self.international_indicators,
+            'foreign_location': self.foreign_locations,
+            'ner_person': self.ner_person_keywords,
+            'summary_keyword': self.summary_keywords,
+            'summary_international': self.summary_international_keywords,
+        })
+
+    def fetch_news(self, date_str, fallback_to_previous=True):
         """
         获取指定日期的新闻联播数据
+
+        Args:
+            date_str (str): 日期，格式为YYYYMMDD
+            fallback_to_previous (bool): 当天无数据时是否改用前一天的数据
         """
         try:
-            print(f"正在获取 {date_str} 的新闻数据...")
-            raw_data = ak.news_cctv(date=date_str)
-            print(f"获取到 {len(raw_data)} 条数据")
-            if len(raw_data) == 0:
-                print(f"警告: {date_str} 没有可用的新闻数据")
+            logger.info(f"正在获取 {date_str} 的新闻数据...")
+            raw_content = fetch_news_contents(date_str)
+            logger.info(f"获取到 {len(raw_content)} 条数据")
+            if len(raw_content) == 0:
+                logger.warning(f"警告: {date_str} 没有可用的新闻数据")
+                if not fallback_to_previous:
+                    return None
                 # 尝试前一天的数据
                 prev_date = (datetime.strptime(date_str, "%Y%m%d") - timedelta(days=1)).strftime("%Y%m%d")
-                print(f"尝试获取前一天 {prev_date} 的数据...")
-                raw_data = ak.news_cctv(date=prev_date)
-                print(f"获取到 {len(raw_data)} 条数据")
-                if len(raw_data) == 0:
-                    print(f"警告: {prev_date} 也没有可用的新闻数据")
+                logger.info(f"尝试获取前一天 {prev_date} 的数据...")
+                raw_content = fetch_news_contents(prev_date)
+                logger.info(f"获取到 {len(raw_content)} 条数据")
+                if len(raw_content) == 0:
+                    logger.warning(f"警告: {prev_date} 也没有可用的新闻数据")
                     return None
                 else:
-                    print(f"使用 {prev_date} 的数据")
-                    return raw_data['content'].tolist()
-            return raw_data['content'].tolist()
+                    logger.info(f"使用 {prev_date} 的数据")
+                    return raw_content
+            return raw_content
         except Exception as e:
-            print(f"获取 {date_str} 的数据失败: {e}")
+            logger.warning(f"获取 {date_str} 的数据失败: {e}")
             return None
 
+    def iter_raw_lines(self, raw_content):
+        """
+        逐行产出原始内容，结果与 '\n'.join(raw_content).splitlines() 一致
+        """
+        previous = None
+        for item in raw_content:
+            if previous is not None:
+                # 非最后一条内容后面跟着连接用的换行符
+                yield from (previous + '\n').splitlines()
+            previous = item
+        if previous is not None:
+            yield from previous.splitlines()
+
+    def iter_cleaned_lines(self, lines):
+        """
+        流式清洗：逐行过滤 boilerplate 内容
+        """
+        is_boilerplate = self.boilerplate_engine.is_boilerplate
+        for line in lines:
+            if not is_boilerplate(line):
+                yield line
+
     def clean_news_content(self, raw_content):
         """
         清洗单期新闻联播内容
         """
-        # 将所有内容连接并按行分割
-        lines = '\n'.join(raw_content).splitlines()
-        
-        # 移除 boilerplate 内容
-        cleaned_lines = []
-        for line in lines:
-            is_boilerplate = False
-            for pattern in self.boilerplate_regex:
-                if pattern.match(line):
-                    is_boilerplate = True
-                    break
-            if not is_boilerplate:
-                cleaned_lines.append(line)
-        
-        return cleaned_lines
+        return list(self.iter_cleaned_lines(self.iter_raw_lines(raw_content)))
 
-    def split_news_segments(self, cleaned_lines):
+    def iter_segments(self, cleaned_lines):
         """
-        将清洗后的新闻内容按逻辑分割成独立的新闻片段
+        流式分割：遇到分割点即产出上一段（已按数字标识进一步拆分）的新闻片段
         """
-        # 先按现有逻辑进行分割
-        segments = []
         buffer = []
         
         for line in cleaned_lines:
             # 检查是否有分割点
             if self.split_re.search(line) and buffer:
-                # 如果缓冲区有内容，先保存之前的段落
-                segments.append(' '.join(buffer))
+                # 如果缓冲区有内容，先产出之前的段落
+                yield from self._split_by_numeric_markers(' '.join(buffer))
                 buffer = []
             
             buffer.append(line)
         
         # 添加最后一段
         if buffer:
-            segments.append(' '.join(buffer))
-        
-        # 对分割后的片段进一步处理，专门处理数字标识内容
-        refined_segments = []
-        for segment in segments:
-            # 将包含数字标识的内容进一步拆分
-            sub_segments = self._split_by_numeric_markers(segment)
-            refined_segments.extend(sub_segments)
-        
-        return refined_segments
+            yield from self._split_by_numeric_markers(' '.join(buffer))
+
+    def split_news_segments(self, cleaned_lines):
+        """
+        将清洗后的新闻内容按逻辑分割成独立的新闻片段
+        """
+        return list(self.iter_segments(cleaned_lines))
 
     def _split_by_numeric_markers(self, text):
         """
         根据数字标识（如"1: 2:"）将文本进一步分割
+        单次遍历所有标识，每个标识的内容截止到其后第一个不紧挨着它的标识
         """
-        # 匹配数字标识的正则表达式（包括中文数字）
-        pattern = r'(?:(?:[一二三四五六七八九十]+|[1-9]\d*)[:：]\s*)'
-        matches = list(re.finditer(pattern, text))
+        matches = list(self.numeric_marker_re.finditer(text))
         
         # 如果没有找到数字标识，直接返回原文本
         if not matches:
@@ -206,186 +300,188 @@ class NewsProcessor:
         # 分割文本
         sub_segments = []
         last_end = 0
+        next_index = 0
         
-        for match in matches:
+        for index, match in enumerate(matches):
             # 添加标识前的内容（如果有）
             if match.start() > last_end:
                 prev_text = text[last_end:match.start()].strip()
                 if prev_text:
                     sub_segments.append(prev_text)
             
-            # 添加标识后的内容直到下一个标识或文本结束
-            marker = match.group(0)
-            marker_end = match.end()
-            
-            # 查找下一个标识的位置
-            next_start = len(text)
-            for next_match in matches:
-                if next_match.start() > match.end():
-                    next_start = next_match.start()
-                    break
+            # 查找下一个标识的位置：标识的起止位置都单调递增，指针只需向前移动
+            next_index = max(next_index, index + 1)
+            while next_index < len(matches) and matches[next_index].start() <= match.end():
+                next_index += 1
+            next_start = matches[next_index].start() if next_index < len(matches) else len(text)
             
             # 提取从当前标识到下一个标识之间的内容
-            segment_content = text[marker_end:next_start].strip()
-            if segment_content:
-                sub_segments.append(marker + segment_content)
-            else:
-                sub_segments.append(marker)
+            segment_content = text[match.end():next_start].strip()
+            sub_segments.append(match.group(0) + segment_content)
             
             last_end = next_start
         
-        # 添加剩余内容（如果有）
-        if last_end < len(text):
-            remaining_text = text[last_end:].strip()
-            if remaining_text:
-                # 如果最后一个片段是数字标识，则与其合并
-                if re.match(r'^(?:[一二三四五六七八九十]+|[1-9]\d*)[:：]\s*$', sub_segments[-1]):
-                    sub_segments[-1] = sub_segments[-1] + remaining_text
-                else:
-                    sub_segments.append(remaining_text)
+        return sub_segments
+
+    def scan_keywords(self, text):
+        """
+        单次扫描文本，返回所有关键词表的命中结果
+        """
+        return self.keyword_automaton.scan(text)
+
+    def iter_classified(self, segments, segment_hits=None):
+        """
+        流式分类国内/国际新闻，产出 (分类, 片段, 关键词命中)
+
+        segment_hits 为可选的 {片段: 关键词命中} 映射，传入时复用已有扫描结果
+        """
+        def scanned():
+            for segment in segments:
+                hits = segment_hits.get(segment) if segment_hits else None
+                if hits is None:
+                    hits = self.scan_keywords(segment)
+                yield segment, hits
+
+        for category, (segment, hits) in self._iter_categories(scanned(), lambda entry: entry):
+            yield category, segment, hits
+
+    def _iter_categories(self, items, entry_of):
+        """
+        为流式条目确定国内/国际分类，产出 (分类, 条目)
+        1. 出现明确的国际新闻标识后，之前的片段为国内新闻，之后（含）全部为国际新闻
+        2. 如果始终没有找到标识，则根据内容特征逐条分类
+        标识之前的条目要等到找到标识（或输入结束）才能确定分类，需要暂存；
+        流式管道因此先摘要再分类，暂存的是已完成摘要的结果，不会推迟摘要
+
+        Args:
+            items: 条目的可迭代对象
+            entry_of (callable): 返回条目的 (片段, 关键词命中)
+        """
+        pending = []
+        found_international_start = False
+
+        for item in items:
+            if found_international_start:
+                yield 'international', item
+            elif self.international_start.search(entry_of(item)[0]):
+                found_international_start = True
+                for pending_item in pending:
+                    yield 'domestic', pending_item
+                pending = []
+                yield 'international', item
+            else:
+                pending.append(item)
+
+        # 没有找到国际新闻标识，则根据内容特征分类
+        for item in pending:
+            yield self._classify_by_content(*entry_of(item)), item
+
+    def _classify_by_content(self, segment, hits):
+        """
+        根据内容特征判断单条新闻属于国内还是国际
+        """
+        # 检查是否明显属于国际新闻
+        is_international = self._is_international_news(segment, hits)
         
-        # 过滤掉空片段
-        sub_segments = [seg for seg in sub_segments if seg.strip()]
+        # 检查是否明显属于国内新闻
+        is_domestic = self._is_domestic_news(segment, hits)
         
-        return sub_segments if sub_segments else [text]
+        # 根据判断结果分类
+        if is_international and not is_domestic:
+            return 'international'
+        elif is_domestic and not is_international:
+            return 'domestic'
+        elif is_international and is_domestic:
+            # 如果同时包含国内外特征，根据主要特征判断
+            # 优先考虑国际特征（因为国内新闻通常不会包含国外地名）
+            return 'international' if self._has_foreign_locations(segment, hits) else 'domestic'
+        # 如果都没有明显特征，默认归为国内
+        return 'domestic'
 
-    def classify_domestic_international(self, segments):
+    def classify_domestic_international(self, segments, segment_hits=None):
         """
         将新闻片段分为国内和国际两类
         优化分类逻辑：
         1. 首先查找明确的国际新闻标识
         2. 如果没有找到，则根据内容特征进行分类
         3. 对于长文本，检查是否包含国内重要关键词
+
+        segment_hits 为可选的 {片段: 关键词命中} 映射，传入时复用已有扫描结果
         """
-        international_start_index = None
-        for i, segment in enumerate(segments):
-            if self.international_start.search(segment):
-                international_start_index = i
-                break
-        
-        if international_start_index is not None:
-            domestic = segments[:international_start_index]
-            international = segments[international_start_index:]
-        else:
-            # 如果没找到国际新闻标识，则根据内容特征分类
-            domestic = []
-            international = []
-            
-            for segment in segments:
-                # 检查是否明显属于国际新闻
-                is_international = self._is_international_news(segment)
-                
-                # 检查是否明显属于国内新闻
-                is_domestic = self._is_domestic_news(segment)
-                
-                # 根据判断结果分类
-                if is_international and not is_domestic:
-                    international.append(segment)
-                elif is_domestic and not is_international:
-                    domestic.append(segment)
-                elif is_international and is_domestic:
-                    # 如果同时包含国内外特征，根据主要特征判断
-                    # 优先考虑国际特征（因为国内新闻通常不会包含国外地名）
-                    if self._has_foreign_locations(segment):
-                        international.append(segment)
-                    else:
-                        domestic.append(segment)
-                else:
-                    # 如果都没有明显特征，默认归为国内
-                    domestic.append(segment)
-        
+        domestic = []
+        international = []
+        for category, segment, _ in self.iter_classified(segments, segment_hits):
+            if category == 'international':
+                international.append(segment)
+            else:
+                domestic.append(segment)
         return domestic, international
 
-    def _is_international_news(self, text):
+    def _is_international_news(self, text, hits=None):
         """
         判断文本是否属于国际新闻
         """
-        # 检查是否包含国际关键词
-        for keyword in self.international_keywords:
-            if keyword in text:
-                return True
-                
-        # 检查是否包含国际人物或职位关键词
-        for keyword in self.international_person_keywords:
-            if keyword in text:
-                return True
-                
-        # 检查是否包含国际活动标识
-        international_indicators = ['当地时间', ' foreign ', ' international ']
-        for indicator in international_indicators:
-            if indicator in text:
-                return True
-                
-        # 检查是否包含较多国外地名
-        foreign_location_count = 0
-        for loc in ['美国', '俄罗斯', '日本', '韩国', '英国', '法国', '德国', '意大利', 
-                   '加拿大', '澳大利亚', '巴西', '印度', '埃及', '南非', '墨西哥', '马来西亚',
-                   '以色列', '加沙', '联合国', '东盟', '欧盟', '芬兰']:
-            if loc in text:
-                foreign_location_count += 1
+        if hits is None:
+            hits = self.scan_keywords(text)
+
+        # 检查是否包含国际关键词、国际人物或职位关键词、国际活动标识
+        if (hits.has('international') or hits.has('international_person')
+                or hits.has('international_indicator')):
+            return True
                 
         # 如果包含多个国外地名，更可能是国际新闻
-        if foreign_location_count >= 2:
+        if len(hits.keywords('foreign_location')) >= 2:
             return True
             
         return False
 
-    def _is_domestic_news(self, text):
+    def _is_domestic_news(self, text, hits=None):
         """
         判断文本是否属于国内新闻
         """
-        # 检查是否包含国内关键词
-        for keyword in self.domestic_keywords:
-            if keyword in text:
-                return True
-                
-        # 检查是否包含国内人物或职位关键词
-        for keyword in self.domestic_person_keywords:
-            if keyword in text:
-                return True
-                
-        return False
+        if hits is None:
+            hits = self.scan_keywords(text)
+
+        # 检查是否包含国内关键词或国内人物、职位关键词
+        return hits.has('domestic') or hits.has('domestic_person')
 
-    def _has_foreign_locations(self, text):
+    def _has_foreign_locations(self, text, hits=None):
         """
         检查文本是否包含国外地名
         """
-        foreign_locations = ['美国', '俄罗斯', '日本', '韩国', '英国', '法国', '德国', '意大利', 
-                            '加拿大', '澳大利亚', '巴西', '印度', '埃及', '南非', '墨西哥', '马来西亚',
-                            '以色列', '加沙', '联合国', '东盟', '欧盟', '芬兰']
-        for loc in foreign_locations:
-            if loc in text:
-                return True
-        return False
+        if hits is None:
+            hits = self.scan_keywords(text)
+        return hits.has('foreign_location')
 
-    def simple_ner(self, text):
+    def simple_ner(self, text, hits=None):
         """
         简单命名实体识别
         """
-        # 地名识别
-        locations = []
-        for loc in self.location_keywords:
-            if loc in text and loc not in locations:
-                locations.append(loc)
+        if hits is None:
+            hits = self.scan_keywords(text)
+
+        # 地名识别（保持关键词表顺序）
+        locations = [loc for loc in self.location_keywords if hits.contains(loc)]
+        locations = list(dict.fromkeys(locations))
         
         # 人名识别（基于职务关键词）
         persons = []
-        person_keywords = ['总书记', '主席', '总理', '委员长', '部长', '省长', '市长', '书记', '代表', '委员', '总统', '首相']
-        
-        for keyword in person_keywords:
-            if keyword in text:
+        for keyword in self.ner_person_keywords:
+            offset = hits.first_offset(keyword)
+            if offset >= 0:
                 # 提取关键词前后的内容作为人物提及
-                start = max(0, text.find(keyword) - 10)
-                end = min(len(text), text.find(keyword) + len(keyword) + 5)
+                start = max(0, offset - 10)
+                end = min(len(text), offset + len(keyword) + 5)
                 persons.append(text[start:end])
         
         # 组织名识别
         organizations = []
         for keyword in self.org_keywords:
-            if keyword in text:
+            offset = hits.first_offset(keyword)
+            if offset >= 0:
                 # 提取关键词前后的内容作为组织提及
-                start = max(0, text.find(keyword) - 5)
-                end = min(len(text), text.find(keyword) + len(keyword) + 10)
+                start = max(0, offset - 5)
+                end = min(len(text), offset + len(keyword) + 10)
                 org_mention = text[start:end]
                 if org_mention not in organizations:
                     organizations.append(org_mention)
@@ -396,10 +492,13 @@ class NewsProcessor:
             "organizations": organizations
         }
 
-    def simple_summarize(self, text):
+    def simple_summarize(self, text, hits=None):
         """
         简单摘要方法
         """
+        if hits is None:
+            hits = self.scan_keywords(text)
+
         # 清洗文本
         cleaned_text = re.sub(r'\s+', ' ', text.strip())
         
@@ -408,19 +507,10 @@ class NewsProcessor:
         summary = ''.join(sentences[:2])[:120]  # 前两句，最多120字符
         
         # 简单关键词提取
-        keywords = []
-        keyword_candidates = ['经济', '政治', '国际', '国内', '发展', '建设', '会议', '政策', '合作', '科技']
-        for keyword in keyword_candidates:
-            if keyword in text:
-                keywords.append(keyword)
+        keywords = [keyword for keyword in self.summary_keywords if hits.contains(keyword)]
         
         # 简单分类
-        category = "domestic"
-        international_keywords = ['国际', '外交', '合作', '美国', '俄罗斯', '日本', '韩国', '欧盟', '联合国']
-        for keyword in international_keywords:
-            if keyword in text:
-                category = "international"
-                break
+        category = "international" if hits.has('summary_international') else "domestic"
         
         # 标题（取前20个字符）
         title = cleaned_text[:20].strip()
@@ -432,12 +522,32 @@ class NewsProcessor:
             "category": category
         }
 
-    def llm_summarize(self, text):
+    @property
+    def session(self):
         """
-        使用 Ollama 进行摘要
+        复用连接的 HTTP 会话，连接池大小与并发数一致
+        """
+        if self._session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.llm_workers)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
+
+    @property
+    def llm_client(self):
+        """
+        流式调用 Ollama 的客户端，复用 session 的连接池并汇总各次请求的指标
+        """
+        if self._llm_client is None:
+            self._llm_client = OllamaStreamClient(OLLAMA_GENERATE_URL, session=self.session)
+        return self._llm_client
+
+    def _ollama_summarize(self, text):
+        """
+        调用 Ollama 生成摘要，失败时返回 None
         """
-        if not LLM_AVAILABLE:
-            return self.simple_summarize(text)
         prompt = f"""你是一名央视新闻联播的资深编辑，任务是对下面这段新闻进行「分类 + 摘要 + 关键词」抽取。
 输出必须是一段 **合法 JSON**，格式如下（不要添加任何代码块标记）：
 {{
@@ -450,98 +560,303 @@ class NewsProcessor:
 {text}
 """
         
-        payload = {
-            "model": "qwen2:7b",
-            "prompt": prompt,
-            "stream": False,
-            "format": "json"
-        }
-        
         try:
-            response = requests.post("http://localhost:11434/api/generate", json=payload, timeout=120)
-            result = response.json()
-            return json.loads(result['response'])
+            content, _ = self.llm_client.generate(OLLAMA_MODEL, prompt, max_tokens=SUMMARY_MAX_TOKENS,
+                                                  stop_on_json=True, format="json")
+            return json.loads(content)
         except Exception as e:
-            print(f"Ollama 摘要失败: {e}")
-            return self.simple_summarize(text)
+            logger.warning(f"Ollama 摘要失败: {e}")
+            return None
+
+    def _ollama_generate_batch(self, prompt, count):
+        """
+        调用 Ollama 摘要一批新闻，返回模型的原始输出
+        """
+        content, _ = self.llm_client.generate(OLLAMA_MODEL, prompt, max_tokens=OUTPUT_TOKENS_PER_ITEM * count,
+                                              stop_on_json=True, format="json",
+                                              options={"num_ctx": LLM_CONTEXT_TOKENS})
+        return content
+
+    def _summarize_batch(self, entries):
+        """
+        摘要一批新闻，返回 [(摘要, 摘要方法)]；缓存未命中的新闻合并为一个请求，
+        模型输出格式不对时拆分重试，仍失败的按条回退到简单摘要
+
+        Args:
+            entries (list): (片段, 关键词命中) 列表
+        """
+        results = [None] * len(entries)
+        pending = []
+        for i, (text, _) in enumerate(entries):
+            if self.summary_cache is not None:
+                summary = self.summary_cache.get(text, OLLAMA_MODEL, BATCH_SUMMARY_PROMPT_VERSION)
+                if summary is not None:
+                    results[i] = (summary, "大模型")
+                    continue
+            pending.append(i)
+
+        if pending and is_llm_available():
+            def on_error(texts, error):
+                logger.warning(f"Ollama 批量摘要失败（{len(texts)} 条）: {error}")
+
+            summaries = summarize_in_batches([entries[i][0] for i in pending],
+                                             self._ollama_generate_batch, on_error=on_error)
+            for i, summary in zip(pending, summaries):
+                if summary is None:
+                    continue
+                if self.summary_cache is not None:
+                    self.summary_cache.put(entries[i][0], OLLAMA_MODEL, BATCH_SUMMARY_PROMPT_VERSION, summary)
+                results[i] = (summary, "大模型")
+
+        for i in pending:
+            if results[i] is None:
+                text, hits = entries[i]
+                results[i] = (self.simple_summarize(text, hits), "简单程序")
+        return results
+
+    def _iter_batches(self, items, text_of=None):
+        """
+        按批量大小和模型上下文长度分批
+        """
+        return iter_batches(items, self.llm_batch_size, LLM_CONTEXT_TOKENS, text_of)
+
+    def llm_summarize(self, text, hits=None):
+        """
+        使用 Ollama 进行摘要
+        """
+        summary, _ = self._summarize_segment(text, hits)
+        return summary
+
+    def _summarize_segment(self, text, hits=None):
+        """
+        摘要单条新闻，返回 (摘要, 摘要方法)；大模型失败时按条回退到简单摘要
+        缓存命中时直接返回之前的大模型摘要
+        """
+        if self.summary_cache is not None:
+            summary = self.summary_cache.get(text, OLLAMA_MODEL, SUMMARY_PROMPT_VERSION)
+            if summary is not None:
+                return summary, "大模型"
+
+        if is_llm_available():
+            summary = self._ollama_summarize(text)
+            if summary is not None:
+                if self.summary_cache is not None:
+                    self.summary_cache.put(text, OLLAMA_MODEL, SUMMARY_PROMPT_VERSION, summary)
+                return summary, "大模型"
+        return self.simple_summarize(text, hits), "简单程序"
+
+    def _iter_ordered(self, func, items):
+        """
+        用有界线程池并发执行 func，按输入顺序逐个产出结果
+        输入可以是生成器：同时在途的任务不超过并发数的两倍，上游边产出、下游边处理
+        """
+        if self.llm_workers == 1 or not is_llm_available():
+            for item in items:
+                yield func(item)
+            return
+
+        window = self.llm_workers * 2
+        with ThreadPoolExecutor(max_workers=self.llm_workers) as executor:
+            pending = deque()
+            for item in items:
+                pending.append(executor.submit(func, item))
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def summarize_segments(self, segments, segment_hits=None):
+        """
+        并发摘要多条新闻，结果保持与输入相同的顺序
+
+        Args:
+            segments (list): 新闻片段列表
+            segment_hits (dict): 可选的 {片段: 关键词命中} 映射
+
+        Returns:
+            list: (摘要, 摘要方法) 列表
+        """
+        segment_hits = segment_hits or {}
+        if self.llm_batch_size > 1:
+            results = []
+            entries = ((segment, segment_hits.get(segment)) for segment in segments)
+            for batch in self._iter_ordered(self._summarize_batch,
+                                            self._iter_batches(entries, lambda e: e[0])):
+                results.extend(batch)
+            return results
+        return list(self._iter_ordered(
+            lambda segment: self._summarize_segment(segment, segment_hits.get(segment)),
+            segments
+        ))
+
+    def iter_processed(self, classified):
+        """
+        流式实体识别和摘要：输入 (分类, 片段, 关键词命中)，按输入顺序产出处理结果
+        分类可以为 None，由调用方之后补充
+        """
+        def build(entry, summary, summary_method):
+            category, segment, hits = entry
+            return {
+                "category": category,
+                "text": segment,
+                "entities": self.simple_ner(segment, hits),
+                "summary": summary,
+                "summary_method": summary_method  # 添加摘要方法信息
+            }
+
+        def process(entry):
+            return build(entry, *self._summarize_segment(entry[1], entry[2]))
+
+        def process_batch(batch):
+            summaries = self._summarize_batch([(segment, hits) for _, segment, hits in batch])
+            return [build(entry, *result) for entry, result in zip(batch, summaries)]
+
+        if self.llm_batch_size == 1:
+            return self._iter_ordered(process, classified)
+        return (item
+                for batch in self._iter_ordered(process_batch, self._iter_batches(classified, lambda e: e[1]))
+                for item in batch)
+
+    def stream_raw_content(self, raw_content, stats=None):
+        """
+        流式处理管道：清洗 → 分割 → 实体识别 → 摘要 → 分类
+        各阶段都是生成器，前面的新闻片段可以在后面的内容还在清洗时就开始摘要，
+        调用方（JSON 写入、HTML 渲染、发布等）可以逐条消费结果；
+        摘要不依赖分类，因此分类放在摘要之后，国内新闻不必等到国际新闻标识出现才开始摘要
+
+        Args:
+            raw_content (list): 原始内容列表
+            stats (dict): 可选，用于累计各阶段的处理条数；其中 seconds 字段记录
+                各阶段累计耗时（含上游阶段的耗时，见 stage_durations）
+
+        Yields:
+            dict: 带 category 字段的单条新闻处理结果
+        """
+        if stats is None:
+            stats = {}
+        for key in PIPELINE_STAGES + ('domestic', 'international'):
+            stats.setdefault(key, 0)
+        seconds = stats.setdefault('seconds', {})
+        for key in PIPELINE_STAGES:
+            seconds.setdefault(key, 0.0)
+
+        def counted(items, key):
+            iterator = iter(items)
+            while True:
+                started = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    seconds[key] += time.perf_counter() - started
+                    return
+                seconds[key] += time.perf_counter() - started
+                stats[key] += 1
+                yield item
+
+        lines = counted(self.iter_raw_lines(raw_content), 'raw_lines')
+        cleaned = counted(self.iter_cleaned_lines(lines), 'cleaned_lines')
+        segments = counted(self.iter_segments(cleaned), 'segments')
+
+        segment_hits = {}
+
+        def scanned():
+            for segment in segments:
+                hits = segment_hits[segment] = self.scan_keywords(segment)
+                yield None, segment, hits
+
+        processed = counted(self.iter_processed(scanned()), 'processed')
+        classified = self._iter_categories(processed, lambda item: (item['text'], segment_hits[item['text']]))
+        for category, item in counted(classified, 'classified'):
+            item['category'] = category
+            stats[category] += 1
+            yield item
+
+    @staticmethod
+    def stage_durations(stats):
+        """
+        将 stream_raw_content 记录的累计耗时换算为各阶段自身的耗时
+        （下游阶段拉取数据时会执行上游阶段，因此需要逐级相减）
+        """
+        durations = {}
+        upstream = 0.0
+        for key in PIPELINE_STAGES:
+            inclusive = stats.get('seconds', {}).get(key, 0.0)
+            durations[key] = max(0.0, inclusive - upstream)
+            upstream = inclusive
+        return durations
+
+    def stream_one_day(self, date_str, stats=None):
+        """
+        流式处理单日新闻联播数据：获取 → 清洗 → 分割 → 分类 → 实体识别 → 摘要
+        获取失败时不产出任何结果
+        """
+        raw_content = self.fetch_news(date_str)
+        if not raw_content:
+            return
+        yield from self.stream_raw_content(raw_content, stats)
 
     def process_one_day(self, date_str):
         """
         处理单日新闻联播数据
         """
         # 步骤1: 获取原始数据
-        print("步骤1: 获取原始数据")
+        logger.info("步骤1: 获取原始数据")
+        started = time.perf_counter()
         raw_content = self.fetch_news(date_str)
         if not raw_content:
-            print("获取原始数据失败")
+            logger.warning("获取原始数据失败")
             return None
         
-        print(f"获取到 {len(raw_content)} 行原始内容")
-        
-        # 打印原始数据
-        print("\n=== 原始数据 ===")
-        for i, line in enumerate(raw_content):
-            print(f"{i+1}: {line}")
-        print("=== 原始数据结束 ===\n")
-        
-        # 步骤2: 清洗内容
-        print("步骤2: 清洗内容")
-        cleaned_lines = self.clean_news_content(raw_content)
-        print(f"清洗后剩余 {len(cleaned_lines)} 行")
-        
-        # 步骤3: 分割新闻片段
-        print("步骤3: 分割新闻片段")
-        segments = self.split_news_segments(cleaned_lines)
-        print(f"分割成 {len(segments)} 个片段")
-        
-        # 打印分割后的片段
-        print("\n=== 分割后的新闻片段 ===")
-        for i, segment in enumerate(segments):
-            print(f"{i+1}: {segment[:100]}...")
-        print("=== 分割片段结束 ===\n")
-        
-        # 步骤4: 分类国内/国际新闻
-        print("步骤4: 分类国内/国际新闻")
-        domestic, international = self.classify_domestic_international(segments)
-        print(f"国内新闻: {len(domestic)} 条, 国际新闻: {len(international)} 条")
+        logger.info(f"获取到 {len(raw_content)} 行原始内容")
+        log_stage('fetch', len(raw_content), time.perf_counter() - started, date_str)
+
+        return self.process_raw_content(date_str, raw_content)
+
+    def process_raw_content(self, date_str, raw_content):
+        """
+        对已获取的原始内容执行清洗、分割、分类、实体识别和摘要
+        """
+        # 打印原始数据（仅在 --print-raw 时）
+        if self.print_raw:
+            logger.info("\n=== 原始数据 ===")
+            for i, line in enumerate(raw_content):
+                logger.info(f"{i+1}: {line}")
+            logger.info("=== 原始数据结束 ===\n")
         
-        # 步骤5: 对每条新闻进行处理
-        print("步骤5: 处理每条新闻")
+        # 步骤2-5: 清洗、分割、分类、实体识别和摘要以流水线方式进行
+        logger.info("步骤2-5: 清洗、分割、分类国内/国际新闻并处理每条新闻")
+        # 摘要缓存和大模型的计数在多天之间累计，记录当天开始时的值以便只统计当天
+        cache_before = self.summary_cache.stats() if self.summary_cache is not None else None
+        llm_before = self._llm_client.snapshot() if self._llm_client is not None else None
+        stats = {}
         processed_domestic = []
-        for i, item in enumerate(domestic):
-            print(f"  处理国内新闻 {i+1}/{len(domestic)}")
-            # 根据是否可用大模型选择摘要方法
-            if LLM_AVAILABLE:
-                summary = self.llm_summarize(item)
-                summary_method = "大模型"
-            else:
-                summary = self.simple_summarize(item)
-                summary_method = "简单程序"
-                
-            processed_domestic.append({
-                "text": item,
-                "entities": self.simple_ner(item),
-                "summary": summary,
-                "summary_method": summary_method  # 添加摘要方法信息
-            })
-        
         processed_international = []
-        for i, item in enumerate(international):
-            print(f"  处理国际新闻 {i+1}/{len(international)}")
-            # 根据是否可用大模型选择摘要方法
-            if LLM_AVAILABLE:
-                summary = self.llm_summarize(item)
-                summary_method = "大模型"
+        for item in self.stream_raw_content(raw_content, stats):
+            category = item.pop('category')
+            logger.debug(f"  [{category}] {item['text'][:100]}...")
+            if category == 'international':
+                processed_international.append(item)
             else:
-                summary = self.simple_summarize(item)
-                summary_method = "简单程序"
-                
-            processed_international.append({
-                "text": item,
-                "entities": self.simple_ner(item),
-                "summary": summary,
-                "summary_method": summary_method  # 添加摘要方法信息
-            })
+                processed_domestic.append(item)
+
+        logger.info(f"清洗后剩余 {stats['cleaned_lines']} 行，分割成 {stats['segments']} 个片段")
+        logger.info(f"国内新闻: {stats['domestic']} 条, 国际新闻: {stats['international']} 条")
+        for stage, seconds in self.stage_durations(stats).items():
+            log_stage(stage, stats[stage], seconds, date_str)
+        if self.summary_cache is not None:
+            cache_stats = self.summary_cache.stats()
+            hits = cache_stats['hits'] - cache_before['hits']
+            misses = cache_stats['misses'] - cache_before['misses']
+            logger.info(f"摘要缓存: 命中 {hits} 条, 未命中 {misses} 条, 共缓存 {cache_stats['entries']} 条")
+        if self._llm_client is not None:
+            llm_stats = self._llm_client.summary(since=llm_before)
+            logger.info(
+                f"大模型: {llm_stats['requests']} 次请求, 平均首 token {llm_stats['avg_ttft']:.2f} 秒, "
+                f"{llm_stats['tokens_per_second']:.1f} tokens/秒, 提前结束 {llm_stats['stopped_early']} 次",
+                extra={"event": "llm_summary", "date": date_str, "count": llm_stats['requests'],
+                       "ttft": round(llm_stats['avg_ttft'], 4),
+                       "tokens_per_second": round(llm_stats['tokens_per_second'], 2)}
+            )
         
         return {
             'date': date_str,
@@ -549,6 +864,73 @@ class NewsProcessor:
             'international': processed_international
         }
 
+    def _fetch_news_timed(self, date_str):
+        """
+        获取指定日期的数据（不回退到前一天），并记录获取阶段的耗时
+        """
+        started = time.perf_counter()
+        raw_content = self.fetch_news(date_str, fallback_to_previous=False)
+        if raw_content:
+            log_stage('fetch', len(raw_content), time.perf_counter() - started, date_str)
+        return raw_content
+
+    def backfill(self, start_date, end_date, fetch_workers=DEFAULT_FETCH_WORKERS):
+        """
+        批量处理一段日期范围内的新闻联播数据
+        多个日期并发下载，先下载完成的日期立即进入清洗、分割和摘要流程，
+        已存在 full_result_*.json 的日期直接跳过
+
+        Args:
+            start_date (str): 起始日期，格式为YYYYMMDD
+            end_date (str): 结束日期（包含），格式为YYYYMMDD
+            fetch_workers (int): 并发下载数
+
+        Returns:
+            list: 成功处理的日期列表
+        """
+        start = datetime.strptime(start_date, "%Y%m%d")
+        end = datetime.strptime(end_date, "%Y%m%d")
+        if start > end:
+            start, end = end, start
+
+        dates = []
+        current = start
+        while current <= end:
+            date_str = current.strftime("%Y%m%d")
+            if os.path.exists(os.path.join("datas", f"full_result_{date_str}.json")):
+                logger.info(f"跳过 {date_str}：结果文件已存在")
+            else:
+                dates.append(date_str)
+            current += timedelta(days=1)
+
+        logger.info(f"共需处理 {len(dates)} 天的数据，并发下载数 {fetch_workers}")
+        processed_dates = []
+        if not dates:
+            return processed_dates
+
+        with ThreadPoolExecutor(max_workers=max(1, fetch_workers)) as executor:
+            futures = {
+                executor.submit(self._fetch_news_timed, date_str): date_str
+                for date_str in dates
+            }
+            # 按下载完成的顺序处理，后面的日期仍在下载
+            for future in as_completed(futures):
+                date_str = futures[future]
+                raw_content = future.result()
+                if not raw_content:
+                    logger.warning(f"{date_str} 获取原始数据失败，跳过")
+                    continue
+
+                logger.info(f"\n===== 处理 {date_str} =====")
+                result = self.process_raw_content(date_str, raw_content)
+                if result:
+                    self.save_to_file(result, f"full_result_{date_str}.json")
+                    processed_dates.append(date_str)
+
+        processed_dates.sort()
+        logger.info(f"批量处理完成，成功 {len(processed_dates)}/{len(dates)} 天")
+        return processed_dates
+
     def save_to_file(self, result, filename):
         """
         将结果保存到文件
@@ -563,19 +945,19 @@ class NewsProcessor:
             elif item.get('summary_method') == '简单程序':
                 simple_count += 1
         
-        print(f"摘要方法统计: 大模型={llm_count}, 简单程序={simple_count}")
+        logger.info(f"摘要方法统计: 大模型={llm_count}, 简单程序={simple_count}")
         
         # 将文件保存到 datas 目录中
         filepath = os.path.join("datas", filename)
         with open(filepath, 'w', encoding='utf-8') as f:
             json.dump(result, f, ensure_ascii=False, indent=2)
-        print(f"结果已保存到 {filepath}")
+        logger.info(f"结果已保存到 {filepath}")
 
         # 同时保存到 xinwen 目录中
         xinwen_filepath = os.path.join("xinwen", filename)
         with open(xinwen_filepath, 'w', encoding='utf-8') as f:
             json.dump(result, f, ensure_ascii=False, indent=2)
-        print(f"结果已保存到 {xinwen_filepath}")
+        logger.info(f"结果已保存到 {xinwen_filepath}")
 
 
 def main():
@@ -587,53 +969,80 @@ def main():
                         help='日期 (格式: YYYYMMDD)')
     parser.add_argument('--print-raw', action='store_true', 
                         help='打印原始数据')
+    parser.add_argument('--llm-workers', type=int, default=DEFAULT_LLM_WORKERS,
+                        help=f'大模型摘要并发数 (默认: {DEFAULT_LLM_WORKERS})')
+    parser.add_argument('--llm-batch-size', type=int, default=DEFAULT_LLM_BATCH_SIZE,
+                        help=f'每次请求大模型摘要的最多新闻条数，按上下文长度自动分批 (默认: {DEFAULT_LLM_BATCH_SIZE}，即逐条请求)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='不使用摘要缓存，所有新闻重新调用大模型')
+    parser.add_argument('--no-llm', action='store_true',
+                        help='不探测也不调用大模型，全部使用简化版摘要')
+    parser.add_argument('--start', type=str,
+                        help='批量回填的起始日期 (格式: YYYYMMDD)')
+    parser.add_argument('--end', type=str,
+                        help='批量回填的结束日期，包含当天 (格式: YYYYMMDD，默认为 --date)')
+    parser.add_argument('--fetch-workers', type=int, default=DEFAULT_FETCH_WORKERS,
+                        help=f'批量回填时的并发下载数 (默认: {DEFAULT_FETCH_WORKERS})')
+    parser.add_argument('--boilerplate-file', type=str,
+                        help='额外加载的固定模式模板文件（TemplateGenerator.save_patterns 生成）')
+    parser.add_argument('--log-level', type=str, default='INFO',
+                        choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                        help='控制台日志级别 (默认: INFO)')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='输出详细信息（片段预览和处理结果示例），等同于 --log-level DEBUG')
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help='只输出警告和错误，等同于 --log-level WARNING')
+    parser.add_argument('--log-jsonl', type=str,
+                        help='将日志及各阶段条数、耗时以 JSON Lines 格式追加写入该文件')
     
     args = parser.parse_args()
+
+    # 配置日志
+    log_level = 'DEBUG' if args.verbose else 'WARNING' if args.quiet else args.log_level
+    setup_logging(log_level, args.log_jsonl)
+    if args.no_llm:
+        get_backend().disable()
     
     # 初始化处理器
-    processor = NewsProcessor()
+    processor = NewsProcessor(llm_workers=args.llm_workers, use_cache=not args.no_cache,
+                              boilerplate_file=args.boilerplate_file, print_raw=args.print_raw,
+                              llm_batch_size=args.llm_batch_size)
+
+    # 批量回填模式
+    if args.start:
+        processor.backfill(args.start, args.end or args.date, args.fetch_workers)
+        return
     
     # 处理指定日期的新闻
-    print(f"正在处理 {args.date} 的新闻...")
+    logger.info(f"正在处理 {args.date} 的新闻...")
     result = processor.process_one_day(args.date)
     
     if result:
-        print(f"处理完成，日期：{result['date']}")
-        print(f"国内新闻条数：{len(result['domestic'])}")
-        print(f"国际新闻条数：{len(result['international'])}")
-        
-        # 显示示例结果
-        print("\n=== 处理结果示例 ===")
-        if result['domestic']:
-            print("\n国内新闻示例:")
-            item = result['domestic'][0]
-            print(f"  新闻内容: {item['text'][:100]}...")
-            print(f"  实体识别 - 地点: {item['entities']['locations']}")
-            print(f"  实体识别 - 人物: {item['entities']['persons']}")
-            print(f"  实体识别 - 组织: {item['entities']['organizations']}")
-            print(f"  摘要信息 - 标题: {item['summary']['title']}")
-            print(f"  摘要信息 - 摘要: {item['summary']['summary']}")
-            print(f"  摘要信息 - 关键词: {item['summary']['keywords']}")
-            print(f"  摘要信息 - 分类: {item['summary']['category']}")
-            print(f"  摘要方法: {item.get('summary_method', '未知')}")
+        logger.info(f"处理完成，日期：{result['date']}")
+        logger.info(f"国内新闻条数：{len(result['domestic'])}")
+        logger.info(f"国际新闻条数：{len(result['international'])}")
         
-        if result['international']:
-            print("\n国际新闻示例:")
-            item = result['international'][0]
-            print(f"  新闻内容: {item['text'][:100]}...")
-            print(f"  实体识别 - 地点: {item['entities']['locations']}")
-            print(f"  实体识别 - 人物: {item['entities']['persons']}")
-            print(f"  实体识别 - 组织: {item['entities']['organizations']}")
-            print(f"  摘要信息 - 标题: {item['summary']['title']}")
-            print(f"  摘要信息 - 摘要: {item['summary']['summary']}")
-            print(f"  摘要信息 - 关键词: {item['summary']['keywords']}")
-            print(f"  摘要信息 - 分类: {item['summary']['category']}")
-            print(f"  摘要方法: {item.get('summary_method', '未知')}")
+        # 显示示例结果（仅在 --verbose 时）
+        logger.debug("\n=== 处理结果示例 ===")
+        for label, key in (("国内新闻示例", 'domestic'), ("国际新闻示例", 'international')):
+            if not result[key]:
+                continue
+            item = result[key][0]
+            logger.debug(f"\n{label}:")
+            logger.debug(f"  新闻内容: {item['text'][:100]}...")
+            logger.debug(f"  实体识别 - 地点: {item['entities']['locations']}")
+            logger.debug(f"  实体识别 - 人物: {item['entities']['persons']}")
+            logger.debug(f"  实体识别 - 组织: {item['entities']['organizations']}")
+            logger.debug(f"  摘要信息 - 标题: {item['summary']['title']}")
+            logger.debug(f"  摘要信息 - 摘要: {item['summary']['summary']}")
+            logger.debug(f"  摘要信息 - 关键词: {item['summary']['keywords']}")
+            logger.debug(f"  摘要信息 - 分类: {item['summary']['category']}")
+            logger.debug(f"  摘要方法: {item.get('summary_method', '未知')}")
 
         # 保存结果到文件
         processor.save_to_file(result, f"full_result_{args.date}.json")
     else:
-        print("处理失败")
+        logger.error("处理失败")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量摘要提示词
+将多条新闻装入同一个请求，说明部分只出现一次，模型返回 {"items": [...]}
+（Ollama 的 format="json" 只能生成顶层对象，所以数组放在 items 字段里）；
+格式不对时把这一批拆成两半分别重试，直到单条为止
+"""
+
+import json
+
+from modules.utils.token_estimate import estimate_tokens
+
+# 每条新闻要求输出的字段
+SUMMARY_ITEM_SCHEMA = """{
+  "title": "10字以内",
+  "summary": "50字以内",
+  "keywords": ["kw1","kw2","kw3"],
+  "category": "domestic" 或 "international"
+}"""
+
+# 解析时必须存在的字段
+REQUIRED_FIELDS = ("title", "summary")
+
+# 批量提示词的版本（修改提示词时递增，与单条摘要提示词的版本分开计入摘要缓存的键）
+BATCH_PROMPT_VERSION = 2
+
+# 默认的模型上下文长度（token）
+DEFAULT_CONTEXT_TOKENS = 4096
+
+# 为每条新闻的输出预留的 token 数
+OUTPUT_TOKENS_PER_ITEM = 120
+
+
+def build_batch_prompt(texts, item_schema=SUMMARY_ITEM_SCHEMA):
+    """
+    构造批量摘要提示词
+
+    Args:
+        texts (list): 新闻原文列表
+        item_schema (str): 每条新闻的输出格式说明
+
+    Returns:
+        str: 提示词
+    """
+    news = "\n".join(f"[{i + 1}] {text}" for i, text in enumerate(texts))
+    return f"""你是一名央视新闻联播的资深编辑，任务是对下面 {len(texts)} 段新闻逐条进行「分类 + 摘要 + 关键词」抽取。
+输出必须是一个 **合法 JSON 对象**，格式为 {{"items": [...]}}，items 数组按新闻编号顺序共 {len(texts)} 个元素，
+每个元素格式如下（不要添加任何代码块标记）：
+{item_schema}
+新闻原文：
+{news}
+"""
+
+
+def batch_tokens(texts, item_schema=SUMMARY_ITEM_SCHEMA, output_tokens_per_item=OUTPUT_TOKENS_PER_ITEM):
+    """
+    估算一批新闻所需的 token 数（提示词加预留的输出）
+    """
+    return estimate_tokens(build_batch_prompt(texts, item_schema)) + output_tokens_per_item * len(texts)
+
+
+def iter_batches(items, max_items, context_tokens=DEFAULT_CONTEXT_TOKENS, text_of=None,
+                 item_schema=SUMMARY_ITEM_SCHEMA, output_tokens_per_item=OUTPUT_TOKENS_PER_ITEM):
+    """
+    按条数上限和上下文长度把输入依次装箱，输入可以是生成器
+
+    单条新闻本身超过上下文长度时单独成批（由模型端截断）
+
+    Args:
+        items: 待摘要的条目
+        max_items (int): 每批最多条数
+        context_tokens (int): 模型上下文长度
+        text_of (callable): 从条目中取出新闻原文，默认条目本身就是原文
+        item_schema (str): 每条新闻的输出格式说明
+        output_tokens_per_item (int): 为每条新闻的输出预留的 token 数，计入该条新闻占用的长度
+
+    Yields:
+        list: 一批条目
+    """
+    text_of = text_of or (lambda item: item)
+    # 说明部分的长度，每批只计一次
+    overhead = estimate_tokens(build_batch_prompt([], item_schema))
+    batch = []
+    used = overhead
+    for item in items:
+        cost = estimate_tokens(text_of(item)) + output_tokens_per_item + 4
+        if batch and (len(batch) >= max_items or used + cost > context_tokens):
+            yield batch
+            batch = []
+            used = overhead
+        batch.append(item)
+        used += cost
+    if batch:
+        yield batch
+
+
+def parse_batch_response(response, expected_count, required_fields=REQUIRED_FIELDS):
+    """
+    解析模型返回的 {"items": [...]}
+
+    也接受其他只包含一个数组的对象和直接返回的数组；单条时也接受直接返回的对象
+
+    Args:
+        response (str): 模型输出
+        expected_count (int): 期望的元素个数
+        required_fields (tuple): 每个元素必须包含的字段
+
+    Returns:
+        list: 每条新闻的摘要字典
+
+    Raises:
+        ValueError: 输出不是合法 JSON、元素个数不符或缺少字段
+    """
+    data = json.loads(response)
+    if isinstance(data, dict):
+        arrays = [value for value in data.values() if isinstance(value, list)]
+        if len(arrays) == 1:
+            data = arrays[0]
+        elif expected_count == 1:
+            data = [data]
+    if not isinstance(data, list):
+        raise ValueError("模型输出不是 JSON 数组")
+    if len(data) != expected_count:
+        raise ValueError(f"模型输出 {len(data)} 条，期望 {expected_count} 条")
+    for item in data:
+        if not isinstance(item, dict) or any(field not in item for field in required_fields):
+            raise ValueError(f"模型输出的元素缺少字段: {item!r}")
+    return data
+
+
+def summarize_in_batches(texts, generate, item_schema=SUMMARY_ITEM_SCHEMA,
+                         required_fields=REQUIRED_FIELDS, on_error=None):
+    """
+    批量摘要一组新闻，格式错误时二分重试
+
+    Args:
+        texts (list): 新闻原文列表（调用方负责按上下文长度分好批）
+        generate (callable): generate(prompt, count) 调用模型并返回原始输出文本，
+            网络等错误直接抛出异常
+        item_schema (str): 每条新闻的输出格式说明
+        required_fields (tuple): 每个元素必须包含的字段
+        on_error (callable): 可选，on_error(texts, error) 在每次失败时调用
+
+    Returns:
+        list: 与输入等长的列表，无法得到合法结果的位置为 None
+    """
+    if not texts:
+        return []
+    try:
+        response = generate(build_batch_prompt(texts, item_schema), len(texts))
+    except Exception as e:
+        # 请求本身失败时拆分也无济于事
+        if on_error:
+            on_error(texts, e)
+        return [None] * len(texts)
+
+    try:
+        return parse_batch_response(response, len(texts), required_fields)
+    except ValueError as e:  # json.JSONDecodeError 是 ValueError 的子类
+        if on_error:
+            on_error(texts, e)
+        if len(texts) == 1:
+            return [None]
+
+    middle = len(texts) // 2
+    return (summarize_in_batches(texts[:middle], generate, item_schema, required_fields, on_error)
+            + summarize_in_batches(texts[middle:], generate, item_schema, required_fields, on_error))
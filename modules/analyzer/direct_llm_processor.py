@@ -4,35 +4,79 @@
 import sys
 import os
 import json
-import requests
 
 # 添加项目根目录到Python路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-# 检查是否可以连接到 Ollama
-try:
-    response = requests.get("http://localhost:11434/api/tags", timeout=5)
-    LLM_AVAILABLE = response.status_code == 200
-    if LLM_AVAILABLE:
-        print("Ollama 服务可用，将使用大模型进行处理")
-    else:
-        print("Ollama 服务不可用")
-except:
-    LLM_AVAILABLE = False
-    print("提示: 无法连接到 Ollama")
+from modules.utils.llm_backend import is_llm_available
+from modules.utils.ollama_client import OllamaStreamClient
+from modules.analyzer.batch_summarizer import (DEFAULT_CONTEXT_TOKENS, OUTPUT_TOKENS_PER_ITEM,
+                                               iter_batches, summarize_in_batches)
+
+# 批量处理时每条新闻的输出格式
+ITEM_SCHEMA = """{
+  "title": "新闻标题（10字以内）",
+  "summary": "新闻摘要（50字以内）",
+  "keywords": ["关键词1", "关键词2", "关键词3"],
+  "category": "domestic 或 international",
+  "entities": {
+    "locations": ["地点1", "地点2"],
+    "persons": ["人物1", "人物2"],
+    "organizations": ["组织1", "组织2"]
+  }
+}"""
+
+# 实体字段也要输出，为每条新闻多预留一些 token
+OUTPUT_TOKENS_WITH_ENTITIES = OUTPUT_TOKENS_PER_ITEM * 2
+
+# 流式调用 Ollama，JSON 闭合后即停止生成
+llm_client = OllamaStreamClient()
+
+
+def _generate_batch(prompt, count):
+    """
+    调用 Ollama 处理一批新闻，返回模型的原始输出
+    """
+    content, _ = llm_client.generate("qwen2:7b", prompt, max_tokens=OUTPUT_TOKENS_WITH_ENTITIES * count,
+                                     stop_on_json=True, format="json",
+                                     options={"num_ctx": DEFAULT_CONTEXT_TOKENS})
+    return content
+
+
+def _process_in_batches(news_items, batch_size):
+    """
+    多条新闻共用一个提示词处理，模型输出格式不对时拆分重试
+    """
+    processed_news = []
+    # 按上下文长度分批时，含实体字段的输出预留算在每条新闻的长度里
+    batches = iter_batches(news_items, batch_size, DEFAULT_CONTEXT_TOKENS, item_schema=ITEM_SCHEMA,
+                           output_tokens_per_item=OUTPUT_TOKENS_WITH_ENTITIES)
+    for batch in batches:
+        print(f"正在处理第 {len(processed_news) + 1}-{len(processed_news) + len(batch)} 条新闻...")
+        results = summarize_in_batches(
+            batch, _generate_batch, item_schema=ITEM_SCHEMA,
+            on_error=lambda texts, e: print(f"{len(texts)} 条新闻批量处理失败: {e}")
+        )
+        for item, parsed_result in zip(batch, results):
+            if parsed_result is None:
+                processed_news.append({"original": item, "processed": None, "error": "无法解析模型输出"})
+            else:
+                processed_news.append({"original": item, "processed": parsed_result})
+    return processed_news
 
 
-def process_raw_data_with_llm(raw_data_text):
+def process_raw_data_with_llm(raw_data_text, batch_size=1):
     """
     直接使用大模型处理原始数据
     
     Args:
         raw_data_text (str): 原始数据文本
+        batch_size (int): 每次请求处理的最多新闻条数，大于 1 时多条新闻共用一个提示词
         
     Returns:
         dict: 处理结果
     """
-    if not LLM_AVAILABLE:
+    if not is_llm_available():
         print("错误: Ollama 服务不可用，无法使用大模型处理")
         return None
 
@@ -49,6 +93,12 @@ def process_raw_data_with_llm(raw_data_text):
             news_items.append(content)
     
     print(f"共找到 {len(news_items)} 条新闻")
+
+    if batch_size > 1:
+        return {
+            "news_count": len(news_items),
+            "processed_news": _process_in_batches(news_items, batch_size)
+        }
     
     # 处理每条新闻
     processed_news = []
@@ -76,21 +126,15 @@ def process_raw_data_with_llm(raw_data_text):
 {item}
 """
         
-        # 调用 Ollama API
-        payload = {
-            "model": "qwen2:7b",
-            "prompt": prompt,
-            "stream": False,
-            "format": "json"
-        }
-        
         try:
-            response = requests.post("http://localhost:11434/api/generate", json=payload, timeout=120)
-            result = response.json()
+            # 调用 Ollama API
+            content, metrics = llm_client.generate("qwen2:7b", prompt, max_tokens=OUTPUT_TOKENS_WITH_ENTITIES,
+                                                   stop_on_json=True, format="json")
+            print(f"  首 token {metrics.ttft:.2f} 秒, {metrics.tokens_per_second:.1f} tokens/秒")
             
             # 解析结果
             try:
-                parsed_result = json.loads(result['response'])
+                parsed_result = json.loads(content)
                 processed_news.append({
                     "original": item,
                     "processed": parsed_result
@@ -111,6 +155,9 @@ def process_raw_data_with_llm(raw_data_text):
                 "error": str(e)
             })
     
+    stats = llm_client.summary()
+    print(f"大模型共 {stats['requests']} 次请求, 平均首 token {stats['avg_ttft']:.2f} 秒, "
+          f"{stats['tokens_per_second']:.1f} tokens/秒")
     return {
         "news_count": len(news_items),
         "processed_news": processed_news
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+抽取式预压缩
+长新闻送入大模型前，按句子打分挑选信息量最高的句子，使提示词不超过 token 预算；
+短新闻原样保留。选中的句子按原文顺序拼接
+"""
+
+import bisect
+import re
+
+from modules.utils.keyword_automaton import KeywordAutomaton
+from modules.utils.token_estimate import estimate_tokens
+
+# 句子切分：保留句末标点
+_SENTENCE_RE = re.compile(r'[^。！？；]+[。！？；]?')
+
+# 数字、书名号和引号内容通常是新闻的核心事实
+_FACT_RE = re.compile(r'\d+(?:\.\d+)?[%％万亿]?|《[^》]+》|“[^”]+”')
+
+
+def split_sentences(text):
+    """
+    按中文句末标点切分句子
+
+    Returns:
+        list: (起始位置, 句子) 列表
+    """
+    return [(m.start(), m.group()) for m in _SENTENCE_RE.finditer(text) if m.group().strip()]
+
+
+class ExtractiveCompressor:
+    """
+    句子级抽取式压缩器
+    句子得分 = 位置分（导语最高）+ 实体密度（关键词、数字、书名号、引语）+ 关键词命中
+    """
+
+    def __init__(self, entity_keywords=(), topic_keywords=()):
+        """
+        Args:
+            entity_keywords (iterable): 地名、机构等实体关键词
+            topic_keywords (iterable): 主题关键词
+        """
+        tables = {'entity': entity_keywords, 'topic': topic_keywords}
+        self.automaton = KeywordAutomaton(tables) if any(tables.values()) else None
+
+    def score_sentences(self, text):
+        """
+        计算每个句子的得分
+
+        Returns:
+            list: (句子, 得分, 估算 token 数) 列表，按原文顺序
+        """
+        sentences = split_sentences(text)
+        starts = [start for start, _ in sentences]
+        entity_counts = [0] * len(sentences)
+        topic_counts = [0] * len(sentences)
+        if self.automaton is not None:
+            for offset, _, categories in self.automaton.find_all(text):
+                index = bisect.bisect_right(starts, offset) - 1
+                if 'entity' in categories:
+                    entity_counts[index] += 1
+                if 'topic' in categories:
+                    topic_counts[index] += 1
+
+        scored = []
+        last = len(sentences) - 1
+        for i, (_, sentence) in enumerate(sentences):
+            tokens = max(1, estimate_tokens(sentence))
+            # 导语和结尾句通常概括全文
+            position = 2.0 / (1 + i) + (0.3 if i == last and i > 0 else 0.0)
+            facts = entity_counts[i] + len(_FACT_RE.findall(sentence))
+            density = 10.0 * facts / tokens
+            score = position + density + 0.5 * topic_counts[i]
+            scored.append((sentence, score, tokens))
+        return scored
+
+    def compress(self, text, max_tokens):
+        """
+        将文本压缩到不超过 max_tokens（估算值）
+
+        Args:
+            text (str): 新闻原文
+            max_tokens (int): token 预算
+
+        Returns:
+            str: 压缩后的文本，原文未超出预算时原样返回
+        """
+        text = text.strip()
+        if estimate_tokens(text) <= max_tokens:
+            return text
+
+        scored = self.score_sentences(text)
+        if not scored:
+            # 没有可打分的句子（如只有标点），按字符截断
+            return _truncate_to_tokens(text, max_tokens)
+
+        # 导语总是保留，其余按得分从高到低放入预算
+        selected = {0}
+        used = scored[0][2]
+        ranked = sorted(range(1, len(scored)), key=lambda i: scored[i][1], reverse=True)
+        for i in ranked:
+            tokens = scored[i][2]
+            if used + tokens <= max_tokens:
+                selected.add(i)
+                used += tokens
+
+        result = ''.join(scored[i][0] for i in sorted(selected))
+        if used > max_tokens:
+            # 导语本身就超出预算时按字符截断
+            result = _truncate_to_tokens(result, max_tokens)
+        return result
+
+
+def _truncate_to_tokens(text, max_tokens):
+    """
+    截取不超过 max_tokens 的最长前缀
+    """
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_tokens(text[:middle]) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low]
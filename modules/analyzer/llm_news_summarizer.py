@@ -1,9 +1,17 @@
 import json
-import akshare as ak
 from datetime import datetime
 import re
 import argparse
 import os
+import sys
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from modules.scraper.raw_transcript_store import fetch_news_contents
+from modules.analyzer.llm_worker import (DEFAULT_WORKER_PORT, SUMMARY_PROMPT_PREFIX, PrefixCachedSummarizer,
+                                         connect_worker)
+from modules.analyzer.extractive_compressor import ExtractiveCompressor
 
 # 检查是否可以导入llama_cpp
 try:
@@ -13,19 +21,45 @@ except ImportError:
     LLM_AVAILABLE = False
     print("警告: 未安装llama_cpp_python，将使用简化版摘要功能")
 
+# 简单摘要使用的常见新闻关键词
+SUMMARY_KEYWORDS = ['经济', '政治', '国际', '国内', '发展', '建设', '会议', '政策', '合作', '科技']
+
+# 判断国际新闻的关键词
+INTERNATIONAL_KEYWORDS = ['国际', '外交', '合作', '美国', '俄罗斯', '日本', '韩国', '欧盟', '联合国']
+
+# 抽取式压缩时计入实体密度的关键词（地名、机构）
+ENTITY_KEYWORDS = [
+    '北京', '上海', '天津', '重庆', '香港', '澳门', '台湾', '美国', '俄罗斯', '日本', '韩国', '欧盟',
+    '联合国', '东盟', '中共中央', '国务院', '全国人大', '全国政协', '中央军委', '外交部', '国防部',
+    '委员会', '政府', '部长', '总理', '主席', '总统', '总书记'
+]
+
+# 送入大模型的新闻正文 token 预算（估算值）
+DEFAULT_MAX_INPUT_TOKENS = 512
+
+
 class NewsSummarizer:
-    def __init__(self, model_path=None, n_gpu_layers=0):
+    def __init__(self, model_path=None, n_gpu_layers=0, worker_port=DEFAULT_WORKER_PORT,
+                 max_input_tokens=DEFAULT_MAX_INPUT_TOKENS):
         """
         初始化新闻摘要器
         
         Args:
             model_path (str): 模型文件路径
             n_gpu_layers (int): 使用GPU的层数，0表示纯CPU
+            worker_port (int): 常驻摘要服务的端口，服务在运行时直接使用它而不在本进程加载模型；
+                为 None 时不尝试连接
+            max_input_tokens (int): 新闻正文的 token 预算，超出时抽取信息量最高的句子
         """
         self.llm = None
         self.n_gpu_layers = n_gpu_layers
-        
-        if LLM_AVAILABLE and model_path and os.path.exists(model_path):
+        self.max_input_tokens = max_input_tokens
+        self.compressor = ExtractiveCompressor(ENTITY_KEYWORDS, SUMMARY_KEYWORDS + INTERNATIONAL_KEYWORDS)
+        self.worker = connect_worker(port=worker_port) if worker_port else None
+
+        if self.worker is not None:
+            print(f"已连接常驻摘要服务 (端口 {worker_port})，不在本进程加载模型")
+        elif LLM_AVAILABLE and model_path and os.path.exists(model_path):
             try:
                 # 加载模型
                 self.llm = Llama(
@@ -33,6 +67,8 @@ class NewsSummarizer:
                     n_ctx=4096, 
                     n_gpu_layers=n_gpu_layers  # GPU层数
                 )
+                # 计算并保存共用提示词前缀的 KV 状态
+                self.prefix_summarizer = PrefixCachedSummarizer(self.llm)
                 print(f"成功加载模型: {model_path}")
                 if n_gpu_layers > 0:
                     print(f"使用GPU加速，GPU层数: {n_gpu_layers}")
@@ -46,14 +82,10 @@ class NewsSummarizer:
     
     def get_prompt_template(self):
         """
-        获取提示词模板
+        获取提示词模板（共用前缀在前，{text} 为文章正文），用 str.format(text=...) 填充；
+        前缀中 JSON 示例的花括号已转义
         """
-        return """You are a CCTV news editor.
-Summarize the following Xinwen Lianbo piece into JSON:
-{"title": "<10 words>", "summary": "<40 words>", "keywords": ["kw1"], "category": "domestic|international"}
-Text:
-{text}
-"""
+        return SUMMARY_PROMPT_PREFIX.replace("{", "{{").replace("}", "}}") + "{text}\n"
     
     def simple_summarize(self, text):
         """
@@ -68,15 +100,13 @@ Text:
         
         # 简单关键词提取（基于常见新闻关键词）
         keywords = []
-        keyword_candidates = ['经济', '政治', '国际', '国内', '发展', '建设', '会议', '政策', '合作', '科技']
-        for keyword in keyword_candidates:
+        for keyword in SUMMARY_KEYWORDS:
             if keyword in text:
                 keywords.append(keyword)
         
         # 简单分类（基于关键词）
         category = "domestic"
-        international_keywords = ['国际', '外交', '合作', '美国', '俄罗斯', '日本', '韩国', '欧盟', '联合国']
-        for keyword in international_keywords:
+        for keyword in INTERNATIONAL_KEYWORDS:
             if keyword in text:
                 category = "international"
                 break
@@ -95,25 +125,15 @@ Text:
         """
         使用大模型进行摘要
         """
-        if not self.llm:
+        if not self.worker and not self.llm:
             return self.simple_summarize(text)
         
-        # 截断文本以提高速度
-        text = text[:600]
-        
-        prompt = self.get_prompt_template().format(text=text)
-        
         try:
-            output = self.llm.create_chat_completion(
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.1, 
-                max_tokens=200
-            )
-            
-            content = output['choices'][0]['message']['content']
-            # 清理可能的markdown格式
-            content = content.replace('```json', '').replace('```', '').strip()
-            return json.loads(content)
+            # 超出预算时抽取信息量最高的句子，而不是直接截断
+            compressed = self.compressor.compress(text, self.max_input_tokens)
+            if self.worker:
+                return self.worker.summarize(compressed)
+            return self.prefix_summarizer.summarize(compressed)
         except Exception as e:
             print(f"大模型摘要失败: {e}")
             return self.simple_summarize(text)
@@ -124,8 +144,7 @@ Text:
         """
         try:
             # 获取新闻数据
-            df = ak.news_cctv(date=date_str)
-            articles = df['content'].tolist()
+            articles = fetch_news_contents(date_str)
             
             print(f"获取到 {len(articles)} 条新闻")
             
@@ -185,11 +204,19 @@ def main():
                         help='GPU加速层数 (0表示纯CPU)')
     parser.add_argument('--format', type=str, default="json", choices=["json", "md"],
                         help='输出格式 (json 或 md)')
+    parser.add_argument('--worker-port', type=int, default=DEFAULT_WORKER_PORT,
+                        help=f'常驻摘要服务端口，服务运行时不再加载模型 (默认: {DEFAULT_WORKER_PORT})')
+    parser.add_argument('--no-worker', action='store_true',
+                        help='不连接常驻摘要服务，总是在本进程加载模型')
+    parser.add_argument('--max-input-tokens', type=int, default=DEFAULT_MAX_INPUT_TOKENS,
+                        help=f'新闻正文的 token 预算，超出时抽取关键句 (默认: {DEFAULT_MAX_INPUT_TOKENS})')
     
     args = parser.parse_args()
     
     # 初始化摘要器
-    summarizer = NewsSummarizer(args.model_path, args.gpu_layers)
+    summarizer = NewsSummarizer(args.model_path, args.gpu_layers,
+                                worker_port=None if args.no_worker else args.worker_port,
+                                max_input_tokens=args.max_input_tokens)
     
     # 处理指定日期的新闻
     print(f"正在处理 {args.date} 的新闻...")
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+常驻的 llama.cpp 摘要服务
+模型只在服务启动时加载一次，之后多次命令行调用通过本地端口复用；
+所有文章共用的提示词前缀在启动时计算一次，保存其 KV 状态，
+每篇文章只需计算自己的 token。
+连接使用本机随机生成的密钥认证（保存在只有当前用户可读的文件中），
+请求和响应都是 JSON，不反序列化任何 pickle 数据
+
+用法:
+    python -m modules.analyzer.llm_worker --model-path models/qwen2-7b-instruct-q4_k_m.gguf
+"""
+
+import argparse
+import json
+import os
+import secrets
+import sys
+import threading
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# 默认的服务地址
+DEFAULT_WORKER_HOST = "127.0.0.1"
+DEFAULT_WORKER_PORT = 18765
+
+# 本地连接的认证密钥文件，首次使用时随机生成；也可通过环境变量 NEWS_DAY_WORKER_AUTHKEY 指定密钥
+DEFAULT_AUTHKEY_FILE = os.path.join("datas", "llm_worker.key")
+
+# 单条消息的最大字节数
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+# 所有文章共用的提示词前缀，文章正文紧跟其后
+SUMMARY_PROMPT_PREFIX = """You are a CCTV news editor.
+Summarize the following Xinwen Lianbo piece into JSON:
+{"title": "<10 words>", "summary": "<40 words>", "keywords": ["kw1"], "category": "domestic|international"}
+Text:
+"""
+
+
+def load_authkey(path=DEFAULT_AUTHKEY_FILE):
+    """
+    读取本机的认证密钥，文件不存在时生成随机密钥并以 0600 权限保存
+
+    Returns:
+        bytes: 认证密钥
+    """
+    env_key = os.environ.get("NEWS_DAY_WORKER_AUTHKEY")
+    if env_key:
+        return env_key.encode("utf-8")
+
+    try:
+        with open(path, 'rb') as f:
+            key = f.read().strip()
+        if key:
+            return key
+    except FileNotFoundError:
+        pass
+
+    key_dir = os.path.dirname(path)
+    if key_dir:
+        os.makedirs(key_dir, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(secrets.token_hex(32).encode("ascii"))
+    try:
+        # 已存在时不覆盖（其他进程同时生成了密钥）
+        os.link(tmp_path, path)
+    except FileExistsError:
+        pass
+    finally:
+        os.remove(tmp_path)
+    with open(path, 'rb') as f:
+        return f.read().strip()
+
+
+def _send(conn, message):
+    conn.send_bytes(json.dumps(message, ensure_ascii=False).encode("utf-8"))
+
+
+def _recv(conn):
+    return json.loads(conn.recv_bytes(MAX_MESSAGE_BYTES).decode("utf-8"))
+
+
+def build_summary_prompt(text):
+    """
+    构造摘要提示词（前缀固定，正文在最后，便于复用前缀的 KV 状态）
+    """
+    return f"{SUMMARY_PROMPT_PREFIX}{text}\n"
+
+
+def parse_summary_output(content):
+    """
+    解析模型输出的 JSON，清理可能的 markdown 代码块标记
+    """
+    content = content.replace('```json', '').replace('```', '').strip()
+    return json.loads(content)
+
+
+class PrefixCachedSummarizer:
+    """
+    复用提示词前缀 KV 状态的 llama.cpp 摘要器
+    llama.cpp 在生成时会跳过与上次输入相同的前缀 token，
+    每次请求前恢复只包含前缀的状态，就只需计算文章本身
+    """
+
+    def __init__(self, llm, max_tokens=200, temperature=0.1):
+        """
+        Args:
+            llm: 已加载的 llama_cpp.Llama 实例
+            max_tokens (int): 每篇文章最多生成的 token 数
+            temperature (float): 采样温度
+        """
+        self.llm = llm
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self._lock = threading.Lock()
+        self.prefix_state = None
+        self._warm_prefix()
+
+    def _messages(self, prompt):
+        return [{"role": "user", "content": prompt}]
+
+    def _warm_prefix(self):
+        """
+        计算共用前缀并保存 KV 状态
+        """
+        self.llm.create_chat_completion(messages=self._messages(SUMMARY_PROMPT_PREFIX), max_tokens=1)
+        self.prefix_state = self.llm.save_state()
+
+    def summarize(self, text):
+        """
+        摘要一篇文章
+
+        Returns:
+            dict: 摘要结果
+
+        Raises:
+            ValueError: 模型输出不是合法 JSON
+        """
+        with self._lock:
+            self.llm.load_state(self.prefix_state)
+            output = self.llm.create_chat_completion(
+                messages=self._messages(build_summary_prompt(text)),
+                temperature=self.temperature,
+                max_tokens=self.max_tokens
+            )
+        return parse_summary_output(output['choices'][0]['message']['content'])
+
+
+def load_model(model_path, n_gpu_layers=0, n_ctx=4096):
+    """
+    加载 GGUF 模型
+    """
+    from llama_cpp import Llama
+    return Llama(model_path=model_path, n_ctx=n_ctx, n_gpu_layers=n_gpu_layers, verbose=False)
+
+
+def serve(summarizer, host=DEFAULT_WORKER_HOST, port=DEFAULT_WORKER_PORT, authkey=None):
+    """
+    在本地端口上提供摘要服务，直到收到 shutdown 请求
+    每个连接一个线程，模型调用由摘要器内部的锁串行执行
+
+    请求为 JSON 对象：{"op": "ping"}、{"op": "summarize", "text": ...} 或 {"op": "shutdown"}；
+    响应为 {"ok": true, ...} 或 {"ok": false, "error": ...}
+
+    Args:
+        authkey (bytes): 认证密钥，默认使用 load_authkey()
+    """
+    authkey = authkey or load_authkey()
+    listener = Listener((host, port), authkey=authkey)
+    stopping = threading.Event()
+    print(f"摘要服务已启动: {host}:{port}")
+
+    def handle(conn):
+        with conn:
+            if not _handle_connection(conn, summarizer):
+                stopping.set()
+                # 连接一次以唤醒阻塞在 accept 上的主循环
+                try:
+                    Client((host, port), authkey=authkey).close()
+                except OSError:
+                    pass
+
+    with listener:
+        while True:
+            try:
+                conn = listener.accept()
+            except (OSError, EOFError, AuthenticationError):
+                continue
+            if stopping.is_set():
+                conn.close()
+                break
+            threading.Thread(target=handle, args=(conn,), daemon=True).start()
+    print("摘要服务已停止")
+
+
+def _handle_connection(conn, summarizer):
+    """
+    处理一个连接上的全部请求，收到 shutdown 时返回 False
+    """
+    while True:
+        try:
+            request = _recv(conn)
+        except (EOFError, OSError, ValueError):
+            # 连接断开、消息过长或不是 JSON 时关闭连接
+            return True
+
+        op = request.get("op") if isinstance(request, dict) else None
+        if op == "ping":
+            _send(conn, {"ok": True})
+        elif op == "summarize":
+            try:
+                _send(conn, {"ok": True, "summary": summarizer.summarize(request["text"])})
+            except Exception as e:
+                _send(conn, {"ok": False, "error": str(e)})
+        elif op == "shutdown":
+            _send(conn, {"ok": True})
+            return False
+        else:
+            _send(conn, {"ok": False, "error": f"未知请求: {op}"})
+
+
+class WorkerClient:
+    """
+    摘要服务客户端，一个实例保持一个连接
+    """
+
+    def __init__(self, host=DEFAULT_WORKER_HOST, port=DEFAULT_WORKER_PORT, authkey=None):
+        self.conn = Client((host, port), authkey=authkey or load_authkey())
+
+    def _call(self, request):
+        _send(self.conn, request)
+        response = _recv(self.conn)
+        if not response.get("ok"):
+            raise RuntimeError(response.get("error", "摘要服务返回错误"))
+        return response
+
+    def ping(self):
+        return self._call({"op": "ping"})["ok"]
+
+    def summarize(self, text):
+        """
+        请求摘要一篇文章，失败时抛出 RuntimeError
+        """
+        return self._call({"op": "summarize", "text": text})["summary"]
+
+    def shutdown(self):
+        """
+        请求服务退出
+        """
+        self._call({"op": "shutdown"})
+
+    def close(self):
+        self.conn.close()
+
+
+def connect_worker(host=DEFAULT_WORKER_HOST, port=DEFAULT_WORKER_PORT, authkey=None):
+    """
+    连接正在运行的摘要服务
+
+    Returns:
+        WorkerClient: 客户端，服务未运行或认证失败时返回 None
+    """
+    try:
+        client = WorkerClient(host, port, authkey)
+        client.ping()
+        return client
+    except (OSError, EOFError, ValueError, RuntimeError, AuthenticationError):
+        return None
+
+
+def main():
+    """
+    主函数
+    """
+    parser = argparse.ArgumentParser(description='常驻的 llama.cpp 新闻摘要服务')
+    parser.add_argument('--model-path', type=str, default="models/qwen2-7b-instruct-q4_k_m.gguf",
+                        help='模型文件路径')
+    parser.add_argument('--gpu-layers', type=int, default=0,
+                        help='GPU加速层数 (0表示纯CPU)')
+    parser.add_argument('--port', type=int, default=DEFAULT_WORKER_PORT,
+                        help=f'监听端口 (默认: {DEFAULT_WORKER_PORT})')
+    parser.add_argument('--stop', action='store_true',
+                        help='停止正在运行的摘要服务')
+    args = parser.parse_args()
+
+    if args.stop:
+        client = connect_worker(port=args.port)
+        if client is None:
+            print("摘要服务未运行")
+            return
+        client.shutdown()
+        client.close()
+        print("已通知摘要服务退出")
+        return
+
+    if not os.path.exists(args.model_path):
+        print(f"模型文件不存在: {args.model_path}")
+        sys.exit(1)
+
+    print(f"正在加载模型: {args.model_path}")
+    summarizer = PrefixCachedSummarizer(load_model(args.model_path, args.gpu_layers))
+    serve(summarizer, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
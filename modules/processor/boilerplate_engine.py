@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+新闻联播固定模式（boilerplate）匹配引擎
+将全部模板编译为一个带命名分组的正则表达式，每行文本只需一次 match 调用，
+并返回命中的规则，便于排查误删
+"""
+
+import os
+import re
+from collections import namedtuple
+
+# 命中结果：规则序号、原始模式、规则来源
+BoilerplateRule = namedtuple('BoilerplateRule', ['index', 'pattern', 'source'])
+
+
+def load_mined_patterns(filename):
+    """
+    读取 TemplateGenerator.save_patterns 保存的模板文件
+
+    文件格式为 "正则表达式模式 | 出现频率 | 出现次数"，以 # 开头的行为注释。
+    挖掘出的模式来自整行文本，因此未带 ^ 锚点的模式按整行匹配处理
+
+    Args:
+        filename (str): 模板文件路径
+
+    Returns:
+        list: 正则表达式模式列表
+    """
+    patterns = []
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if not line.strip() or line.lstrip().startswith('#'):
+                continue
+            # 模式中的 | 已被转义，从右侧拆分频率和次数
+            parts = line.rsplit(' | ', 2)
+            pattern = parts[0].strip()
+            if not pattern:
+                continue
+            if not pattern.startswith('^'):
+                pattern = f'^(?:{pattern})$'
+            patterns.append(pattern)
+    return patterns
+
+
+class BoilerplateEngine:
+    """
+    固定模式匹配引擎
+    规则按添加顺序优先，与逐个模式 match 并在首次命中时停止的行为一致
+    """
+
+    def __init__(self, patterns=None, source="builtin"):
+        """
+        Args:
+            patterns (list): 初始正则表达式模式列表
+            source (str): 这些模式的来源标识
+        """
+        self.rules = []
+        self._combined = None
+        if patterns:
+            self.add_patterns(patterns, source)
+
+    def add_patterns(self, patterns, source="custom"):
+        """
+        添加模式并重新编译合并后的正则表达式，无效或重复的模式会被跳过
+
+        Returns:
+            int: 实际添加的模式数量
+        """
+        existing = {rule.pattern for rule in self.rules}
+        added = 0
+        for pattern in patterns:
+            if pattern in existing:
+                continue
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                print(f"跳过无效的模板 {pattern}: {e}")
+                continue
+            self.rules.append(BoilerplateRule(len(self.rules), pattern, source))
+            existing.add(pattern)
+            added += 1
+
+        if added:
+            self._compile()
+        return added
+
+    def load_file(self, filename):
+        """
+        加载 TemplateGenerator.save_patterns 生成的模板文件
+
+        Returns:
+            int: 实际添加的模式数量
+        """
+        if not os.path.exists(filename):
+            print(f"模板文件不存在: {filename}")
+            return 0
+        added = self.add_patterns(load_mined_patterns(filename), source=filename)
+        print(f"从 {filename} 加载了 {added} 个模板")
+        return added
+
+    def _compile(self):
+        """
+        将所有规则编译为一个带命名分组的交替表达式
+        """
+        self._combined = re.compile('|'.join(
+            f'(?P<_rule{rule.index}>{rule.pattern})' for rule in self.rules
+        ))
+
+    def match(self, line):
+        """
+        判断一行文本是否为固定模式
+
+        Returns:
+            BoilerplateRule: 命中的规则，未命中返回 None
+        """
+        if self._combined is None:
+            return None
+        m = self._combined.match(line)
+        if m is None:
+            return None
+
+        name = m.lastgroup
+        if name is None or not name.startswith('_rule'):
+            # 模式内部自带命名分组时，逐个查找外层规则分组
+            name = next(key for key, value in m.groupdict().items()
+                        if key.startswith('_rule') and value is not None)
+        return self.rules[int(name[len('_rule'):])]
+
+    def is_boilerplate(self, line):
+        """
+        判断一行文本是否为固定模式
+        """
+        return self.match(line) is not None
+
+    def __len__(self):
+        return len(self.rules)
@@ -1,8 +1,14 @@
 import re
-import akshare as ak
-import pandas as pd
+import os
+import sys
 from datetime import datetime, timedelta
 import json
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from modules.scraper.raw_transcript_store import fetch_news_contents
+from modules.processor.boilerplate_engine import BoilerplateEngine
 from simple_ner import SimpleNER, process_news_with_ner
 
 # 定义 boilerplate 模板（新闻联播固定模式）
@@ -22,8 +28,8 @@ BOILERPLATE_PATTERNS = [
     r'^据新华社消息.*$',                             # 新闻来源提示
 ]
 
-# 编译正则表达式
-BOILERPLATE_REGEX = [re.compile(p) for p in BOILERPLATE_PATTERNS]
+# 编译为单个匹配引擎
+BOILERPLATE_ENGINE = BoilerplateEngine(BOILERPLATE_PATTERNS)
 
 # 定义分割点的正则表达式
 SPLIT_RE = re.compile(
@@ -42,17 +48,7 @@ def clean_news_content(raw_content):
     lines = '\n'.join(raw_content).splitlines()
     
     # 移除 boilerplate 内容
-    cleaned_lines = []
-    for line in lines:
-        is_boilerplate = False
-        for pattern in BOILERPLATE_REGEX:
-            if pattern.match(line):
-                is_boilerplate = True
-                break
-        if not is_boilerplate:
-            cleaned_lines.append(line)
-    
-    return cleaned_lines
+    return [line for line in lines if not BOILERPLATE_ENGINE.is_boilerplate(line)]
 
 def split_news_segments(cleaned_lines):
     """
@@ -101,8 +97,7 @@ def process_one_day(date_str):
     """
     # 获取原始数据
     try:
-        raw_data = ak.news_cctv(date=date_str)
-        raw_content = raw_data['content'].tolist()
+        raw_content = fetch_news_contents(date_str)
     except Exception as e:
         print(f"获取 {date_str} 的数据失败: {e}")
         return None
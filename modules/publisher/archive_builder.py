@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+静态归档站点生成器
+将 datas/ 下所有 full_result_*.json 渲染为每日页面，并生成分页的日期索引、标签页和实体页。
+每日页面由进程池并行渲染；源文件的修改时间和大小未变、或内容哈希未变的日期直接跳过，
+汇总页面内容未变时也不重写
+
+用法:
+    python modules/publisher/archive_builder.py --output datas/archive
+"""
+
+import argparse
+import glob
+import hashlib
+import html
+import json
+import os
+import re
+import sys
+import time
+from multiprocessing import Pool
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import generate_news_html
+from modules.publisher.fragment_cache import content_hash
+from modules.publisher.news_summary_generator import format_date
+from modules.publisher.template_engine import HtmlWriter, Section, Theme
+
+# 默认的数据目录和输出目录
+DEFAULT_DATA_DIR = "datas"
+DEFAULT_OUTPUT_DIR = os.path.join("datas", "archive")
+
+# 日期索引每页的天数
+DAYS_PER_PAGE = 30
+
+# 记录源文件状态和已生成页面的清单文件
+MANIFEST_NAME = "manifest.json"
+
+# 归档格式版本，修改页面结构或清单内容时递增（变化后全部重建）；
+# 每日页面模板和 CSS 的变化由清单中记录的主题哈希（generate_news_html.THEME.version）检测
+ARCHIVE_VERSION = 2
+
+ENTITY_TYPES = {"locations": "地点", "persons": "人物", "organizations": "组织"}
+
+_SOURCE_RE = re.compile(r'full_result_(\d{8})\.json$')
+
+CSS = """
+        body {
+            font-family: "Microsoft YaHei", Arial, sans-serif;
+            line-height: 1.6;
+            max-width: 800px;
+            margin: 0 auto;
+            padding: 20px;
+            background-color: #f9f9f9;
+        }
+        .header {
+            text-align: center;
+            margin-bottom: 30px;
+            padding: 20px;
+            background-color: #fff;
+            border-radius: 8px;
+            box-shadow: 0 2px 5px rgba(0,0,0,0.1);
+        }
+        h1 {
+            color: #c0392b;
+            margin: 0;
+        }
+        .nav a, .pager a {
+            color: #2980b9;
+            margin: 0 8px;
+        }
+        .news-section {
+            background-color: #fff;
+            margin-bottom: 20px;
+            padding: 20px;
+            border-radius: 8px;
+            box-shadow: 0 2px 5px rgba(0,0,0,0.1);
+        }
+        h2 {
+            color: #2980b9;
+            border-bottom: 1px dashed #bdc3c7;
+            padding-bottom: 5px;
+        }
+        .pager {
+            text-align: center;
+            margin: 20px 0;
+        }
+    """
+
+PAGE_HEAD = """<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{page_title} - 新闻联播摘要归档</title>
+    {style}
+</head>
+<body>
+    <div class="header">
+        <h1>{page_title}</h1>
+        <div class="nav"><a href="{root}index.html">按日期</a><a href="{root}tags.html">标签</a><a href="{root}entities.html">实体</a></div>
+    </div>
+
+"""
+
+SECTION_HEAD = """    <div class="news-section">
+        <h2>{heading}</h2>
+        <ul>
+"""
+
+SECTION_TAIL = """        </ul>
+    </div>
+
+"""
+
+LINK_ITEM = """            <li><a href="{href}">{text}</a>{note}</li>
+"""
+
+PAGE_TAIL = """{pager}    <div class="footer">
+        <p>© 2025 新闻联播摘要 | 数据来源：央视新闻</p>
+    </div>
+</body>
+</html>
+"""
+
+
+def _link_context(link, index):
+    """
+    链接条目的模板字段；link 为 {"href", "text", "note"}
+    """
+    note = link.get("note", "")
+    return {
+        "href": link["href"],
+        "text": html.escape(link["text"]),
+        "note": f" {html.escape(note)}" if note else "",
+    }
+
+
+THEME = Theme('archive', PAGE_HEAD, PAGE_TAIL, LINK_ITEM, _link_context,
+              section_head=SECTION_HEAD, section_tail=SECTION_TAIL, css=CSS)
+
+
+def _slug(name):
+    """
+    标签和实体名称可能含有不能用作文件名的字符，统一用哈希作为文件名
+    """
+    return content_hash(name)[:12]
+
+
+def _file_hash(file_path):
+    with open(file_path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def find_sources(data_dir=DEFAULT_DATA_DIR):
+    """
+    查找所有 full_result_*.json
+
+    Returns:
+        dict: 日期 -> 文件路径
+    """
+    sources = {}
+    for file_path in glob.glob(os.path.join(data_dir, "full_result_*.json")):
+        match = _SOURCE_RE.search(os.path.basename(file_path))
+        if match:
+            sources[match.group(1)] = file_path
+    return sources
+
+
+def build_day(source_path, page_path):
+    """
+    渲染一天的页面，并提取汇总页面需要的条目信息（在进程池中运行）
+
+    Returns:
+        dict: 该日的条目信息
+    """
+    with open(source_path, 'r', encoding='utf-8') as f:
+        news_data = json.load(f)
+    generate_news_html.write_html(news_data, page_path)
+
+    items = []
+    for section in ('domestic', 'international'):
+        for item in news_data.get(section, []):
+            summary = item.get('summary', {})
+            entities = item.get('entities', {})
+            items.append({
+                "title": summary.get('title', '无标题'),
+                "keywords": [keyword for keyword in summary.get('keywords', []) if keyword],
+                "entities": {kind: [name for name in entities.get(kind, []) if name] for kind in ENTITY_TYPES},
+            })
+    return {"items": items}
+
+
+def _build_day_task(args):
+    date_str, source_path, page_path, source_state = args
+    day = build_day(source_path, page_path)
+    day.update(source_state, date=date_str)
+    return day
+
+
+class ArchiveBuilder:
+    """
+    增量构建归档站点
+    """
+
+    def __init__(self, data_dir=DEFAULT_DATA_DIR, output_dir=DEFAULT_OUTPUT_DIR, workers=None,
+                 days_per_page=DAYS_PER_PAGE):
+        """
+        Args:
+            data_dir (str): full_result_*.json 所在目录
+            output_dir (str): 站点输出目录
+            workers (int): 渲染每日页面的进程数，默认等于 CPU 核数
+            days_per_page (int): 日期索引每页的天数
+        """
+        self.data_dir = data_dir
+        self.output_dir = output_dir
+        self.workers = workers or os.cpu_count() or 1
+        self.days_per_page = days_per_page
+        self.manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {"days": {}, "pages": {}}
+        # 归档格式变化后全部重建
+        if manifest.get("version") != ARCHIVE_VERSION:
+            return {"days": {}, "pages": {}}
+        return manifest
+
+    def _save_manifest(self, manifest):
+        manifest["version"] = ARCHIVE_VERSION
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _day_page(self, date_str):
+        return os.path.join(self.output_dir, "days", f"{date_str}.html")
+
+    def _plan(self, sources, old_days):
+        """
+        比较源文件状态和每日页面主题的哈希，找出需要重新渲染的日期
+
+        Returns:
+            tuple: (未变化的日期信息 dict, 待渲染任务 list)
+        """
+        unchanged = {}
+        tasks = []
+        theme_version = generate_news_html.THEME.version
+        for date_str, source_path in sorted(sources.items()):
+            stat = os.stat(source_path)
+            state = {"mtime": stat.st_mtime, "size": stat.st_size, "theme": theme_version}
+            old = old_days.get(date_str)
+            # 每日页面的模板或 CSS 修改后，用旧模板渲染的页面需要重新渲染
+            page_current = (old is not None and old.get("theme") == theme_version
+                            and os.path.exists(self._day_page(date_str)))
+            if page_current and old["mtime"] == state["mtime"] and old["size"] == state["size"]:
+                unchanged[date_str] = old
+                continue
+            state["sha1"] = _file_hash(source_path)
+            if page_current and old.get("sha1") == state["sha1"]:
+                # 文件被重写但内容没变（如重新下载），只更新记录的状态
+                unchanged[date_str] = dict(old, **state)
+                continue
+            tasks.append((date_str, source_path, self._day_page(date_str), state))
+        return unchanged, tasks
+
+    def _render_days(self, tasks):
+        if len(tasks) > 1 and self.workers > 1:
+            with Pool(min(self.workers, len(tasks))) as pool:
+                return pool.map(_build_day_task, tasks)
+        return [_build_day_task(task) for task in tasks]
+
+    def build(self):
+        """
+        构建归档站点
+
+        Returns:
+            dict: 构建统计（日期数、重新渲染的日期数、写入和删除的页面数、耗时）
+        """
+        start = time.perf_counter()
+        os.makedirs(os.path.join(self.output_dir, "days"), exist_ok=True)
+        os.makedirs(os.path.join(self.output_dir, "tags"), exist_ok=True)
+        os.makedirs(os.path.join(self.output_dir, "entities"), exist_ok=True)
+
+        manifest = self._load_manifest()
+        sources = find_sources(self.data_dir)
+        days, tasks = self._plan(sources, manifest["days"])
+        for day in self._render_days(tasks):
+            days[day.pop("date")] = day
+
+        # 删除源文件已不存在的日期页面
+        removed = 0
+        for date_str in set(manifest["days"]) - set(days):
+            removed += self._remove(os.path.join("days", f"{date_str}.html"))
+
+        pages = self._summary_pages(days)
+        written = 0
+        new_page_hashes = {}
+        for relative_path, writer in pages.items():
+            page_hash = content_hash(writer.parts)
+            new_page_hashes[relative_path] = page_hash
+            full_path = os.path.join(self.output_dir, relative_path)
+            if manifest["pages"].get(relative_path) != page_hash or not os.path.exists(full_path):
+                writer.write_to(full_path)
+                written += 1
+        for relative_path in set(manifest["pages"]) - set(pages):
+            removed += self._remove(relative_path)
+
+        self._save_manifest({"days": days, "pages": new_page_hashes})
+        return {
+            "days": len(days),
+            "rendered_days": len(tasks),
+            "written_pages": written,
+            "removed_pages": removed,
+            "seconds": time.perf_counter() - start,
+        }
+
+    def _remove(self, relative_path):
+        try:
+            os.remove(os.path.join(self.output_dir, relative_path))
+            return 1
+        except FileNotFoundError:
+            return 0
+
+    def _summary_pages(self, days):
+        """
+        由各日的条目信息生成日期索引、标签页和实体页
+
+        Returns:
+            dict: 相对路径 -> HtmlWriter
+        """
+        pages = {}
+        dates = sorted(days, reverse=True)
+
+        # 日期索引（新的在前），每页 days_per_page 天
+        page_count = max(1, -(-len(dates) // self.days_per_page))
+        for page in range(page_count):
+            page_dates = dates[page * self.days_per_page:(page + 1) * self.days_per_page]
+            sections = [
+                Section([{"href": f"days/{date_str}.html", "text": item["title"]} for item in days[date_str]["items"]],
+                        {"heading": f'<a href="days/{date_str}.html">{format_date(date_str)}</a>'})
+                for date_str in page_dates
+            ]
+            context = {"page_title": "新闻联播摘要归档", "root": "", "pager": self._pager(page, page_count)}
+            pages[self._index_name(page)] = THEME.render_into(HtmlWriter(), context, sections)
+
+        # 标签页和实体页
+        tags = {}
+        entities = {}
+        for date_str in dates:
+            for item in days[date_str]["items"]:
+                link = {"href": f"../days/{date_str}.html", "text": format_date(date_str), "note": item["title"]}
+                for keyword in dict.fromkeys(item["keywords"]):
+                    tags.setdefault(keyword, []).append(link)
+                for kind, label in ENTITY_TYPES.items():
+                    for name in dict.fromkeys(item["entities"].get(kind, [])):
+                        entities.setdefault((label, name), []).append(link)
+
+        tag_links = []
+        for keyword, links in sorted(tags.items(), key=lambda pair: (-len(pair[1]), pair[0])):
+            relative_path = f"tags/{_slug(keyword)}.html"
+            pages[relative_path] = self._listing(f"标签：{keyword}", "../", [(keyword, links)])
+            tag_links.append({"href": relative_path, "text": keyword, "note": f"({len(links)})"})
+        pages["tags.html"] = self._listing("标签", "", [("全部标签", tag_links)])
+
+        entity_links = {label: [] for label in ENTITY_TYPES.values()}
+        for (label, name), links in sorted(entities.items(), key=lambda pair: (-len(pair[1]), pair[0])):
+            relative_path = f"entities/{_slug([label, name])}.html"
+            pages[relative_path] = self._listing(f"{label}：{name}", "../", [(name, links)])
+            entity_links[label].append({"href": relative_path, "text": name, "note": f"({len(links)})"})
+        pages["entities.html"] = self._listing("实体", "", list(entity_links.items()))
+        return pages
+
+    @staticmethod
+    def _listing(page_title, root, groups):
+        """
+        由 (分区标题, 链接列表) 生成一个列表页面
+        """
+        sections = [Section(links, {"heading": html.escape(heading)}) for heading, links in groups]
+        context = {"page_title": html.escape(page_title), "root": root, "pager": ""}
+        return THEME.render_into(HtmlWriter(), context, sections)
+
+    @staticmethod
+    def _index_name(page):
+        return "index.html" if page == 0 else f"index_{page + 1}.html"
+
+    def _pager(self, page, page_count):
+        if page_count == 1:
+            return ""
+        links = []
+        if page > 0:
+            links.append(f'<a href="{self._index_name(page - 1)}">上一页</a>')
+        links.append(f"第 {page + 1} / {page_count} 页")
+        if page < page_count - 1:
+            links.append(f'<a href="{self._index_name(page + 1)}">下一页</a>')
+        return f'    <div class="pager">{"".join(links)}</div>\n'
+
+
+def main():
+    """
+    主函数
+    """
+    parser = argparse.ArgumentParser(description='生成新闻联播摘要静态归档站点')
+    parser.add_argument('--data-dir', type=str, default=DEFAULT_DATA_DIR,
+                        help=f'full_result_*.json 所在目录 (默认: {DEFAULT_DATA_DIR})')
+    parser.add_argument('--output', type=str, default=DEFAULT_OUTPUT_DIR,
+                        help=f'站点输出目录 (默认: {DEFAULT_OUTPUT_DIR})')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='渲染每日页面的进程数 (默认: CPU 核数)')
+    parser.add_argument('--days-per-page', type=int, default=DAYS_PER_PAGE,
+                        help=f'日期索引每页的天数 (默认: {DAYS_PER_PAGE})')
+    args = parser.parse_args()
+
+    builder = ArchiveBuilder(args.data_dir, args.output, args.workers, args.days_per_page)
+    stats = builder.build()
+    print(f"归档完成: 共 {stats['days']} 天, 重新渲染 {stats['rendered_days']} 天, "
+          f"写入 {stats['written_pages']} 个页面, 删除 {stats['removed_pages']} 个页面, "
+          f"耗时 {stats['seconds']:.2f} 秒")
+    print(f"入口页面: {os.path.join(args.output, 'index.html')}")
+
+
+if __name__ == "__main__":
+    main()
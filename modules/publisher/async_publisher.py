@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+异步发布流程
+封面上传与文章生成并发进行，创建草稿并提交发布后，在后台按退避间隔轮询 freepublish/get，
+直到得到最终状态，并把状态和文章链接保存到本地发布记录中。
+接口调用仍使用同步的 requests 会话，通过 asyncio.to_thread 在线程中执行
+
+用法:
+    python modules/publisher/async_publisher.py --cover zi_yuan/cover.png
+    python modules/publisher/async_publisher.py --resume
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from modules.publisher.wechat_api import WeChatAPIError
+
+# 发布记录文件
+DEFAULT_PUBLISH_LOG = os.path.join("datas", "wechat_publish_log.json")
+
+# 轮询发布状态的初始间隔、最大间隔和总时长（秒）
+POLL_INITIAL_DELAY = 2
+POLL_MAX_DELAY = 60
+POLL_TIMEOUT = 30 * 60
+
+# freepublish/get 返回的 publish_status
+PUBLISH_STATUS_SUCCESS = 0
+PUBLISH_STATUS_PUBLISHING = 1
+PUBLISH_STATUS_TEXT = {
+    0: "发布成功",
+    1: "发布中",
+    2: "原创失败",
+    3: "常规失败",
+    4: "平台审核不通过",
+    5: "成功后用户删除所有文章",
+    6: "成功后系统封禁所有文章",
+}
+
+
+class PublishLog:
+    """
+    发布记录：publish_id -> 标题、草稿、状态和文章链接，保存在本地 JSON 文件中
+    """
+
+    def __init__(self, log_path: Optional[str] = DEFAULT_PUBLISH_LOG):
+        """
+        Args:
+            log_path (str): 记录文件路径，为 None 时只保存在内存中
+        """
+        self.log_path = log_path
+        self._lock = threading.Lock()
+        self._records = {}
+        if log_path:
+            try:
+                with open(log_path, 'r', encoding='utf-8') as f:
+                    self._records = json.load(f)
+            except (OSError, ValueError):
+                pass
+
+    def _save(self):
+        if not self.log_path:
+            return
+        log_dir = os.path.dirname(self.log_path)
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
+        tmp_path = f"{self.log_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._records, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.log_path)
+
+    def update(self, publish_id: str, **fields) -> Dict[str, Any]:
+        """
+        更新一条记录并写入文件
+        """
+        with self._lock:
+            record = self._records.setdefault(publish_id, {"publish_id": publish_id})
+            record.update(fields, updated_at=int(time.time()))
+            self._save()
+            return dict(record)
+
+    def get(self, publish_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            record = self._records.get(publish_id)
+            return dict(record) if record else None
+
+    def pending(self):
+        """
+        仍在发布中的记录
+        """
+        with self._lock:
+            return [dict(record) for record in self._records.values()
+                    if record.get("publish_status") == PUBLISH_STATUS_PUBLISHING]
+
+
+class AsyncWeChatPublisher:
+    """
+    基于 asyncio 的发布流程，包装 WeChatPublisher 或 WeChatPublicationManager
+    """
+
+    def __init__(self, publisher, publish_log: Optional[PublishLog] = None,
+                 poll_initial: float = POLL_INITIAL_DELAY, poll_max: float = POLL_MAX_DELAY,
+                 poll_timeout: float = POLL_TIMEOUT):
+        """
+        Args:
+            publisher: WeChatPublisher 或 WeChatPublicationManager 实例
+            publish_log (PublishLog): 发布记录，默认保存在 datas/wechat_publish_log.json
+            poll_initial (float): 轮询初始间隔（秒），之后每次翻倍
+            poll_max (float): 轮询最大间隔（秒）
+            poll_timeout (float): 轮询总时长（秒），超时后记录为 timeout
+        """
+        self.publisher = publisher
+        self.publish_log = publish_log or PublishLog()
+        self.poll_initial = poll_initial
+        self.poll_max = poll_max
+        self.poll_timeout = poll_timeout
+        self._tasks = set()
+
+    async def _create_draft(self, title: str, content: str, thumb_media_id: str, cover_image_path: str) -> Tuple[str, str]:
+        """
+        创建草稿，缓存的封面素材已被删除时重新上传
+        """
+        draft_media_ids, thumb_media_id = await asyncio.to_thread(
+            self.publisher.create_drafts_with_cover, [(title, content)], thumb_media_id, cover_image_path)
+        return draft_media_ids[0], thumb_media_id
+
+    async def publish(self, render: Callable[[], Tuple[str, str]], cover_image_path: str) -> Dict[str, Any]:
+        """
+        生成并发布文章：封面上传与文章生成并发，提交后在后台轮询发布状态
+
+        Args:
+            render (callable): 无参函数，返回 (标题, HTML内容)，在线程中执行
+            cover_image_path (str): 封面图片路径
+
+        Returns:
+            dict: 提交时的发布记录；最终状态由后台任务写入发布记录，可调用 wait() 等待
+
+        Raises:
+            WeChatAPIError: 上传、创建草稿或提交发布失败
+        """
+        (title, content), thumb_media_id = await asyncio.gather(
+            asyncio.to_thread(render),
+            asyncio.to_thread(self.publisher.upload_image_cached, cover_image_path),
+        )
+        draft_media_id, thumb_media_id = await self._create_draft(title, content, thumb_media_id, cover_image_path)
+
+        result = await asyncio.to_thread(self.publisher.publish_draft, draft_media_id)
+        if result.get("errcode", 0) != 0 or "publish_id" not in result:
+            raise WeChatAPIError("提交发布失败", result)
+
+        publish_id = str(result["publish_id"])
+        record = self.publish_log.update(
+            publish_id,
+            title=title,
+            thumb_media_id=thumb_media_id,
+            draft_media_id=draft_media_id,
+            publish_status=PUBLISH_STATUS_PUBLISHING,
+            status_text=PUBLISH_STATUS_TEXT[PUBLISH_STATUS_PUBLISHING],
+            submitted_at=int(time.time()),
+        )
+        self.track(publish_id)
+        return record
+
+    def track(self, publish_id: str) -> asyncio.Task:
+        """
+        在后台轮询发布状态
+        """
+        task = asyncio.create_task(self.poll_status(publish_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def poll_status(self, publish_id: str) -> Dict[str, Any]:
+        """
+        按退避间隔轮询 freepublish/get，直到发布结束或超时
+
+        Returns:
+            dict: 最终的发布记录
+        """
+        deadline = time.monotonic() + self.poll_timeout
+        delay = self.poll_initial
+        while True:
+            try:
+                result = await asyncio.to_thread(self.publisher.api.post_json, "/freepublish/get",
+                                                 {"publish_id": publish_id})
+            except Exception as e:
+                # 网络错误时继续轮询
+                result = {"errcode": -1, "errmsg": str(e)}
+
+            status = result.get("publish_status")
+            if result.get("errcode", 0) == 0 and status is not None and status != PUBLISH_STATUS_PUBLISHING:
+                items = result.get("article_detail", {}).get("item", [])
+                return self.publish_log.update(
+                    publish_id,
+                    publish_status=status,
+                    status_text=PUBLISH_STATUS_TEXT.get(status, f"未知状态 {status}"),
+                    article_id=result.get("article_id"),
+                    article_urls=[item.get("article_url") for item in items if item.get("article_url")],
+                    fail_idx=result.get("fail_idx", []),
+                )
+            if result.get("errcode", 0) != 0:
+                self.publish_log.update(publish_id, last_error=result)
+
+            if time.monotonic() + delay > deadline:
+                return self.publish_log.update(publish_id, status_text="轮询超时")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.poll_max)
+
+    async def resume_pending(self):
+        """
+        继续轮询上次运行时未得到最终状态的记录
+        """
+        for record in self.publish_log.pending():
+            self.track(record["publish_id"])
+        await self.wait()
+
+    async def wait(self):
+        """
+        等待所有后台轮询结束
+        """
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks))
+
+
+def _latest_full_result(data_dir="datas"):
+    files = sorted(glob.glob(os.path.join(data_dir, "full_result_*.json")))
+    return files[-1] if files else None
+
+
+async def _run(args):
+    from modules.publisher.wechat_publisher import WeChatPublisher
+
+    publisher = AsyncWeChatPublisher(WeChatPublisher(args.app_id, args.app_secret))
+    if args.resume:
+        await publisher.resume_pending()
+        return
+
+    news_file = args.file or _latest_full_result()
+    if not news_file:
+        print("未找到full_result_*.json文件")
+        return
+    with open(news_file, 'r', encoding='utf-8') as f:
+        news_data = json.load(f)
+
+    from modules.publisher.wechat_article_generator_v2 import generate_wechat_article_with_llm
+
+    print(f"正在生成并发布: {news_file}")
+    record = await publisher.publish(lambda: generate_wechat_article_with_llm(news_data), args.cover)
+    print(f"已提交发布: {record['title']} (publish_id: {record['publish_id']})")
+    print("正在等待发布结果...")
+    await publisher.wait()
+    final = publisher.publish_log.get(record["publish_id"])
+    print(f"发布结果: {final['status_text']}")
+    for url in final.get("article_urls", []):
+        print(f"文章链接: {url}")
+
+
+def main():
+    """
+    主函数
+    """
+    parser = argparse.ArgumentParser(description='异步发布新闻联播文章到微信公众号')
+    parser.add_argument('--file', type=str, default=None,
+                        help='full_result_*.json 文件路径 (默认: datas 目录下最新的文件)')
+    parser.add_argument('--cover', type=str, default=os.path.join("zi_yuan", "cover.png"),
+                        help='封面图片路径')
+    parser.add_argument('--resume', action='store_true',
+                        help='继续轮询上次未得到最终状态的发布')
+    args = parser.parse_args()
+
+    args.app_id = os.getenv('WECHAT_APP_ID')
+    args.app_secret = os.getenv('WECHAT_APP_SECRET')
+    if not args.app_id or not args.app_secret:
+        print("请设置环境变量 WECHAT_APP_ID 和 WECHAT_APP_SECRET")
+        return
+
+    try:
+        asyncio.run(_run(args))
+    except Exception as e:
+        print(f"发布失败: {e}")
+
+
+if __name__ == "__main__":
+    main()
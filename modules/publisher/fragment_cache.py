@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTML 片段缓存和预览渲染器
+每条新闻渲染出的 HTML 片段按“主题模板版本 + 参与渲染的内容”的哈希缓存。
+PreviewRenderer 在编辑预览期间长期存在，每次重新预览时未改动的条目直接复用片段，
+修改某条新闻的摘要后只重新渲染这一条，页面由缓存的片段重新拼接
+"""
+
+import copy
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from modules.publisher.template_engine import HtmlWriter
+
+# 默认最多缓存的片段数
+DEFAULT_MAX_ENTRIES = 10000
+
+
+def content_hash(*parts):
+    """
+    计算可 JSON 序列化内容的哈希（字典按键排序，与键的顺序无关）
+    """
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class FragmentCache:
+    """
+    LRU 片段缓存：内容哈希 -> HTML 片段
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        """
+        Args:
+            max_entries (int): 最多缓存的片段数，超出时淘汰最久未使用的片段
+        """
+        self.max_entries = max_entries
+        self._fragments = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        获取缓存的片段，未命中返回 None
+        """
+        with self._lock:
+            fragment = self._fragments.get(key)
+            if fragment is None:
+                self.misses += 1
+                return None
+            self._fragments.move_to_end(key)
+            self.hits += 1
+            return fragment
+
+    def put(self, key, fragment):
+        with self._lock:
+            self._fragments[key] = fragment
+            self._fragments.move_to_end(key)
+            while len(self._fragments) > self.max_entries:
+                self._fragments.popitem(last=False)
+
+    def stats(self):
+        """
+        缓存统计信息
+        """
+        with self._lock:
+            return {"entries": len(self._fragments), "hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        with self._lock:
+            self._fragments.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class PreviewRenderer:
+    """
+    长期存在的预览渲染器，接口与 Theme 的 render/write 相同，可传给各生成器的 renderer 参数
+
+    每个条目位置记住上次的摘要副本和片段：摘要没有变化时（字典比较，远快于序列化求哈希）直接复用片段；
+    变化时按内容哈希查找片段缓存（撤销修改、条目移动后仍能命中），缓存中没有才渲染该条目
+    """
+
+    def __init__(self, theme, cache=None):
+        """
+        Args:
+            theme (Theme): 生成器主题，如 generate_wechat_html.THEME
+            cache (FragmentCache): 片段缓存，多个预览渲染器可共用
+        """
+        self.theme = theme
+        self.cache = cache or FragmentCache()
+        # (分区序号, 分区参数, 条目序号) -> (上次的摘要副本, 片段)
+        self._slots = {}
+        self.reused = 0
+        self.rendered = 0
+
+    def _item_fragment(self, section_no, summary, index, extra):
+        slot = (section_no, extra, index)
+        memo = self._slots.get(slot)
+        if memo is not None and memo[0] == summary:
+            self.reused += 1
+            return memo[1]
+
+        key = content_hash(self.theme.version, summary, index, extra)
+        fragment = self.cache.get(key)
+        if fragment is None:
+            fragment = self.theme.render_item(summary, index, extra)
+            self.cache.put(key, fragment)
+            self.rendered += 1
+        else:
+            self.reused += 1
+        # 编辑器可能原地修改摘要字典，保存副本用于下次比较
+        self._slots[slot] = (copy.deepcopy(summary), fragment)
+        return fragment
+
+    def stats(self):
+        """
+        预览统计：复用的片段数和重新渲染的条目数
+        """
+        return {"reused": self.reused, "rendered": self.rendered}
+
+    def render_into(self, writer, context, sections):
+        return self.theme.render_into(writer, context, sections, self._item_fragment)
+
+    def render(self, context, sections):
+        """
+        渲染整页为字符串，未改动的条目使用缓存的片段
+        """
+        return self.render_into(HtmlWriter(), context, sections).getvalue()
+
+    def write(self, file_path, context, sections):
+        """
+        渲染整页并逐段写入文件
+
+        Returns:
+            str: 文件路径
+        """
+        return self.render_into(HtmlWriter(), context, sections).write_to(file_path)
@@ -15,6 +15,55 @@ from datetime import datetime
 # 添加项目根目录到Python路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+from modules.publisher.template_engine import Section, Theme
+
+# 微信公众号编辑器会过滤 <style>，样式全部内联
+PAGE_HEAD = '''<section style="background-color: #fff; padding: 16px; font-family: -apple-system, BlinkMacSystemFont, 'Helvetica Neue', Helvetica, Arial, sans-serif; font-size: 16px; color: #333;">
+  <section style="text-align: center; margin-bottom: 20px;">
+    <h1 style="font-size: 24px; color: #2c3e50; margin: 0 0 10px 0; font-weight: bold;">新闻联播 | {formatted_date}</h1>
+    <p style="font-size: 14px; color: #7f8c8d; margin: 0;">每日要闻速览</p>
+  </section>
+
+  <section style="background-color: #f8f9fa; padding: 12px; border-radius: 8px; margin-bottom: 20px;">
+    <p style="margin: 0 0 5px 0; font-weight: bold;"><strong>统计信息：</strong></p>
+    <p style="margin: 0;">国内新闻条目: {domestic_count} 条</p>
+    <p style="margin: 0;">国际新闻条目: {international_count} 条</p>
+  </section>
+
+  <section>
+'''
+
+SECTION_HEAD = '    <h2 style="font-size: 20px; color: #2980b9; margin: 20px 0 15px 0; padding-bottom: 8px; border-bottom: 1px dashed #bdc3c7;">【{heading}】</h2>\n'
+
+NEWS_ITEM = '''    <section style="margin-bottom: 15px; padding: 12px; background-color: #fafafa; border-radius: 6px;">
+      <h3 style="font-size: 17px; color: #34495e; margin: 0 0 10px 0;">{index}. {title}</h3>
+      <p style="margin: 0; line-height: 1.6; text-align: justify;">{summary}</p>
+    </section>
+'''
+
+PAGE_TAIL = '''  </section>
+
+  <section style="margin-top: 20px; padding: 12px; background-color: #fff8e1; border-left: 4px solid #f39c12; border-radius: 0 6px 6px 0;">
+    <p style="margin: 0; font-weight: bold;"><strong>编辑说明：</strong></p>
+    <p style="margin: 5px 0 0 0; line-height: 1.5;">以上是今日新闻联播的主要内容总结。通过对重要新闻的梳理，我们可以看到国内外在政治、经济、社会等多个领域的重要动态。所有内容均来自原始数据文件，包含大模型自动生成的摘要信息。</p>
+  </section>
+</section>'''
+
+
+def _news_item_context(summary, index, default_title):
+    """
+    单条新闻的模板字段
+    """
+    return {
+        "index": index,
+        "title": summary.get('title', f'{default_title}{index}'),
+        "summary": summary.get('summary', ''),
+    }
+
+
+THEME = Theme('wechat_html', PAGE_HEAD, PAGE_TAIL, NEWS_ITEM, _news_item_context,
+              section_head=SECTION_HEAD, skip_empty_sections=True)
+
 def load_latest_data():
     """
     加载最新的full_result_*.json文件
@@ -56,12 +105,13 @@ def format_date(date_str):
     """
     return f"{date_str[:4]}年{date_str[4:6]}月{date_str[6:]}日"
 
-def generate_wechat_html(news_data):
+def generate_wechat_html(news_data, renderer=None):
     """
     生成适合微信公众号的HTML内容
     
     Args:
         news_data (dict): 新闻数据
+        renderer (PreviewRenderer): 可选，编辑预览时传入长期存在的预览渲染器，未改动的条目复用缓存的片段
         
     Returns:
         str: 生成的HTML内容
@@ -69,61 +119,18 @@ def generate_wechat_html(news_data):
     date_str = news_data.get('date', datetime.now().strftime('%Y%m%d'))
     formatted_date = format_date(date_str)
     
-    # 构建HTML内容
-    html_content = f'''<section style="background-color: #fff; padding: 16px; font-family: -apple-system, BlinkMacSystemFont, 'Helvetica Neue', Helvetica, Arial, sans-serif; font-size: 16px; color: #333;">
-  <section style="text-align: center; margin-bottom: 20px;">
-    <h1 style="font-size: 24px; color: #2c3e50; margin: 0 0 10px 0; font-weight: bold;">新闻联播 | {formatted_date}</h1>
-    <p style="font-size: 14px; color: #7f8c8d; margin: 0;">每日要闻速览</p>
-  </section>
-
-  <section style="background-color: #f8f9fa; padding: 12px; border-radius: 8px; margin-bottom: 20px;">
-    <p style="margin: 0 0 5px 0; font-weight: bold;"><strong>统计信息：</strong></p>
-    <p style="margin: 0;">国内新闻条目: {len(news_data.get('domestic', []))} 条</p>
-    <p style="margin: 0;">国际新闻条目: {len(news_data.get('international', []))} 条</p>
-  </section>
-
-  <section>
-'''
-
-    # 添加国内新闻
     domestic_news = news_data.get('domestic', [])
-    if domestic_news:
-        html_content += '    <h2 style="font-size: 20px; color: #2980b9; margin: 20px 0 15px 0; padding-bottom: 8px; border-bottom: 1px dashed #bdc3c7;">【国内要闻】</h2>\n'
-        for i, item in enumerate(domestic_news, 1):
-            summary = item.get('summary', {})
-            title = summary.get('title', f'国内新闻{i}')
-            summary_text = summary.get('summary', '')
-            
-            html_content += f'''    <section style="margin-bottom: 15px; padding: 12px; background-color: #fafafa; border-radius: 6px;">
-      <h3 style="font-size: 17px; color: #34495e; margin: 0 0 10px 0;">{i}. {title}</h3>
-      <p style="margin: 0; line-height: 1.6; text-align: justify;">{summary_text}</p>
-    </section>
-'''
-
-    # 添加国际新闻
     international_news = news_data.get('international', [])
-    if international_news:
-        html_content += '    <h2 style="font-size: 20px; color: #2980b9; margin: 20px 0 15px 0; padding-bottom: 8px; border-bottom: 1px dashed #bdc3c7;">【国际动态】</h2>\n'
-        for i, item in enumerate(international_news, 1):
-            summary = item.get('summary', {})
-            title = summary.get('title', f'国际新闻{i}')
-            summary_text = summary.get('summary', '')
-            
-            html_content += f'''    <section style="margin-bottom: 15px; padding: 12px; background-color: #fafafa; border-radius: 6px;">
-      <h3 style="font-size: 17px; color: #34495e; margin: 0 0 10px 0;">{i}. {title}</h3>
-      <p style="margin: 0; line-height: 1.6; text-align: justify;">{summary_text}</p>
-    </section>
-'''
-
-    html_content += '''  </section>
-
-  <section style="margin-top: 20px; padding: 12px; background-color: #fff8e1; border-left: 4px solid #f39c12; border-radius: 0 6px 6px 0;">
-    <p style="margin: 0; font-weight: bold;"><strong>编辑说明：</strong></p>
-    <p style="margin: 5px 0 0 0; line-height: 1.5;">以上是今日新闻联播的主要内容总结。通过对重要新闻的梳理，我们可以看到国内外在政治、经济、社会等多个领域的重要动态。所有内容均来自原始数据文件，包含大模型自动生成的摘要信息。</p>
-  </section>
-</section>'''
-    
-    return html_content
+    context = {
+        "formatted_date": formatted_date,
+        "domestic_count": len(domestic_news),
+        "international_count": len(international_news),
+    }
+    sections = [
+        Section([item.get('summary', {}) for item in domestic_news], {"heading": "国内要闻"}, extra=('国内新闻',)),
+        Section([item.get('summary', {}) for item in international_news], {"heading": "国际动态"}, extra=('国际新闻',)),
+    ]
+    return (renderer or THEME).render(context, sections)
 
 def main():
     """
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+封面图片预处理
+上传前将封面裁剪缩放到微信推荐的封面尺寸（900x383，2.35:1），并压缩为不超过大小上限的 JPEG；
+处理结果按源文件内容哈希缓存在磁盘上，同一张封面只处理一次。
+需要安装 Pillow，未安装时直接使用原图
+"""
+
+import os
+import threading
+from io import BytesIO
+from typing import Optional, Tuple
+
+from modules.publisher.wechat_media_cache import file_sha1
+
+# 微信推荐的封面尺寸
+COVER_SIZE = (900, 383)
+
+# 处理后的文件大小上限（字节）
+DEFAULT_MAX_BYTES = 200 * 1024
+
+# 处理结果的缓存目录
+DEFAULT_IMAGE_CACHE_DIR = os.path.join("datas", "image_cache")
+
+# 预处理算法版本，修改处理方式时递增（旧的缓存文件不再使用）
+PREP_VERSION = 1
+
+# JPEG 质量从高到低尝试，仍超出上限时再缩小尺寸
+_QUALITY_STEPS = (85, 75, 65, 55, 45)
+_MIN_SCALE = 0.3
+
+_warned = threading.Event()
+
+
+def _crop_to_ratio(image, ratio: float):
+    """
+    居中裁剪到指定宽高比
+    """
+    width, height = image.size
+    if width / height > ratio:
+        new_width = round(height * ratio)
+        left = (width - new_width) // 2
+        return image.crop((left, 0, left + new_width, height))
+    new_height = round(width / ratio)
+    top = (height - new_height) // 2
+    return image.crop((0, top, width, top + new_height))
+
+
+def _encode_under_budget(image, max_bytes: int) -> bytes:
+    """
+    压缩为 JPEG，依次降低质量和尺寸直到不超过 max_bytes
+    """
+    from PIL import Image
+
+    scale = 1.0
+    data = b""
+    while True:
+        if scale < 1.0:
+            size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+            candidate = image.resize(size, Image.LANCZOS)
+        else:
+            candidate = image
+        for quality in _QUALITY_STEPS:
+            buffer = BytesIO()
+            candidate.save(buffer, "JPEG", quality=quality, optimize=True, progressive=True)
+            data = buffer.getvalue()
+            if len(data) <= max_bytes:
+                return data
+        if scale <= _MIN_SCALE:
+            return data
+        scale *= 0.8
+
+
+def prepare_cover(image_path: str, size: Tuple[int, int] = COVER_SIZE, max_bytes: int = DEFAULT_MAX_BYTES,
+                  cache_dir: str = DEFAULT_IMAGE_CACHE_DIR, content_hash: Optional[str] = None) -> str:
+    """
+    生成适合上传的封面图片
+
+    Args:
+        image_path (str): 原图路径
+        size (tuple): 目标尺寸 (宽, 高)，原图较小时不放大
+        max_bytes (int): 文件大小上限
+        cache_dir (str): 缓存目录
+        content_hash (str): 原图内容哈希，已计算过时传入可避免重复读取
+
+    Returns:
+        str: 处理后的图片路径；未安装 Pillow 或处理后反而更大时返回原图路径
+    """
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        if not _warned.is_set():
+            _warned.set()
+            print("警告: 未安装Pillow，封面图片将不经压缩直接上传")
+        return image_path
+
+    content_hash = content_hash or file_sha1(image_path)
+    width, height = size
+    cache_path = os.path.join(cache_dir, f"{content_hash}_{width}x{height}_{max_bytes}_v{PREP_VERSION}.jpg")
+    if os.path.exists(cache_path):
+        return cache_path
+
+    try:
+        source = Image.open(image_path)
+    except OSError:
+        # 无法识别的图片格式交给微信服务器判断
+        return image_path
+
+    with source:
+        # 按 EXIF 方向旋转，去掉透明通道（JPEG 不支持）
+        image = ImageOps.exif_transpose(source)
+        if image.mode in ("RGBA", "LA", "P"):
+            image = image.convert("RGBA")
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel("A"))
+            image = background
+        elif image.mode != "RGB":
+            image = image.convert("RGB")
+
+        image = _crop_to_ratio(image, width / height)
+        if image.width > width:
+            image = image.resize((width, height), Image.LANCZOS)
+        data = _encode_under_budget(image, max_bytes)
+
+    if len(data) >= os.path.getsize(image_path):
+        return image_path
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, cache_path)
+    return cache_path
@@ -15,57 +15,11 @@ from datetime import datetime
 # 添加项目根目录到Python路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-def load_processed_data(file_path):
-    """
-    加载full_result_*.json文件
-    
-    Args:
-        file_path (str): 文件路径
-        
-    Returns:
-        dict: 加载的数据
-    """
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"文件不存在: {file_path}")
-    
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-def format_date(date_str):
-    """
-    格式化日期字符串
-    
-    Args:
-        date_str (str): YYYYMMDD格式的日期字符串
-        
-    Returns:
-        str: 格式化后的日期字符串
-    """
-    return f"{date_str[:4]}年{date_str[4:6]}月{date_str[6:]}日"
+from modules.publisher.template_engine import Section, Theme
 
-def generate_summary_content(news_data):
-    """
-    生成新闻总结内容
-    
-    Args:
-        news_data (dict): 新闻数据
-        
-    Returns:
-        str: 生成的HTML内容
-    """
-    date_str = news_data.get('date', datetime.now().strftime('%Y%m%d'))
-    formatted_date = format_date(date_str)
-    
-    # 构建带样式的HTML文章
-    html_content = f"""
-<!DOCTYPE html>
-<html lang="zh-CN">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>新闻联播总结 | {formatted_date}</title>
-    <style>
-        body {{
+# 样式表
+CSS = """
+        body {
             font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, "Noto Sans", sans-serif;
             line-height: 1.6;
             color: #333;
@@ -73,72 +27,81 @@ def generate_summary_content(news_data):
             margin: 0 auto;
             padding: 20px;
             background-color: #f8f9fa;
-        }}
-        .article-container {{
+        }
+        .article-container {
             background-color: white;
             border-radius: 10px;
             padding: 30px;
             box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        h1 {{
+        }
+        h1 {
             color: #2c3e50;
             text-align: center;
             border-bottom: 2px solid #3498db;
             padding-bottom: 15px;
             font-size: 24px;
-        }}
-        .summary {{
+        }
+        .summary {
             background-color: #e3f2fd;
             border-left: 4px solid #3498db;
             padding: 15px;
             margin: 20px 0;
             border-radius: 0 5px 5px 0;
-        }}
-        h2 {{
+        }
+        h2 {
             color: #2980b9;
             margin-top: 30px;
             padding-bottom: 5px;
             border-bottom: 1px dashed #bdc3c7;
-        }}
-        h3 {{
+        }
+        h3 {
             color: #34495e;
             margin-top: 20px;
-        }}
-        p {{
+        }
+        p {
             margin: 10px 0;
             text-align: justify;
-        }}
-        .keywords {{
+        }
+        .keywords {
             background-color: #f1f8e9;
             padding: 8px 12px;
             border-radius: 4px;
             font-size: 14px;
-        }}
-        hr {{
+        }
+        hr {
             border: none;
             height: 1px;
             background-color: #ecf0f1;
             margin: 30px 0;
-        }}
-        .editor-note {{
+        }
+        .editor-note {
             background-color: #fff8e1;
             border-left: 4px solid #f39c12;
             padding: 15px;
             border-radius: 0 5px 5px 0;
-        }}
-        .date {{
+        }
+        .date {
             text-align: center;
             color: #7f8c8d;
             font-size: 14px;
             margin-bottom: 20px;
-        }}
-        .stats {{
+        }
+        .stats {
             background-color: #e8f5e9;
             padding: 15px;
             border-radius: 5px;
             margin: 20px 0;
-        }}
-    </style>
+        }
+    """
+
+PAGE_HEAD = """
+<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>新闻联播总结 | {formatted_date}</title>
+    {style}
 </head>
 <body>
     <div class="article-container">
@@ -151,46 +114,20 @@ def generate_summary_content(news_data):
         
         <div class="stats">
             <p><strong>统计信息：</strong></p>
-            <p>国内新闻条目: {len(news_data.get('domestic', []))} 条</p>
-            <p>国际新闻条目: {len(news_data.get('international', []))} 条</p>
+            <p>国内新闻条目: {domestic_count} 条</p>
+            <p>国际新闻条目: {international_count} 条</p>
         </div>
 """
 
-    # 添加国内新闻
-    domestic_news = news_data.get('domestic', [])
-    if domestic_news:
-        html_content += "        <h2>【国内要闻】</h2>\n"
-        for i, item in enumerate(domestic_news, 1):
-            summary = item.get('summary', {})
-            title = summary.get('title', f'国内新闻{i}')
-            summary_text = summary.get('summary', '')
-            keywords = summary.get('keywords', [])
-            
-            # 完整显示原始标题，不做截断处理（按用户需求）
-            # 完整显示原始标题，不做截断处理（按用户需求）
-            html_content += f"        <h3>{i}. {title}</h3>\n"
-            html_content += f"        <p>{summary_text}</p>\n"
-            if keywords and any(keywords):
-                html_content += f"        <div class=\"keywords\"><strong>关键词：</strong>{'、'.join(keywords)}</div>\n"
-            html_content += "\n"
-    
-    # 添加国际新闻
-    international_news = news_data.get('international', [])
-    if international_news:
-        html_content += "        <h2>【国际动态】</h2>\n"
-        for i, item in enumerate(international_news, 1):
-            summary = item.get('summary', {})
-            title = summary.get('title', f'国际新闻{i}')
-            summary_text = summary.get('summary', '')
-            keywords = summary.get('keywords', [])
-            
-            html_content += f"        <h3>{i}. {title}</h3>\n"
-            html_content += f"        <p>{summary_text}</p>\n"
-            if keywords and any(keywords):
-                html_content += f"        <div class=\"keywords\"><strong>关键词：</strong>{'、'.join(keywords)}</div>\n"
-            html_content += "\n"
-    
-    html_content += """
+SECTION_HEAD = "        <h2>【{heading}】</h2>\n"
+
+# 完整显示原始标题，不做截断处理（按用户需求）
+NEWS_ITEM = """        <h3>{index}. {title}</h3>
+        <p>{summary}</p>
+{keywords}
+"""
+
+PAGE_TAIL = """
         <hr>
         <div class="editor-note">
             <p><strong>编辑总结：</strong>以上是今日新闻联播的主要内容总结。通过对重要新闻的梳理，我们可以看到国内外在政治、经济、社会等多个领域的重要动态。建议持续关注相关政策动向，以获取更深入的解读。</p>
@@ -199,8 +136,86 @@ def generate_summary_content(news_data):
 </body>
 </html>
 """
+
+
+def _news_item_context(summary, index, default_title):
+    """
+    单条新闻的模板字段
+    
+    Args:
+        summary (dict): 新闻摘要
+        index (int): 序号
+        default_title (str): 缺少标题时使用的名称前缀
+    """
+    keywords = summary.get('keywords', [])
+    keywords_html = ''
+    if keywords and any(keywords):
+        keywords_html = f"        <div class=\"keywords\"><strong>关键词：</strong>{'、'.join(keywords)}</div>\n"
+    return {
+        "index": index,
+        "title": summary.get('title', f'{default_title}{index}'),
+        "summary": summary.get('summary', ''),
+        "keywords": keywords_html,
+    }
+
+
+THEME = Theme('summary_content', PAGE_HEAD, PAGE_TAIL, NEWS_ITEM, _news_item_context,
+              section_head=SECTION_HEAD, css=CSS, skip_empty_sections=True)
+
+def load_processed_data(file_path):
+    """
+    加载full_result_*.json文件
+    
+    Args:
+        file_path (str): 文件路径
+        
+    Returns:
+        dict: 加载的数据
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"文件不存在: {file_path}")
     
-    return html_content
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def format_date(date_str):
+    """
+    格式化日期字符串
+    
+    Args:
+        date_str (str): YYYYMMDD格式的日期字符串
+        
+    Returns:
+        str: 格式化后的日期字符串
+    """
+    return f"{date_str[:4]}年{date_str[4:6]}月{date_str[6:]}日"
+
+def generate_summary_content(news_data, renderer=None):
+    """
+    生成新闻总结内容
+    
+    Args:
+        news_data (dict): 新闻数据
+        renderer (PreviewRenderer): 可选，编辑预览时传入长期存在的预览渲染器，未改动的条目复用缓存的片段
+        
+    Returns:
+        str: 生成的HTML内容
+    """
+    date_str = news_data.get('date', datetime.now().strftime('%Y%m%d'))
+    formatted_date = format_date(date_str)
+    
+    domestic_news = news_data.get('domestic', [])
+    international_news = news_data.get('international', [])
+    context = {
+        "formatted_date": formatted_date,
+        "domestic_count": len(domestic_news),
+        "international_count": len(international_news),
+    }
+    sections = [
+        Section([item.get('summary', {}) for item in domestic_news], {"heading": "国内要闻"}, extra=('国内新闻',)),
+        Section([item.get('summary', {}) for item in international_news], {"heading": "国际动态"}, extra=('国际新闻',)),
+    ]
+    return (renderer or THEME).render(context, sections)
 
 def find_latest_processed_file():
     """
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTML 模板引擎
+各生成器共用的渲染层：模板在加载时预编译为“常量文本 + 字段”序列，CSS 块只拼接一次，
+页面由片段列表 join 生成或直接逐段写入文件。
+各生成器只需定义自己的主题（CSS、页头、分区、条目和页尾模板）
+"""
+
+import functools
+import hashlib
+import string
+
+_formatter = string.Formatter()
+
+
+class Template:
+    """
+    预编译模板
+    源文本使用 str.format 语法：{name} 为字段（可带 !r 转换和 :格式），{{ 和 }} 为花括号本身
+    """
+
+    def __init__(self, source):
+        """
+        Args:
+            source (str): 模板源文本
+
+        Raises:
+            ValueError: 字段不是简单名称（不支持 {a.b}、{a[0]} 和位置参数）
+        """
+        self.source = source
+        self._ops = []
+        fields = []
+        for literal, field, spec, conversion in _formatter.parse(source):
+            if field is not None and not field.isidentifier():
+                raise ValueError(f"模板字段必须是名称: {{{field}}}")
+            if field is not None:
+                fields.append(field)
+            self._ops.append((literal, field, conversion, spec))
+        self.fields = tuple(dict.fromkeys(fields))
+
+    def render_into(self, out, context):
+        """
+        将渲染结果逐段追加到列表 out
+
+        Raises:
+            KeyError: context 中缺少模板字段
+        """
+        append = out.append
+        for literal, field, conversion, spec in self._ops:
+            if literal:
+                append(literal)
+            if field is None:
+                continue
+            value = context[field]
+            if conversion:
+                value = _formatter.convert_field(value, conversion)
+            append(format(value, spec) if spec else str(value))
+
+    def render(self, **context):
+        """
+        渲染为字符串
+        """
+        out = []
+        self.render_into(out, context)
+        return ''.join(out)
+
+
+@functools.lru_cache(maxsize=None)
+def compile_template(source):
+    """
+    编译模板（相同的源文本只编译一次）
+    """
+    return Template(source)
+
+
+@functools.lru_cache(maxsize=None)
+def css_block(css):
+    """
+    生成 <style> 块（相同的 CSS 只拼接一次）
+    """
+    return f"<style>{css}</style>"
+
+
+class HtmlWriter:
+    """
+    片段列表写入器：渲染过程只追加片段，最后一次 join 或直接写入文件
+    """
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, text):
+        self.parts.append(text)
+
+    def extend(self, fragments):
+        self.parts.extend(fragments)
+
+    def render(self, template, context):
+        template.render_into(self.parts, context)
+
+    def getvalue(self):
+        return ''.join(self.parts)
+
+    def write_to(self, file_path):
+        """
+        逐段写入文件，不在内存中拼出整页
+        """
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.writelines(self.parts)
+        return file_path
+
+
+class Section:
+    """
+    页面中的一个新闻分区
+    """
+
+    def __init__(self, summaries, context=None, extra=()):
+        """
+        Args:
+            summaries (list): 分区内每条新闻的 summary 字典
+            context (dict): 分区模板用到的字段，如 {"heading": "国内要闻"}
+            extra (tuple): 传给条目上下文函数的其他参数
+        """
+        self.summaries = summaries
+        self.context = context or {}
+        self.extra = tuple(extra)
+
+
+class Theme:
+    """
+    生成器主题：一组预编译模板加上把新闻摘要转换为条目字段的函数
+    页面结构为 页头 + (分区头 + 条目... + 分区尾)... + 页尾
+    """
+
+    def __init__(self, name, head, tail, item, item_context, section_head='', section_tail='',
+                 css='', skip_empty_sections=False):
+        """
+        Args:
+            name (str): 主题名称
+            head (str): 页头模板，可使用 {style} 引用 CSS 块
+            tail (str): 页尾模板
+            item (str): 条目模板
+            item_context (callable): item_context(summary, index, *extra) 返回条目模板的字段
+            section_head (str): 分区头模板
+            section_tail (str): 分区尾模板
+            css (str): 样式表内容
+            skip_empty_sections (bool): 跳过没有新闻的分区
+        """
+        self.name = name
+        # 模板源文本和 CSS 的哈希，模板或样式修改后缓存的片段和归档页面随之失效
+        self.version = hashlib.sha1('\0'.join(
+            (name, head, tail, item, section_head, section_tail, css)).encode('utf-8')).hexdigest()[:16]
+        self.head = compile_template(head)
+        self.tail = compile_template(tail)
+        self.item = compile_template(item)
+        self.item_context = item_context
+        self.section_head = compile_template(section_head)
+        self.section_tail = compile_template(section_tail)
+        self.style = css_block(css) if css else ''
+        self.skip_empty_sections = skip_empty_sections
+
+    def render_item(self, summary, index, extra=()):
+        """
+        渲染单条新闻为 HTML 片段
+        """
+        return self.item.render(**self.item_context(summary, index, *extra))
+
+    def render_into(self, writer, context, sections, item_fragment=None):
+        """
+        将整页渲染到写入器
+
+        Args:
+            writer (HtmlWriter): 写入器
+            context (dict): 页头和页尾模板的字段
+            sections (list): Section 列表
+            item_fragment (callable): 可选，item_fragment(section_no, summary, index, extra) 返回条目片段
+                （预览渲染器用它复用缓存的片段），默认直接渲染条目模板
+        """
+        page_context = dict(context, style=self.style)
+        writer.render(self.head, page_context)
+        for section_no, section in enumerate(sections):
+            if self.skip_empty_sections and not section.summaries:
+                continue
+            writer.render(self.section_head, section.context)
+            for index, summary in enumerate(section.summaries, 1):
+                if item_fragment is None:
+                    writer.render(self.item, self.item_context(summary, index, *section.extra))
+                else:
+                    writer.write(item_fragment(section_no, summary, index, section.extra))
+            writer.render(self.section_tail, section.context)
+        writer.render(self.tail, page_context)
+        return writer
+
+    def render(self, context, sections):
+        """
+        渲染整页为字符串
+        """
+        return self.render_into(HtmlWriter(), context, sections).getvalue()
+
+    def write(self, file_path, context, sections):
+        """
+        渲染整页并逐段写入文件
+
+        Returns:
+            str: 文件路径
+        """
+        return self.render_into(HtmlWriter(), context, sections).write_to(file_path)
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+微信公众号接口客户端
+access_token 连同过期时间保存在本地文件中，多次运行脚本共用，过期前提前刷新；
+接口返回 access_token 无效（40001/40014/42001）时刷新令牌并重试一次。
+所有请求共用一个保持连接的 requests.Session，并设置超时
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+
+WECHAT_API_BASE = "https://api.weixin.qq.com/cgi-bin"
+
+# 连接超时和读取超时（秒）
+DEFAULT_TIMEOUT = (5, 30)
+
+# access_token 缓存文件
+DEFAULT_TOKEN_CACHE = os.path.join("datas", "wechat_token_cache.json")
+
+# 距离过期不足该秒数时提前刷新
+TOKEN_REFRESH_MARGIN = 300
+
+# access_token 无效或过期的错误码
+INVALID_TOKEN_ERRCODES = (40001, 40014, 42001)
+
+# 一个草稿最多包含的文章数
+MAX_DRAFT_ARTICLES = 8
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    获取进程内共享的会话（保持连接，复用 TLS）
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+        return _session
+
+
+class WeChatAPIError(Exception):
+    """
+    微信接口返回错误码
+    """
+
+    def __init__(self, message: str, data: Dict[str, Any]):
+        super().__init__(f"{message}: {data}")
+        self.data = data
+        self.errcode = data.get("errcode")
+        self.status = data.get("status")
+
+
+def parse_response(response: requests.Response) -> Dict[str, Any]:
+    """
+    解析接口返回的 JSON
+
+    Raises:
+        WeChatAPIError: HTTP 状态码不是 2xx，或返回内容不是 JSON（如网关的 HTML 错误页）
+    """
+    status = response.status_code
+    if not 200 <= status < 300:
+        raise WeChatAPIError(f"HTTP {status}", {"status": status, "body": response.text[:200]})
+    try:
+        data = response.json()
+    except ValueError:
+        raise WeChatAPIError(f"HTTP {status} 返回内容不是JSON",
+                             {"status": status, "body": response.text[:200]}) from None
+    if not isinstance(data, dict):
+        raise WeChatAPIError(f"HTTP {status} 返回内容不是JSON对象", {"status": status, "body": data})
+    return data
+
+
+class AccessTokenProvider:
+    """
+    access_token 提供者：优先使用文件中未过期的令牌，过期前提前刷新
+    缓存文件按 AppID 保存，多个公众号可共用一个文件
+    """
+
+    def __init__(self, app_id: str, app_secret: str, cache_path: Optional[str] = DEFAULT_TOKEN_CACHE,
+                 session: Optional[requests.Session] = None, timeout=DEFAULT_TIMEOUT,
+                 refresh_margin: int = TOKEN_REFRESH_MARGIN, base_url: str = WECHAT_API_BASE):
+        """
+        Args:
+            app_id (str): 微信公众号AppID
+            app_secret (str): 微信公众号AppSecret
+            cache_path (str): 缓存文件路径，为 None 时只缓存在内存中
+            session (requests.Session): 可选，默认使用共享会话
+            timeout: requests 的超时设置
+            refresh_margin (int): 提前刷新的秒数
+            base_url (str): 接口地址
+        """
+        self.app_id = app_id
+        self.app_secret = app_secret
+        self.cache_path = cache_path
+        self.session = session or get_session()
+        self.timeout = timeout
+        self.refresh_margin = refresh_margin
+        self.base_url = base_url
+        self._lock = threading.Lock()
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+
+    def _valid(self) -> bool:
+        return self._token is not None and time.time() < self._expires_at - self.refresh_margin
+
+    def _read_cache(self):
+        if not self.cache_path:
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f).get(self.app_id)
+        except (OSError, ValueError):
+            return
+        if entry and entry.get("access_token"):
+            self._token = entry["access_token"]
+            self._expires_at = entry.get("expires_at", 0.0)
+
+    def _write_cache(self):
+        if not self.cache_path:
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+        cache[self.app_id] = {"access_token": self._token, "expires_at": self._expires_at}
+
+        cache_dir = os.path.dirname(self.cache_path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        # 令牌属于敏感信息，只允许当前用户读写
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, self.cache_path)
+
+    def _fetch(self):
+        """
+        向微信服务器请求新令牌
+
+        Raises:
+            WeChatAPIError: 获取失败
+        """
+        params = {
+            "grant_type": "client_credential",
+            "appid": self.app_id,
+            "secret": self.app_secret
+        }
+        response = self.session.get(f"{self.base_url}/token", params=params, timeout=self.timeout)
+        data = parse_response(response)
+        if "access_token" not in data:
+            raise WeChatAPIError("获取access_token失败", data)
+        self._token = data["access_token"]
+        self._expires_at = time.time() + data.get("expires_in", 7200)
+        self._write_cache()
+
+    def get_token(self, force_refresh: bool = False) -> str:
+        """
+        获取有效的 access_token
+
+        Args:
+            force_refresh (bool): 忽略缓存，重新获取
+
+        Returns:
+            str: access_token
+        """
+        with self._lock:
+            if not force_refresh:
+                if not self._valid():
+                    # 其他进程可能已经刷新过
+                    self._read_cache()
+                if self._valid():
+                    return self._token
+            self._fetch()
+            return self._token
+
+    def invalidate(self, token: str):
+        """
+        标记令牌已失效（接口返回 40001 等错误时调用），其他线程已刷新时不重复刷新
+        """
+        with self._lock:
+            if self._token == token:
+                self._token = None
+                self._expires_at = 0.0
+
+
+class WeChatAPIClient:
+    """
+    带 access_token 的微信接口调用
+    """
+
+    def __init__(self, token_provider: AccessTokenProvider, session: Optional[requests.Session] = None,
+                 timeout=DEFAULT_TIMEOUT, base_url: str = WECHAT_API_BASE):
+        self.token_provider = token_provider
+        self.session = session or token_provider.session
+        self.timeout = timeout
+        self.base_url = base_url
+
+    def request(self, method: str, path: str, params: Optional[Dict[str, Any]] = None,
+                json_data: Optional[Dict[str, Any]] = None, file_path: Optional[str] = None,
+                file_field: str = "media") -> Dict[str, Any]:
+        """
+        调用接口，access_token 无效时刷新并重试一次
+
+        Args:
+            method (str): GET 或 POST
+            path (str): 接口路径，如 "/draft/add"
+            params (dict): 查询参数（不含 access_token）
+            json_data (dict): JSON 请求体，中文不转义
+            file_path (str): 上传的文件路径
+            file_field (str): 上传文件的表单字段名
+
+        Returns:
+            dict: 接口返回的 JSON
+
+        Raises:
+            WeChatAPIError: HTTP 错误或返回内容不是 JSON
+        """
+        for attempt in range(2):
+            token = self.token_provider.get_token()
+            query = dict(params or {}, access_token=token)
+            kwargs = {"params": query, "timeout": self.timeout}
+            if json_data is not None:
+                kwargs["data"] = json.dumps(json_data, ensure_ascii=False).encode('utf-8')
+                kwargs["headers"] = {"Content-Type": "application/json"}
+
+            if file_path is not None:
+                # 重试时需要重新打开文件
+                with open(file_path, "rb") as f:
+                    response = self.session.request(method, self.base_url + path,
+                                                    files={file_field: f}, **kwargs)
+            else:
+                response = self.session.request(method, self.base_url + path, **kwargs)
+
+            data = parse_response(response)
+            if attempt == 0 and data.get("errcode") in INVALID_TOKEN_ERRCODES:
+                self.token_provider.invalidate(token)
+                continue
+            return data
+        return data
+
+    def get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return self.request("GET", path, params=params)
+
+    def post_json(self, path: str, payload: Dict[str, Any], params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return self.request("POST", path, params=params, json_data=payload)
+
+    def upload(self, path: str, file_path: str, params: Optional[Dict[str, Any]] = None,
+               file_field: str = "media") -> Dict[str, Any]:
+        return self.request("POST", path, params=params, file_path=file_path, file_field=file_field)
@@ -9,12 +9,128 @@
 import os
 import sys
 import json
-import requests
 from datetime import datetime
 
 # 添加项目根目录到Python路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+from modules.publisher.template_engine import Section, Theme
+from modules.utils.llm_backend import is_llm_available
+from modules.utils.ollama_client import OllamaStreamClient
+
+# 文章正文最多生成的 token 数，防止生成失控
+ARTICLE_MAX_TOKENS = 3072
+
+# 流式调用 Ollama，并记录首 token 延迟和生成速度
+llm_client = OllamaStreamClient()
+
+# 默认文章（不使用大模型）的样式表
+CSS = """
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, "Noto Sans", sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 800px;
+            margin: 0 auto;
+            padding: 20px;
+            background-color: #f8f9fa;
+        }
+        .article-container {
+            background-color: white;
+            border-radius: 10px;
+            padding: 30px;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+        }
+        h1 {
+            color: #2c3e50;
+            text-align: center;
+            border-bottom: 2px solid #3498db;
+            padding-bottom: 15px;
+            font-size: 24px;
+        }
+        .summary {
+            background-color: #e3f2fd;
+            border-left: 4px solid #3498db;
+            padding: 15px;
+            margin: 20px 0;
+            border-radius: 0 5px 5px 0;
+        }
+        h2 {
+            color: #2980b9;
+            margin-top: 30px;
+            padding-bottom: 5px;
+            border-bottom: 1px dashed #bdc3c7;
+        }
+        h3 {
+            color: #34495e;
+            margin-top: 20px;
+        }
+        p {
+            margin: 10px 0;
+            text-align: justify;
+        }
+        .keywords {
+            background-color: #f1f8e9;
+            padding: 8px 12px;
+            border-radius: 4px;
+            font-size: 14px;
+        }
+        hr {
+            border: none;
+            height: 1px;
+            background-color: #ecf0f1;
+            margin: 30px 0;
+        }
+        .editor-note {
+            background-color: #fff8e1;
+            border-left: 4px solid #f39c12;
+            padding: 15px;
+            border-radius: 0 5px 5px 0;
+        }
+        .date {
+            text-align: center;
+            color: #7f8c8d;
+            font-size: 14px;
+            margin-bottom: 20px;
+        }
+    """
+
+PAGE_HEAD = """
+<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>新闻联播深度解读 | {formatted_date}</title>
+    {style}
+</head>
+<body>
+    <div class="article-container">
+        <h1>新闻联播深度解读 | {formatted_date}</h1>
+        <div class="date">{formatted_date}</div>
+        
+        <div class="summary">
+            <p><strong>今日重点关注：</strong>{formatted_date}新闻联播主要内容梳理与深度解读</p>
+        </div>
+"""
+
+SECTION_HEAD = "        <h2>【{heading}】</h2>\n"
+
+NEWS_ITEM = """        <h3>{index}. {title}</h3>
+        <p>{summary}</p>
+{keywords}
+"""
+
+PAGE_TAIL = """
+        <hr>
+        <div class="editor-note">
+            <p><strong>编辑点评：</strong>以上是今日新闻联播的主要内容梳理。随着国家发展进入新阶段，各项政策举措持续发力，经济社会发展呈现良好态势。我们将持续关注相关政策动向，为您带来更深入的解读。</p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
 def load_full_result(file_path):
     """
     加载full_result_*.json文件
@@ -38,11 +154,7 @@ def check_ollama_connection():
     Returns:
         bool: 是否可用
     """
-    try:
-        response = requests.get("http://localhost:11434/api/tags", timeout=5)
-        return response.status_code == 200
-    except:
-        return False
+    return is_llm_available()
 
 def generate_wechat_article_with_llm(news_data):
     """
@@ -103,27 +215,41 @@ def generate_wechat_article_with_llm(news_data):
 请直接输出完整的文章内容，不需要额外说明。
 """
     
-    # 调用Ollama API
-    payload = {
-        "model": "qwen2:7b",
-        "prompt": prompt,
-        "stream": False
-    }
-    
     try:
-        response = requests.post("http://localhost:11434/api/generate", json=payload, timeout=120)
-        result = response.json()
-        return result['response']
+        # 调用Ollama API
+        content, metrics = llm_client.generate("qwen2:7b", prompt, max_tokens=ARTICLE_MAX_TOKENS)
+        print(f"文章生成完成: 首 token {metrics.ttft:.2f} 秒, {metrics.tokens} tokens, "
+              f"{metrics.tokens_per_second:.1f} tokens/秒")
+        return content
     except Exception as e:
         print(f"调用大模型失败: {e}")
         return generate_wechat_article_default(news_data)
 
-def generate_wechat_article_default(news_data):
+def _news_item_context(summary, index, default_title):
+    """
+    单条新闻的模板字段
+    """
+    keywords = summary.get('keywords', [])
+    keywords_html = ''
+    if keywords:
+        keywords_html = f"        <div class=\"keywords\"><strong>关键词：</strong>{'、'.join(keywords)}</div>\n"
+    return {
+        "index": index,
+        "title": summary.get('title', f'{default_title}{index}'),
+        "summary": summary.get('summary', ''),
+        "keywords": keywords_html,
+    }
+
+THEME = Theme('wechat_article', PAGE_HEAD, PAGE_TAIL, NEWS_ITEM, _news_item_context,
+              section_head=SECTION_HEAD, css=CSS, skip_empty_sections=True)
+
+def generate_wechat_article_default(news_data, renderer=None):
     """
     默认方法生成微信公众号文章（不使用大模型）
     
     Args:
         news_data (dict): 新闻数据
+        renderer (PreviewRenderer): 可选，编辑预览时传入长期存在的预览渲染器，未改动的条目复用缓存的片段
         
     Returns:
         str: 生成的文章内容
@@ -131,137 +257,13 @@ def generate_wechat_article_default(news_data):
     date_str = news_data.get('date', datetime.now().strftime('%Y%m%d'))
     formatted_date = f"{date_str[:4]}年{date_str[4:6]}月{date_str[6:]}日"
     
-    # 构建带样式的HTML文章
-    article = f"""
-<!DOCTYPE html>
-<html lang="zh-CN">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>新闻联播深度解读 | {formatted_date}</title>
-    <style>
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, "Noto Sans", sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 800px;
-            margin: 0 auto;
-            padding: 20px;
-            background-color: #f8f9fa;
-        }}
-        .article-container {{
-            background-color: white;
-            border-radius: 10px;
-            padding: 30px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        h1 {{
-            color: #2c3e50;
-            text-align: center;
-            border-bottom: 2px solid #3498db;
-            padding-bottom: 15px;
-            font-size: 24px;
-        }}
-        .summary {{
-            background-color: #e3f2fd;
-            border-left: 4px solid #3498db;
-            padding: 15px;
-            margin: 20px 0;
-            border-radius: 0 5px 5px 0;
-        }}
-        h2 {{
-            color: #2980b9;
-            margin-top: 30px;
-            padding-bottom: 5px;
-            border-bottom: 1px dashed #bdc3c7;
-        }}
-        h3 {{
-            color: #34495e;
-            margin-top: 20px;
-        }}
-        p {{
-            margin: 10px 0;
-            text-align: justify;
-        }}
-        .keywords {{
-            background-color: #f1f8e9;
-            padding: 8px 12px;
-            border-radius: 4px;
-            font-size: 14px;
-        }}
-        hr {{
-            border: none;
-            height: 1px;
-            background-color: #ecf0f1;
-            margin: 30px 0;
-        }}
-        .editor-note {{
-            background-color: #fff8e1;
-            border-left: 4px solid #f39c12;
-            padding: 15px;
-            border-radius: 0 5px 5px 0;
-        }}
-        .date {{
-            text-align: center;
-            color: #7f8c8d;
-            font-size: 14px;
-            margin-bottom: 20px;
-        }}
-    </style>
-</head>
-<body>
-    <div class="article-container">
-        <h1>新闻联播深度解读 | {formatted_date}</h1>
-        <div class="date">{formatted_date}</div>
-        
-        <div class="summary">
-            <p><strong>今日重点关注：</strong>{formatted_date}新闻联播主要内容梳理与深度解读</p>
-        </div>
-"""
-    
-    # 添加国内新闻
     domestic_news = news_data.get('domestic', [])
-    if domestic_news:
-        article += "        <h2>【国内要闻】</h2>\n"
-        for i, item in enumerate(domestic_news, 1):
-            summary = item.get('summary', {})
-            title = summary.get('title', f'国内新闻{i}')
-            summary_text = summary.get('summary', '')
-            keywords = summary.get('keywords', [])
-            
-            article += f"        <h3>{i}. {title}</h3>\n"
-            article += f"        <p>{summary_text}</p>\n"
-            if keywords:
-                article += f"        <div class=\"keywords\"><strong>关键词：</strong>{'、'.join(keywords)}</div>\n"
-            article += "\n"
-    
-    # 添加国际新闻
     international_news = news_data.get('international', [])
-    if international_news:
-        article += "        <h2>【国际动态】</h2>\n"
-        for i, item in enumerate(international_news, 1):
-            summary = item.get('summary', {})
-            title = summary.get('title', f'国际新闻{i}')
-            summary_text = summary.get('summary', '')
-            keywords = summary.get('keywords', [])
-            
-            article += f"        <h3>{i}. {title}</h3>\n"
-            article += f"        <p>{summary_text}</p>\n"
-            if keywords:
-                article += f"        <div class=\"keywords\"><strong>关键词：</strong>{'、'.join(keywords)}</div>\n"
-            article += "\n"
-    
-    article += """
-        <hr>
-        <div class="editor-note">
-            <p><strong>编辑点评：</strong>以上是今日新闻联播的主要内容梳理。随着国家发展进入新阶段，各项政策举措持续发力，经济社会发展呈现良好态势。我们将持续关注相关政策动向，为您带来更深入的解读。</p>
-        </div>
-    </div>
-</body>
-</html>
-"""
-    
-    return article
+    sections = [
+        Section([item.get('summary', {}) for item in domestic_news], {"heading": "国内要闻"}, extra=('国内新闻',)),
+        Section([item.get('summary', {}) for item in international_news], {"heading": "国际动态"}, extra=('国际新闻',)),
+    ]
+    return (renderer or THEME).render({"formatted_date": formatted_date}, sections)
 
 def format_article_title(news_data):
     """
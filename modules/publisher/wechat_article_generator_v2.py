@@ -10,12 +10,24 @@
 import os
 import sys
 import json
-import requests
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # 添加项目根目录到Python路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+from modules.publisher.template_engine import Section, Theme
+from modules.utils.llm_backend import is_llm_available
+from modules.utils.ollama_client import OllamaStreamClient
+
+# 文章正文、标题最多生成的 token 数，防止生成失控
+ARTICLE_MAX_TOKENS = 3072
+TITLE_MAX_TOKENS = 64
+
+# 流式调用 Ollama，并记录首 token 延迟和生成速度
+llm_client = OllamaStreamClient()
+
 def load_full_result(file_path):
     """
     加载full_result_*.json文件
@@ -39,11 +51,7 @@ def check_ollama_connection():
     Returns:
         bool: 是否可用
     """
-    try:
-        response = requests.get("http://localhost:11434/api/tags", timeout=5)
-        return response.status_code == 200
-    except:
-        return False
+    return is_llm_available()
 
 def generate_wechat_article_with_llm(news_data):
     """
@@ -126,47 +134,125 @@ def generate_wechat_article_with_llm(news_data):
 请直接输出完整的文章内容，不需要额外说明。
 """
     
-    # 调用Ollama API
-    payload = {
-        "model": "qwen2:7b",
-        "prompt": prompt,
-        "stream": False
-    }
-    
+    # 标题根据结构化摘要生成，不依赖正文，两次调用同时进行
+    executor = ThreadPoolExecutor(max_workers=2)
+    cancel_title = threading.Event()
+    title_future = executor.submit(generate_title_with_llm, news_data, cancel_title)
+    body_future = executor.submit(llm_client.generate, "qwen2:7b", prompt, max_tokens=ARTICLE_MAX_TOKENS)
+
     try:
-        response = requests.post("http://localhost:11434/api/generate", json=payload, timeout=120)
-        result = response.json()
-        content = result['response']
+        # 调用Ollama API
+        content, metrics = body_future.result()
+        print(f"文章生成完成: 首 token {metrics.ttft:.2f} 秒, {metrics.tokens} tokens, "
+              f"{metrics.tokens_per_second:.1f} tokens/秒")
+    except Exception as e:
+        print(f"调用大模型失败: {e}")
+        # 回退到默认文章，不再等待标题生成
+        cancel_title.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+        return generate_wechat_article_default(news_data)
+
+    title = title_future.result() or format_article_title(news_data)
+    executor.shutdown()
+    
+    return title, content
+
+def generate_title_with_llm(news_data, cancel=None):
+    """
+    根据各条新闻的摘要生成文章标题
+    
+    Args:
+        news_data (dict): 新闻数据
+        cancel (threading.Event): 可选，设置后放弃生成
         
-        # 生成标题
-        title_prompt = f"""根据以下文章内容，为这篇文章生成一个吸引人的标题：
+    Returns:
+        str: 文章标题，生成失败时返回 None
+    """
+    points = []
+    for item in news_data.get('domestic', []) + news_data.get('international', []):
+        summary = item.get('summary', {})
+        if summary.get('title'):
+            points.append(f"- {summary['title']}：{summary.get('summary', '')}")
+    if not points:
+        return None
+    
+    title_prompt = f"""根据以下今日新闻联播要点，为一篇微信公众号解读文章生成一个吸引人的标题：
 
-{content[:1000]}
+{chr(10).join(points[:15])}
 
 只需要输出标题，不要其他内容。
 """
-        
-        title_payload = {
-            "model": "qwen2:7b",
-            "prompt": title_prompt,
-            "stream": False
-        }
-        
-        title_response = requests.post("http://localhost:11434/api/generate", json=title_payload, timeout=120)
-        title_result = title_response.json()
-        title = title_result['response'].strip().strip('"').strip('《').strip('》')
-        
-        return title, content
+    
+    try:
+        title_text, metrics = llm_client.generate("qwen2:7b", title_prompt, max_tokens=TITLE_MAX_TOKENS,
+                                                  cancel=cancel)
     except Exception as e:
-        print(f"调用大模型失败: {e}")
-        return generate_wechat_article_default(news_data)
+        print(f"生成标题失败: {e}")
+        return None
+    if metrics.stop_reason == "cancelled":
+        return None
+    
+    # 只取第一行，去掉引号和书名号
+    lines = [line for line in title_text.strip().splitlines() if line.strip()]
+    title = lines[0].strip().strip('"').strip('《').strip('》') if lines else ""
+    return title or None
+
+# 默认文章（不使用大模型）的模板
+PAGE_HEAD = """<h1>新闻联播每日精读 | {formatted_date}</h1>
+<p><strong>今日重点关注：</strong>{formatted_date}新闻联播主要内容梳理与深度解读</p>
+<hr>
+
+<h2>【开篇引言】</h2>
+<p>今日新闻联播内容丰富，重点关注了国内重要活动和国际交流合作。以下为您详细梳理。</p>
+
+"""
+
+SECTION_HEAD = "<h2>【{heading}】</h2>\n"
+
+NEWS_ITEM = """<h3>{index}. {title}</h3>
+<p><strong>新闻摘要：</strong>{summary}</p>
+<p><strong>{analysis_label}：</strong>{analysis}</p>
+
+"""
 
-def generate_wechat_article_default(news_data):
+PAGE_TAIL = """<h2>【今日总结】</h2>
+{keywords}<p>明日我们可能会继续关注相关政策的深入实施和国际合作的进一步发展。</p>
+<hr>
+<p><strong>互动话题：</strong>你对哪条新闻最感兴趣？评论区聊聊吧！</p>
+"""
+
+
+def _news_item_context(summary, index, section):
+    """
+    单条新闻的模板字段，国内新闻附小编解读，国际新闻附影响分析
+    """
+    keywords = summary.get('keywords', [])
+    if section == 'domestic':
+        default_title = '国内新闻'
+        analysis_label = '小编解读'
+        analysis = f"该新闻反映了{'、'.join(keywords) if keywords else '相关政策'}的重要进展，对{'相关领域' if not keywords else '、'.join(keywords)}具有积极意义。"
+    else:
+        default_title = '国际新闻'
+        analysis_label = '影响分析'
+        analysis = f"该国际合作{'、'.join(keywords) if keywords else '相关领域'}的发展具有重要推动作用，有助于{'相关领域' if not keywords else '、'.join(keywords)}的进一步深化。"
+    return {
+        "index": index,
+        "title": summary.get('title', f'{default_title}{index}'),
+        "summary": summary.get('summary', ''),
+        "analysis_label": analysis_label,
+        "analysis": analysis,
+    }
+
+THEME = Theme('wechat_article_v2', PAGE_HEAD, PAGE_TAIL, NEWS_ITEM, _news_item_context,
+              section_head=SECTION_HEAD, skip_empty_sections=True)
+
+def generate_wechat_article_default(news_data, renderer=None):
     """
     默认方法生成微信公众号文章（不使用大模型）
     
     Args:
         news_data (dict): 新闻数据
+        renderer (PreviewRenderer): 可选，编辑预览时传入长期存在的预览渲染器，未改动的条目复用缓存的片段
         
     Returns:
         tuple: (title, content) 文章标题和内容
@@ -177,47 +263,14 @@ def generate_wechat_article_default(news_data):
     # 文章标题
     title = f"【新闻联播每日精读】{formatted_date}：聚焦国内国际要闻"
     
-    # 构建文章
-    article = f"<h1>新闻联播每日精读 | {formatted_date}</h1>\n"
-    article += f"<p><strong>今日重点关注：</strong>{formatted_date}新闻联播主要内容梳理与深度解读</p>\n"
-    article += "<hr>\n\n"
-    
-    # 开篇引言
-    article += "<h2>【开篇引言】</h2>\n"
-    article += "<p>今日新闻联播内容丰富，重点关注了国内重要活动和国际交流合作。以下为您详细梳理。</p>\n\n"
-    
-    # 添加国内新闻
     domestic_news = news_data.get('domestic', [])
-    if domestic_news:
-        article += "<h2>【国内要闻】</h2>\n"
-        for i, item in enumerate(domestic_news, 1):
-            summary = item.get('summary', {})
-            title = summary.get('title', f'国内新闻{i}')
-            summary_text = summary.get('summary', '')
-            keywords = summary.get('keywords', [])
-            
-            article += f"<h3>{i}. {title}</h3>\n"
-            article += f"<p><strong>新闻摘要：</strong>{summary_text}</p>\n"
-            article += f"<p><strong>小编解读：</strong>该新闻反映了{'、'.join(keywords) if keywords else '相关政策'}的重要进展，对{'相关领域' if not keywords else '、'.join(keywords)}具有积极意义。</p>\n"
-            article += "\n"
-    
-    # 添加国际新闻
     international_news = news_data.get('international', [])
-    if international_news:
-        article += "<h2>【国际动态】</h2>\n"
-        for i, item in enumerate(international_news, 1):
-            summary = item.get('summary', {})
-            title = summary.get('title', f'国际新闻{i}')
-            summary_text = summary.get('summary', '')
-            keywords = summary.get('keywords', [])
-            
-            article += f"<h3>{i}. {title}</h3>\n"
-            article += f"<p><strong>新闻摘要：</strong>{summary_text}</p>\n"
-            article += f"<p><strong>影响分析：</strong>该国际合作{'、'.join(keywords) if keywords else '相关领域'}的发展具有重要推动作用，有助于{'相关领域' if not keywords else '、'.join(keywords)}的进一步深化。</p>\n"
-            article += "\n"
+    sections = [
+        Section([item.get('summary', {}) for item in domestic_news], {"heading": "国内要闻"}, extra=('domestic',)),
+        Section([item.get('summary', {}) for item in international_news], {"heading": "国际动态"}, extra=('international',)),
+    ]
     
     # 今日总结
-    article += "<h2>【今日总结】</h2>\n"
     all_keywords = []
     for item in domestic_news + international_news:
         summary = item.get('summary', {})
@@ -225,16 +278,42 @@ def generate_wechat_article_default(news_data):
         all_keywords.extend(keywords)
     
     unique_keywords = list(set(all_keywords))[:5]  # 最多5个关键词
-    if unique_keywords:
-        article += f"<p>今日关键词：{'、'.join(unique_keywords)}</p>\n"
-    article += "<p>明日我们可能会继续关注相关政策的深入实施和国际合作的进一步发展。</p>\n"
+    keywords_html = f"<p>今日关键词：{'、'.join(unique_keywords)}</p>\n" if unique_keywords else ''
     
-    # 互动话题
-    article += "<hr>\n"
-    article += "<p><strong>互动话题：</strong>你对哪条新闻最感兴趣？评论区聊聊吧！</p>\n"
+    article = (renderer or THEME).render({"formatted_date": formatted_date, "keywords": keywords_html}, sections)
     
     return title, article
 
+def generate_digest_articles(news_data, renderer=None):
+    """
+    将国内要闻和国际动态分别生成一篇文章，用于多图文草稿（一次创建、共用封面）
+
+    Args:
+        news_data (dict): 新闻数据
+        renderer (PreviewRenderer): 可选，编辑预览时传入长期存在的预览渲染器，未改动的条目复用缓存的片段
+
+    Returns:
+        list: [(title, content), ...]，没有新闻的板块不生成文章
+    """
+    date_str = news_data.get('date', datetime.now().strftime('%Y%m%d'))
+    formatted_date = f"{date_str[:4]}年{date_str[4:6]}月{date_str[6:]}日"
+
+    articles = []
+    for key, heading in (('domestic', '国内要闻'), ('international', '国际动态')):
+        summaries = [item.get('summary', {}) for item in news_data.get(key, [])]
+        if not summaries:
+            continue
+
+        keywords = list(dict.fromkeys(kw for summary in summaries for kw in summary.get('keywords', [])))[:5]
+        keywords_html = f"<p>今日关键词：{'、'.join(keywords)}</p>\n" if keywords else ''
+
+        title = f"【新闻联播每日精读】{formatted_date}：{heading}"
+        content = (renderer or THEME).render({"formatted_date": formatted_date, "keywords": keywords_html},
+                                             [Section(summaries, {"heading": heading}, extra=(key,))])
+        articles.append((title, content))
+
+    return articles
+
 def format_article_title(news_data):
     """
     格式化文章标题
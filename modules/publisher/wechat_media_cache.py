@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+永久素材 media_id 缓存
+按图片内容哈希记录上传后得到的 media_id，同一张封面不再重复上传；
+缓存的 media_id 不预先校验，创建草稿时微信返回 media_id 无效再删除记录并重新上传
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+# 缓存文件
+DEFAULT_MEDIA_CACHE = os.path.join("datas", "wechat_media_cache.json")
+
+# media_id 无效（素材已被删除等）的错误码
+INVALID_MEDIA_ERRCODES = (40007,)
+
+
+def file_sha1(file_path: str) -> str:
+    """
+    计算文件内容的 SHA1
+    """
+    digest = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class MediaCache:
+    """
+    内容哈希 -> media_id 的持久映射，按 AppID 分开保存（素材属于公众号）
+    """
+
+    def __init__(self, cache_path: Optional[str] = DEFAULT_MEDIA_CACHE):
+        """
+        Args:
+            cache_path (str): 缓存文件路径，为 None 时只缓存在内存中
+        """
+        self.cache_path = cache_path
+        self._lock = threading.Lock()
+        self._entries = None
+
+    def _load(self):
+        if self._entries is not None:
+            return
+        self._entries = {}
+        if not self.cache_path:
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    def _save(self):
+        if not self.cache_path:
+            return
+        cache_dir = os.path.dirname(self.cache_path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.cache_path)
+
+    def get(self, app_id: str, content_hash: str) -> Optional[str]:
+        """
+        查找已上传的 media_id，没有时返回 None
+        """
+        with self._lock:
+            self._load()
+            entry = self._entries.get(app_id, {}).get(content_hash)
+            return entry["media_id"] if entry else None
+
+    def put(self, app_id: str, content_hash: str, media_id: str, source: str = ""):
+        """
+        记录上传结果
+        """
+        with self._lock:
+            self._load()
+            self._entries.setdefault(app_id, {})[content_hash] = {
+                "media_id": media_id,
+                "source": source,
+                "uploaded_at": int(time.time()),
+            }
+            self._save()
+
+    def discard(self, app_id: str, content_hash: str):
+        """
+        删除失效的记录
+        """
+        with self._lock:
+            self._load()
+            if self._entries.get(app_id, {}).pop(content_hash, None) is not None:
+                self._save()
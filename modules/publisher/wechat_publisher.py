@@ -1,11 +1,18 @@
-import requests
-import json
 import os
-from typing import Optional, Dict, Any
+import sys
+from typing import Optional, Dict, Any, List, Tuple
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from modules.publisher.wechat_api import (DEFAULT_TIMEOUT, DEFAULT_TOKEN_CACHE, MAX_DRAFT_ARTICLES, WECHAT_API_BASE,
+                                          AccessTokenProvider, WeChatAPIClient, WeChatAPIError)
+from modules.publisher.wechat_media_cache import INVALID_MEDIA_ERRCODES, MediaCache, file_sha1
+from modules.publisher.image_prep import prepare_cover
 
 class WeChatPublisher:
     """
-    微信公众号文章发布器
+    微信公众号文章发布器（WeChatPublicationManager 和 AsyncWeChatPublisher 共用这里的上传、草稿和发布逻辑）
     实现以下功能：
     1. 获取access_token
     2. 上传图片素材
@@ -13,22 +20,38 @@ class WeChatPublisher:
     4. 发布文章
     """
     
-    def __init__(self, app_id: str, app_secret: str):
+    def __init__(self, app_id: str, app_secret: str, token_cache: Optional[str] = DEFAULT_TOKEN_CACHE,
+                 session=None, timeout=DEFAULT_TIMEOUT, base_url: str = WECHAT_API_BASE,
+                 media_cache: Optional[MediaCache] = None, prepare_images: bool = True):
         """
         初始化微信公众号发布器
         
         Args:
             app_id (str): 微信公众号AppID
             app_secret (str): 微信公众号AppSecret
+            token_cache (str): access_token 缓存文件，为 None 时不写文件
+            session (requests.Session): 可选，默认使用共享会话
+            timeout: requests 的超时设置
+            base_url (str): 接口地址
+            media_cache (MediaCache): 图片素材缓存，默认保存在 datas/wechat_media_cache.json
+            prepare_images (bool): 上传前将封面缩放压缩到微信推荐尺寸
         """
         self.app_id = app_id
         self.app_secret = app_secret
         self.access_token: Optional[str] = None
-        self.base_url = "https://api.weixin.qq.com/cgi-bin"
+        self.base_url = base_url
+        self.token_provider = AccessTokenProvider(app_id, app_secret, token_cache, session, timeout,
+                                                  base_url=self.base_url)
+        self.api = WeChatAPIClient(self.token_provider, timeout=timeout, base_url=self.base_url)
+        self.media_cache = media_cache or MediaCache()
+        self.prepare_images = prepare_images
     
-    def get_access_token(self) -> str:
+    def get_access_token(self, force_refresh: bool = False) -> str:
         """
-        获取微信公众号访问令牌
+        获取微信公众号访问令牌（优先使用本地缓存中未过期的令牌）
+        
+        Args:
+            force_refresh (bool): 忽略缓存，重新获取
         
         Returns:
             str: access_token
@@ -36,21 +59,8 @@ class WeChatPublisher:
         Raises:
             Exception: 获取失败时抛出异常
         """
-        url = f"{self.base_url}/token"
-        params = {
-            "grant_type": "client_credential",
-            "appid": self.app_id,
-            "secret": self.app_secret
-        }
-        
-        response = requests.get(url, params=params)
-        data = response.json()
-        
-        if "access_token" in data:
-            self.access_token = data["access_token"]
-            return self.access_token
-        else:
-            raise Exception(f"获取access_token失败: {data}")
+        self.access_token = self.token_provider.get_token(force_refresh)
+        return self.access_token
     
     def upload_image(self, image_path: str) -> str:
         """
@@ -65,27 +75,42 @@ class WeChatPublisher:
         Raises:
             Exception: 上传失败时抛出异常
         """
-        if not self.access_token:
-            self.get_access_token()
+        if not os.path.exists(image_path):
+            raise FileNotFoundError(f"图片文件不存在: {image_path}")
         
-        url = f"{self.base_url}/material/add_material"
-        params = {
-            "access_token": self.access_token,
-            "type": "image"
-        }
+        data = self.api.upload("/material/add_material", image_path, params={"type": "image"})
+        if "media_id" in data:
+            return data["media_id"]
+        else:
+            raise WeChatAPIError("上传图片失败", data)
+    
+    def upload_image_cached(self, image_path: str, force_upload: bool = False) -> str:
+        """
+        上传封面图片素材，内容相同的图片直接复用已上传的media_id；
+        需要上传时先缩放压缩（处理结果按原图哈希缓存）
         
+        Args:
+            image_path (str): 本地图片路径
+            force_upload (bool): 忽略缓存重新上传（缓存的素材已失效时使用）
+            
+        Returns:
+            str: 图片media_id
+        """
         if not os.path.exists(image_path):
             raise FileNotFoundError(f"图片文件不存在: {image_path}")
         
-        with open(image_path, "rb") as f:
-            files = {"media": f}
-            response = requests.post(url, params=params, files=files)
-            data = response.json()
-            
-            if "media_id" in data:
-                return data["media_id"]
-            else:
-                raise Exception(f"上传图片失败: {data}")
+        content_hash = file_sha1(image_path)
+        if not force_upload:
+            media_id = self.media_cache.get(self.app_id, content_hash)
+            if media_id:
+                return media_id
+        
+        upload_path = image_path
+        if self.prepare_images:
+            upload_path = prepare_cover(image_path, content_hash=content_hash)
+        media_id = self.upload_image(upload_path)
+        self.media_cache.put(self.app_id, content_hash, media_id, os.path.basename(image_path))
+        return media_id
     
     def create_draft(self, title: str, content: str, thumb_media_id: str) -> str:
         """
@@ -102,37 +127,71 @@ class WeChatPublisher:
         Raises:
             Exception: 创建失败时抛出异常
         """
-        if not self.access_token:
-            self.get_access_token()
-        
-        url = f"{self.base_url}/draft/add"
-        params = {
-            "access_token": self.access_token
+        return self.create_draft_batch([(title, content, thumb_media_id)])[0]
+    
+    @staticmethod
+    def _draft_article(title: str, content: str, thumb_media_id: str) -> Dict[str, Any]:
+        return {
+            "title": title,
+            "content": content,
+            "thumb_media_id": thumb_media_id,
+            "show_cover_pic": 1,
+            "need_open_comment": 1,
+            "only_fans_can_comment": 0
         }
+    
+    def create_draft_batch(self, articles: List[Tuple[str, str, str]]) -> List[str]:
+        """
+        批量创建草稿，每 8 篇文章合并为一个草稿（一次请求）
         
-        article_data = {
-            "articles": [{
-                "title": title,
-                "content": content,
-                "thumb_media_id": thumb_media_id,
-                "show_cover_pic": 1,
-                "need_open_comment": 1,
-                "only_fans_can_comment": 0
-            }]
-        }
+        Args:
+            articles (list): (标题, HTML内容, 封面media_id) 列表，多篇文章可共用同一个封面media_id
+            
+        Returns:
+            list: 草稿media_id 列表，每个草稿最多包含 8 篇文章
+            
+        Raises:
+            ValueError: 文章列表为空
+            Exception: 创建失败时抛出异常
+        """
+        if not articles:
+            raise ValueError("没有需要创建草稿的文章")
         
-        response = requests.post(
-            url, 
-            params=params,
-            data=json.dumps(article_data, ensure_ascii=False).encode('utf-8'),
-            headers={"Content-Type": "application/json"}
-        )
+        media_ids = []
+        for start in range(0, len(articles), MAX_DRAFT_ARTICLES):
+            article_data = {
+                "articles": [self._draft_article(*article) for article in articles[start:start + MAX_DRAFT_ARTICLES]]
+            }
+            data = self.api.post_json("/draft/add", article_data)
+            if "media_id" not in data:
+                raise WeChatAPIError("创建草稿失败", data)
+            media_ids.append(data["media_id"])
+        return media_ids
+    
+    def create_drafts_with_cover(self, articles: List[Tuple[str, str]], thumb_media_id: str,
+                                 cover_image_path: str) -> Tuple[List[str], str]:
+        """
+        用已上传的封面创建草稿；封面素材已在公众号后台被删除（40007 等）时删除缓存记录，
+        重新上传封面并整批重试一次
         
-        data = response.json()
-        if "media_id" in data:
-            return data["media_id"]
-        else:
-            raise Exception(f"创建草稿失败: {data}")
+        Args:
+            articles (list): (标题, HTML内容) 列表
+            thumb_media_id (str): 封面图片media_id（通常来自 upload_image_cached 的缓存）
+            cover_image_path (str): 封面图片路径，重新上传时使用
+            
+        Returns:
+            tuple: (草稿media_id 列表, 实际使用的封面media_id)
+        """
+        try:
+            draft_media_ids = self.create_draft_batch([(title, content, thumb_media_id) for title, content in articles])
+        except WeChatAPIError as e:
+            if e.errcode not in INVALID_MEDIA_ERRCODES:
+                raise
+            # 先删除失效的记录，重新上传失败时下次也不会再用到它
+            self.media_cache.discard(self.app_id, file_sha1(cover_image_path))
+            thumb_media_id = self.upload_image_cached(cover_image_path)
+            draft_media_ids = self.create_draft_batch([(title, content, thumb_media_id) for title, content in articles])
+        return draft_media_ids, thumb_media_id
     
     def publish_draft(self, media_id: str) -> Dict[str, Any]:
         """
@@ -147,27 +206,7 @@ class WeChatPublisher:
         Raises:
             Exception: 发布失败时抛出异常
         """
-        if not self.access_token:
-            self.get_access_token()
-        
-        url = f"{self.base_url}/freepublish/submit"
-        params = {
-            "access_token": self.access_token
-        }
-        
-        data = {
-            "media_id": media_id
-        }
-        
-        response = requests.post(
-            url,
-            params=params,
-            data=json.dumps(data, ensure_ascii=False).encode('utf-8'),
-            headers={"Content-Type": "application/json"}
-        )
-        
-        result = response.json()
-        return result
+        return self.api.post_json("/freepublish/submit", {"media_id": media_id})
     
     def publish_article(self, title: str, content: str, cover_image_path: str) -> Dict[str, Any]:
         """
@@ -181,19 +220,37 @@ class WeChatPublisher:
         Returns:
             dict: 发布结果
         """
-        # 1. 上传封面图片
-        thumb_media_id = self.upload_image(cover_image_path)
+        result = self.publish_articles([(title, content)], cover_image_path)
+        return {
+            "thumb_media_id": result["thumb_media_id"],
+            "draft_media_id": result["draft_media_ids"][0],
+            "publish_result": result["publish_results"][0]
+        }
+    
+    def publish_articles(self, articles: List[Tuple[str, str]], cover_image_path: str) -> Dict[str, Any]:
+        """
+        一次发布多篇文章（如国内、国际分开的两篇），共用一张封面，每 8 篇合并为一个草稿
+        
+        Args:
+            articles (list): (标题, HTML内容) 列表
+            cover_image_path (str): 封面图片路径
+            
+        Returns:
+            dict: 封面media_id、草稿media_id 列表和各草稿的发布结果
+        """
+        # 1. 上传封面图片（内容相同的封面复用已上传的素材）
+        thumb_media_id = self.upload_image_cached(cover_image_path)
         
-        # 2. 创建草稿
-        draft_media_id = self.create_draft(title, content, thumb_media_id)
+        # 2. 创建草稿，缓存的素材已被删除时重新上传
+        draft_media_ids, thumb_media_id = self.create_drafts_with_cover(articles, thumb_media_id, cover_image_path)
         
         # 3. 发布文章
-        result = self.publish_draft(draft_media_id)
+        publish_results = [self.publish_draft(media_id) for media_id in draft_media_ids]
         
         return {
             "thumb_media_id": thumb_media_id,
-            "draft_media_id": draft_media_id,
-            "publish_result": result
+            "draft_media_ids": draft_media_ids,
+            "publish_results": publish_results
         }
 
 # 使用示例
@@ -1,9 +1,13 @@
-import akshare as ak
 import json
 from datetime import datetime, timedelta
 import sys
 import os
 
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from modules.scraper.raw_transcript_store import fetch_news_cctv
+
 class CCTVNewsScraper:
     def __init__(self):
         # 确保xinwen目录存在
@@ -21,15 +25,10 @@ class CCTVNewsScraper:
             yesterday = datetime.now() - timedelta(days=1)
             date = yesterday.strftime("%Y%m%d")
         
-        # 使用akshare获取新闻联播文字稿
-        df = ak.news_cctv(date=date)
+        # 通过本地原始数据仓库获取新闻联播文字稿（本地没有时才调用akshare）
+        news_list = fetch_news_cctv(date)
         print(f"获取 {date} 的新闻内容成功")
-        
-        # 将DataFrame转换为字典列表
-        if df is not None and not df.empty:
-            return df.to_dict('records')
-        else:
-            return []
+        return news_list
 
     def scrape_daily_news(self, date=None):
         """ 
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+新闻联播原始文字稿本地仓库
+所有需要原始数据的入口都通过这里获取，每个日期最多调用一次 ak.news_cctv，
+结果以 gzip 压缩的 JSON 保存在 xinwen/raw/ 下，并由 manifest.json 记录索引。
+akshare（及其依赖的 pandas）只在确实需要联网下载时才导入
+"""
+
+import gzip
+import json
+import os
+import threading
+from datetime import datetime
+
+# 默认仓库目录
+DEFAULT_STORE_DIR = os.path.join("xinwen", "raw")
+
+# 索引文件名
+MANIFEST_NAME = "manifest.json"
+
+
+class RawTranscriptStore:
+    """
+    原始文字稿仓库
+    本地已有的日期直接读取压缩文件，否则调用 akshare 下载并持久化
+    """
+
+    def __init__(self, store_dir=DEFAULT_STORE_DIR):
+        """
+        Args:
+            store_dir (str): 仓库目录
+        """
+        self.store_dir = store_dir
+        self.manifest_path = os.path.join(store_dir, MANIFEST_NAME)
+        self._lock = threading.Lock()
+        # 每个日期一把锁，并发请求同一日期时只下载一次
+        self._date_locks = {}
+        os.makedirs(store_dir, exist_ok=True)
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self):
+        """
+        读取索引文件
+        """
+        if not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"读取原始数据索引失败，将重新建立: {e}")
+            return {}
+
+    def _save_manifest(self):
+        """
+        原子地写入索引文件（调用方需持有 self._lock）
+        """
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _date_lock(self, date):
+        with self._lock:
+            return self._date_locks.setdefault(date, threading.Lock())
+
+    def _file_path(self, date):
+        return os.path.join(self.store_dir, f"news_cctv_{date}.json.gz")
+
+    def has(self, date):
+        """
+        本地是否已保存指定日期的原始数据
+        """
+        entry = self.manifest.get(date)
+        return entry is not None and os.path.exists(os.path.join(self.store_dir, entry['file']))
+
+    def load(self, date):
+        """
+        从本地读取指定日期的原始数据，不存在时返回 None
+        """
+        if not self.has(date):
+            return None
+        with gzip.open(os.path.join(self.store_dir, self.manifest[date]['file']), 'rt', encoding='utf-8') as f:
+            return json.load(f)
+
+    def save(self, date, records):
+        """
+        保存指定日期的原始数据并更新索引
+        """
+        file_path = self._file_path(date)
+        tmp_path = file_path + ".tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(records, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, file_path)
+
+        with self._lock:
+            self.manifest[date] = {
+                'file': os.path.basename(file_path),
+                'count': len(records),
+                'fetched_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            }
+            self._save_manifest()
+
+    def get(self, date):
+        """
+        获取指定日期的新闻联播原始数据
+
+        Args:
+            date (str): 日期，格式为YYYYMMDD
+
+        Returns:
+            list: 新闻条目列表，每条为包含 date、title、content 的字典
+        """
+        records = self.load(date)
+        if records is not None:
+            return records
+
+        with self._date_lock(date):
+            # 等待期间其他线程可能已经下载完成
+            records = self.load(date)
+            if records is not None:
+                return records
+
+            df = _news_cctv(date)
+            records = df.to_dict('records') if df is not None and not df.empty else []
+            # 空结果可能只是当天文字稿尚未发布，不做持久化
+            if records:
+                self.save(date, records)
+            return records
+
+
+def _news_cctv(date):
+    """
+    调用 akshare 下载指定日期的新闻联播文字稿
+    akshare 导入较慢（约一秒），延迟到第一次下载时再导入
+    """
+    import akshare as ak
+    return ak.news_cctv(date=date)
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_default_store():
+    """
+    获取进程内共享的默认仓库
+    """
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = RawTranscriptStore()
+        return _default_store
+
+
+def fetch_news_cctv(date):
+    """
+    通过默认仓库获取指定日期的新闻联播原始数据
+
+    Args:
+        date (str): 日期，格式为YYYYMMDD
+
+    Returns:
+        list: 新闻条目列表，每条为包含 date、title、content 的字典
+    """
+    return get_default_store().get(date)
+
+
+def fetch_news_contents(date):
+    """
+    获取指定日期的新闻联播正文列表
+    """
+    return [record['content'] for record in fetch_news_cctv(date)]
@@ -1,7 +1,14 @@
-import akshare as ak
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import re
 
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from modules.scraper.raw_transcript_store import fetch_news_contents
+
 # 预定义的常见新闻联播模板
 PREDEFINED_TEMPLATES = [
     r'^今天是\d{4}年\d{1,2}月\d{1,2}日.*?$',          # 日期串词
@@ -28,9 +35,9 @@ class SimpleTemplateGenerator:
     def __init__(self):
         self.templates = PREDEFINED_TEMPLATES.copy()
         
-    def analyze_sample_data(self, date="20251023", days=5):
+    def analyze_sample_data(self, date="20251023", days=5, max_workers=4):
         """
-        分析样本数据，提取可能的模板
+        分析样本数据，提取可能的模板（多个日期并发下载）
         """
         print(f"正在分析 {days} 天的样本数据...")
         
@@ -42,22 +49,29 @@ class SimpleTemplateGenerator:
             dates.append(current_date.strftime("%Y%m%d"))
             current_date -= timedelta(days=1)
         
-        # 收集所有行
+        # 并发下载并收集所有行（保持日期顺序）
         all_lines = []
-        for date in dates:
-            try:
-                news_data = ak.news_cctv(date=date)
-                content_lines = '\n'.join(news_data['content'].tolist()).split('\n')
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            for content_lines in executor.map(self._fetch_day_lines, dates):
                 all_lines.extend(content_lines)
-                print(f"成功获取 {date} 的数据，共 {len(content_lines)} 行")
-            except Exception as e:
-                print(f"获取 {date} 的数据失败: {e}")
         
         # 分析行的模式
         self._extract_patterns_from_lines(all_lines)
         
         return self.templates
     
+    def _fetch_day_lines(self, date):
+        """
+        获取单期新闻联播数据并按行拆分，失败返回空列表
+        """
+        try:
+            content_lines = '\n'.join(fetch_news_contents(date)).split('\n')
+            print(f"成功获取 {date} 的数据，共 {len(content_lines)} 行")
+            return content_lines
+        except Exception as e:
+            print(f"获取 {date} 的数据失败: {e}")
+            return []
+
     def _extract_patterns_from_lines(self, lines):
         """
         从行中提取模式
@@ -172,8 +186,7 @@ class SimpleTemplateGenerator:
         """
         print("正在验证模板...")
         try:
-            news_data = ak.news_cctv(date=test_date)
-            content_lines = '\n'.join(news_data['content'].tolist()).split('\n')
+            content_lines = '\n'.join(fetch_news_contents(test_date)).split('\n')
             
             # 编译模板
             compiled_templates = [re.compile(t) for t in self.templates]
@@ -1,22 +1,51 @@
-import akshare as ak
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from collections import Counter
+from collections import Counter, defaultdict
+import math
+import random
 import re
+import zlib
 from difflib import SequenceMatcher
 
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from modules.scraper.raw_transcript_store import fetch_news_contents
+
+# MinHash 使用的大素数
+_MERSENNE_PRIME = (1 << 61) - 1
+
 class TemplateGenerator:
     """
     模板自动生成器
     通过多期新闻联播数据对比，自动提取固定模式文本
     """
     
-    def __init__(self):
+    def __init__(self, num_perm=128, max_miss_rate=1e-3, short_line_length=4):
+        """
+        Args:
+            num_perm (int): MinHash 签名长度
+            max_miss_rate (float): 阈值处相似行对在 LSH 中漏检概率的上限，决定分段方式
+            short_line_length (int): 不超过该长度的行不走 LSH，按长度精确匹配候选
+        """
         self.common_patterns = []
         self.date_pattern = re.compile(r'\d{4}年\d{1,2}月\d{1,2}日')
+
+        # MinHash / LSH 参数，固定随机种子保证结果可复现
+        self.num_perm = num_perm
+        self.max_miss_rate = max_miss_rate
+        self.short_line_length = short_line_length
+        rng = random.Random(42)
+        self._minhash_params = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
         
-    def fetch_multiple_days(self, start_date, days=20):
+    def fetch_multiple_days(self, start_date, days=20, max_workers=4):
         """
-        获取多期新闻联播数据
+        获取多期新闻联播数据（多个日期并发下载，结果保持日期顺序）
         """
         dates = []
         current_date = datetime.strptime(start_date, "%Y%m%d")
@@ -26,48 +55,156 @@ class TemplateGenerator:
             dates.append(current_date.strftime("%Y%m%d"))
             current_date -= timedelta(days=1)
         
-        # 获取多期数据
-        news_contents = []
-        for date in dates:
-            try:
-                news_data = ak.news_cctv(date=date)
-                content_lines = '\n'.join(news_data['content'].tolist()).split('\n')
-                news_contents.append(content_lines)
-                print(f"成功获取 {date} 的数据")
-            except Exception as e:
-                print(f"获取 {date} 的数据失败: {e}")
-        
-        return news_contents
+        # 并发获取多期数据
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            results = list(executor.map(self._fetch_day_lines, dates))
+
+        return [content_lines for content_lines in results if content_lines is not None]
+
+    def _fetch_day_lines(self, date):
+        """
+        获取单期新闻联播数据并按行拆分，失败返回 None
+        """
+        try:
+            content_lines = '\n'.join(fetch_news_contents(date)).split('\n')
+            print(f"成功获取 {date} 的数据")
+            return content_lines
+        except Exception as e:
+            print(f"获取 {date} 的数据失败: {e}")
+            return None
     
+    @staticmethod
+    def _char_tokens(line):
+        """
+        将一行拆成字符多重集：第 k 次出现的字符记为 (字符, k)，
+        两行共有的记号数就是 SequenceMatcher.quick_ratio 使用的字符重合数
+        """
+        if not line:
+            # 空行只与空行相似
+            return [('', 0)]
+        seen = Counter()
+        tokens = []
+        for ch in line:
+            tokens.append((ch, seen[ch]))
+            seen[ch] += 1
+        return tokens
+
+    def _lsh_rows(self, similarity_threshold):
+        """
+        按阈值选择每段的行数：在漏检概率不超过 max_miss_rate 的前提下取最大值（候选最少）
+
+        ratio >= t 时字符重合数 o >= t * (len1 + len2) / 2，
+        记号集合的 Jaccard 相似度 o / (len1 + len2 - o) >= t / (2 - t)
+        """
+        jaccard = similarity_threshold / (2 - similarity_threshold) if similarity_threshold > 0 else 0.0
+        best = 1
+        for rows in range(1, self.num_perm + 1):
+            bands = self.num_perm // rows
+            if (1 - jaccard ** rows) ** bands <= self.max_miss_rate:
+                best = rows
+        return best
+
     def find_similar_lines(self, news_contents, similarity_threshold=0.8):
         """
         使用相似度比较查找在多期数据中相似的行
+        先用字符多重集的 MinHash + LSH 分桶找出候选行，很短的行按长度精确匹配候选，
+        再只对候选行做精确的相似度检查，避免所有行两两比较
         """
         similar_groups = []
         processed = set()
+
+        # 行 -> [(期号, 行号)]
+        occurrences = defaultdict(list)
+        for j, content in enumerate(news_contents):
+            for k, line in enumerate(content):
+                occurrences[line].append((j, k))
+
+        line_tokens = {line: self._char_tokens(line) for line in occurrences}
+        token_sets = {line: frozenset(tokens) for line, tokens in line_tokens.items()}
+
+        # 每个记号的哈希向量只计算一次，行的签名是其记号向量逐位取最小值
+        token_vectors = {}
+        for tokens in line_tokens.values():
+            for token in tokens:
+                if token not in token_vectors:
+                    h = zlib.crc32(f"{token[0]}\0{token[1]}".encode('utf-8'))
+                    token_vectors[token] = [(a * h + b) % _MERSENNE_PRIME for a, b in self._minhash_params]
+
+        # LSH 索引：桶 -> {行}；很短的行签名不可靠，按长度索引后精确匹配
+        rows = self._lsh_rows(similarity_threshold)
+        bands = self.num_perm // rows
+        line_keys = {}
+        buckets = defaultdict(list)
+        lines_by_length = defaultdict(list)
+        for line, tokens in line_tokens.items():
+            lines_by_length[len(line)].append(line)
+            if len(line) <= self.short_line_length:
+                continue
+            signature = tuple(map(min, zip(*(token_vectors[token] for token in set(tokens)))))
+            line_keys[line] = [(band, signature[band * rows:(band + 1) * rows]) for band in range(bands)]
+            for key in line_keys[line]:
+                buckets[key].append(line)
+
+        def length_range(length):
+            # ratio <= 2 * min(len1, len2) / (len1 + len2)，长度相差过大的行不可能相似
+            if similarity_threshold <= 0:
+                return 0, max(lines_by_length)
+            low = math.ceil(length * similarity_threshold / (2 - similarity_threshold) - 1e-9)
+            high = math.floor(length * (2 - similarity_threshold) / similarity_threshold + 1e-9)
+            return low, high
+
+        candidate_cache = {}
+
+        def candidate_lines(line1):
+            """
+            与 line1 同桶的行，加上长度相容的短行（line1 本身是短行时为所有长度相容的行）
+            """
+            if line1 not in candidate_cache:
+                low, high = length_range(len(line1))
+                if line1 in line_keys:
+                    shared = {line2 for key in line_keys[line1] for line2 in buckets[key]}
+                    high = min(high, self.short_line_length)
+                else:
+                    shared = set()
+                for length in range(low, high + 1):
+                    shared.update(lines_by_length.get(length, ()))
+                candidate_cache[line1] = sorted(
+                    (j, k, line2) for line2 in shared for j, k in occurrences[line2]
+                )
+            return candidate_cache[line1]
+
+        # 缓存精确相似度检查结果
+        similarity_cache = {}
+
+        def is_similar(line1, line2):
+            pair = (line1, line2)
+            if pair not in similarity_cache:
+                # 先用长度和字符重合数（即 real_quick_ratio、quick_ratio）排除，再计算 ratio
+                tokens1, tokens2 = token_sets[line1], token_sets[line2]
+                total = len(tokens1) + len(tokens2)
+                similarity_cache[pair] = (
+                    2 * min(len(tokens1), len(tokens2)) >= similarity_threshold * total
+                    and 2 * len(tokens1 & tokens2) >= similarity_threshold * total
+                    and SequenceMatcher(None, line1, line2).ratio() >= similarity_threshold
+                )
+            return similarity_cache[pair]
         
-        # 遍历所有行，寻找相似的行
+        # 遍历所有行，只与候选行比较
         for i, content1 in enumerate(news_contents):
             for line1 in content1:
                 if line1 in processed:
                     continue
-                    
-                # 寻找与line1相似的行
+
+                # 寻找与line1相似的行（按期号、行号顺序，与两两比较的顺序一致）
                 similar_lines = [line1]
-                for j, content2 in enumerate(news_contents):
-                    if i == j:
-                        continue
-                        
-                    for line2 in content2:
-                        # 计算相似度
-                        similarity = SequenceMatcher(None, line1, line2).ratio()
-                        if similarity >= similarity_threshold:
-                            similar_lines.append(line2)
+                for j, _, line2 in candidate_lines(line1):
+                    if i != j and is_similar(line1, line2):
+                        similar_lines.append(line2)
                 
                 # 如果找到足够多的相似行，则加入结果
                 if len(similar_lines) > 1:
-                    # 去重
-                    unique_lines = list(set(similar_lines))
+                    # 去重（保持 line1 在首位）
+                    unique_lines = list(dict.fromkeys(similar_lines))
                     if len(unique_lines) > 1:
                         similar_groups.append({
                             'lines': unique_lines,
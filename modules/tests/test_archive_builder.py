@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+静态归档站点生成器测试脚本
+验证每日页面、分页索引、标签页和实体页的生成，未变化日期的跳过，以及每日页面模板修改后重新渲染
+"""
+
+import json
+import os
+import sys
+import tempfile
+# 添加项目根目录到sys.path以便可以导入modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import generate_news_html
+from modules.publisher.archive_builder import ArchiveBuilder
+from modules.publisher.template_engine import Theme
+
+
+def _write_day(data_dir, date_str, title):
+    """
+    写入一天的 full_result 文件
+    """
+    news_data = {
+        "date": date_str,
+        "domestic": [{"summary": {"title": title, "summary": "摘要", "keywords": ["经济", "民生"]},
+                      "entities": {"locations": ["北京"], "persons": [], "organizations": ["国务院"]}}],
+        "international": [{"summary": {"title": f"{date_str}国际新闻", "summary": "摘要", "keywords": ["外交"]},
+                           "entities": {"locations": ["日内瓦"], "persons": [], "organizations": []}}],
+    }
+    with open(os.path.join(data_dir, f"full_result_{date_str}.json"), 'w', encoding='utf-8') as f:
+        json.dump(news_data, f, ensure_ascii=False)
+
+
+def test_incremental_build():
+    """
+    测试首次全部渲染，再次构建全部跳过，修改或删除一天后只处理这一天
+    """
+    with tempfile.TemporaryDirectory() as data_dir, tempfile.TemporaryDirectory() as output_dir:
+        for day in range(1, 6):
+            _write_day(data_dir, f"202511{day:02d}", f"第{day}天国内新闻")
+        builder = ArchiveBuilder(data_dir, output_dir, workers=2, days_per_page=2)
+
+        stats = builder.build()
+        print(f"首次构建: {stats}")
+        assert stats["days"] == 5 and stats["rendered_days"] == 5
+        for name in ("index.html", "index_2.html", "index_3.html", "tags.html", "entities.html",
+                     os.path.join("days", "20251103.html")):
+            assert os.path.exists(os.path.join(output_dir, name)), name
+        with open(os.path.join(output_dir, "index.html"), 'r', encoding='utf-8') as f:
+            index_html = f.read()
+        assert "第5天国内新闻" in index_html and "第1天国内新闻" not in index_html
+        with open(os.path.join(output_dir, "tags.html"), 'r', encoding='utf-8') as f:
+            assert "经济</a> (5)" in f.read()
+
+        stats = builder.build()
+        print(f"再次构建: {stats}")
+        assert stats["rendered_days"] == 0 and stats["written_pages"] == 0
+
+        # 只改写文件、内容不变时不重新渲染
+        _write_day(data_dir, "20251102", "第2天国内新闻")
+        assert builder.build()["rendered_days"] == 0
+
+        _write_day(data_dir, "20251102", "修改后的标题")
+        stats = builder.build()
+        print(f"修改一天后: {stats}")
+        assert stats["rendered_days"] == 1
+        with open(os.path.join(output_dir, "days", "20251102.html"), 'r', encoding='utf-8') as f:
+            assert "修改后的标题" in f.read()
+
+        os.remove(os.path.join(data_dir, "full_result_20251101.json"))
+        stats = builder.build()
+        print(f"删除一天后: {stats}")
+        assert stats["days"] == 4 and stats["rendered_days"] == 0
+        assert not os.path.exists(os.path.join(output_dir, "days", "20251101.html"))
+        assert not os.path.exists(os.path.join(output_dir, "index_3.html"))
+
+
+def test_theme_change_rerenders_days():
+    """
+    测试修改每日页面的 CSS 后，所有日期页面用新样式重新渲染
+    """
+    original = generate_news_html.THEME
+    with tempfile.TemporaryDirectory() as data_dir, tempfile.TemporaryDirectory() as output_dir:
+        for day in range(1, 4):
+            _write_day(data_dir, f"202511{day:02d}", f"第{day}天国内新闻")
+        builder = ArchiveBuilder(data_dir, output_dir, workers=1)
+        assert builder.build()["rendered_days"] == 3
+        assert builder.build()["rendered_days"] == 0
+
+        generate_news_html.THEME = Theme(original.name, original.head.source, original.tail.source,
+                                         original.item.source, original.item_context,
+                                         original.section_head.source, original.section_tail.source,
+                                         css=generate_news_html.CSS + "\n.changed { color: red; }")
+        try:
+            stats = builder.build()
+            print(f"修改样式后: {stats}")
+            assert stats["rendered_days"] == 3
+            with open(os.path.join(output_dir, "days", "20251102.html"), 'r', encoding='utf-8') as f:
+                assert ".changed { color: red; }" in f.read()
+            assert builder.build()["rendered_days"] == 0
+        finally:
+            generate_news_html.THEME = original
+        assert builder.build()["rendered_days"] == 3
+
+
+if __name__ == "__main__":
+    test_incremental_build()
+    test_theme_change_rerenders_days()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+异步发布流程测试脚本
+使用本地模拟服务验证封面上传与文章生成并发、后台轮询发布状态并保存最终结果
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+# 添加项目根目录到sys.path以便可以导入modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from modules.publisher.async_publisher import AsyncWeChatPublisher, PublishLog
+from modules.publisher.wechat_media_cache import MediaCache
+from modules.publisher.wechat_publisher import WeChatPublisher
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    模拟微信接口：上传耗时 0.3 秒，发布状态前两次查询为“发布中”
+    """
+    status_queries = 0
+
+    def _reply(self, data):
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._reply({"access_token": "token", "expires_in": 7200})
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        self.rfile.read(int(self.headers["Content-Length"]))
+        if path.endswith("/material/add_material"):
+            time.sleep(0.3)
+            self._reply({"media_id": "cover-1"})
+        elif path.endswith("/draft/add"):
+            self._reply({"media_id": "draft-1"})
+        elif path.endswith("/freepublish/submit"):
+            self._reply({"errcode": 0, "errmsg": "ok", "publish_id": 2247483647})
+        elif path.endswith("/freepublish/get"):
+            _Handler.status_queries += 1
+            if _Handler.status_queries < 3:
+                self._reply({"publish_id": 2247483647, "publish_status": 1})
+            else:
+                self._reply({"publish_id": 2247483647, "publish_status": 0, "article_id": "article-1",
+                             "article_detail": {"count": 1, "item": [{"idx": 1, "article_url": "https://mp.weixin.qq.com/s/abc"}]},
+                             "fail_idx": []})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_publish_and_poll():
+    """
+    测试文章生成与封面上传并发执行，发布状态轮询到成功后写入发布记录
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}/cgi-bin"
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cover_path = os.path.join(tmp_dir, "cover.jpg")
+        with open(cover_path, "wb") as f:
+            f.write(b"cover")
+        log_path = os.path.join(tmp_dir, "publish_log.json")
+        publisher = WeChatPublisher("app", "secret", token_cache=None, base_url=base_url,
+                                    media_cache=MediaCache(None))
+
+        def render():
+            time.sleep(0.3)
+            return "标题", "<p>内容</p>"
+
+        async def run():
+            async_publisher = AsyncWeChatPublisher(publisher, PublishLog(log_path), poll_initial=0.05)
+            start = time.perf_counter()
+            record = await async_publisher.publish(render, cover_path)
+            submitted = time.perf_counter() - start
+            assert record["status_text"] == "发布中"
+            await async_publisher.wait()
+            return submitted
+
+        submitted = asyncio.run(run())
+        print(f"提交耗时 {submitted:.2f} 秒, 状态查询 {_Handler.status_queries} 次")
+        # 生成和上传各 0.3 秒，并发执行时总耗时明显小于 0.6 秒
+        assert submitted < 0.55
+        assert _Handler.status_queries == 3
+
+        record = PublishLog(log_path).get("2247483647")
+        assert record["publish_status"] == 0 and record["status_text"] == "发布成功"
+        assert record["article_urls"] == ["https://mp.weixin.qq.com/s/abc"]
+        assert record["draft_media_id"] == "draft-1" and record["title"] == "标题"
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    test_publish_and_poll()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+批量摘要测试脚本
+验证按条数和上下文长度分批，以及模型输出格式错误时的拆分重试
+"""
+
+import json
+import os
+import re
+import sys
+# 添加项目根目录到sys.path以便可以导入modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from modules.analyzer.batch_summarizer import (batch_tokens, iter_batches, parse_batch_response,
+                                               summarize_in_batches)
+
+
+def _fake_generate(calls):
+    """
+    模拟 format="json" 的模型：提示词要求 {"items": [...]} 时按编号返回，批内含“坏”字的新闻时输出被截断的 JSON
+    """
+    def generate(prompt, count):
+        texts = re.findall(r'^\[\d+\] (.*)$', prompt.split('新闻原文：\n')[-1], re.M)
+        assert len(texts) == count
+        # JSON 模式只能生成顶层对象
+        assert '{"items": [...]}' in prompt
+        calls.append(count)
+        if any('坏' in text for text in texts):
+            return '{"items": [{"title": '
+        items = [{"title": text[:4], "summary": text} for text in texts]
+        return json.dumps({"items": items}, ensure_ascii=False)
+    return generate
+
+
+def test_iter_batches_respects_limits():
+    """
+    测试每批不超过条数上限和上下文长度，且保持输入顺序
+    """
+    texts = [f"第{i}条新闻" + "内容" * (i * 20) for i in range(12)]
+    batches = list(iter_batches(iter(texts), max_items=4, context_tokens=1200))
+    print(f"分批结果: {[len(batch) for batch in batches]}")
+
+    assert [text for batch in batches for text in batch] == texts
+    for batch in batches:
+        assert len(batch) <= 4
+        assert len(batch) == 1 or batch_tokens(batch) <= 1200
+
+
+def test_split_and_retry_on_malformed_output():
+    """
+    测试格式错误的批次被二分重试，只有坏的那条得不到结果
+    """
+    texts = ["国务院常务会议", "神舟飞船发射", "坏数据", "秋粮收获进展"]
+    calls = []
+    results = summarize_in_batches(texts, _fake_generate(calls))
+    print(f"请求条数: {calls}")
+
+    assert calls == [4, 2, 2, 1, 1]
+    assert results[2] is None
+    assert [r["summary"] for i, r in enumerate(results) if i != 2] == ["国务院常务会议", "神舟飞船发射", "秋粮收获进展"]
+
+
+def test_large_batch_size_keeps_batching():
+    """
+    测试为每条新闻预留含实体字段的输出时，批量大小很大（50）也按上下文长度装入多条，而不是每批退化为一条
+    """
+    from modules.analyzer import direct_llm_processor
+
+    texts = [f"第{i}条新闻，" + "国务院召开常务会议部署经济工作" * 3 for i in range(60)]
+    output_tokens = direct_llm_processor.OUTPUT_TOKENS_WITH_ENTITIES
+    batches = list(iter_batches(texts, max_items=50, item_schema=direct_llm_processor.ITEM_SCHEMA,
+                                output_tokens_per_item=output_tokens))
+    print(f"预留 {output_tokens} token 时的分批结果: {[len(batch) for batch in batches]}")
+    assert [text for batch in batches for text in batch] == texts
+    for batch in batches:
+        assert len(batch) > 1
+        assert batch_tokens(batch, direct_llm_processor.ITEM_SCHEMA, output_tokens) <= 4096
+
+    calls = []
+    original = direct_llm_processor._generate_batch
+    direct_llm_processor._generate_batch = _fake_generate(calls)
+    try:
+        processed = direct_llm_processor._process_in_batches(texts, batch_size=50)
+    finally:
+        direct_llm_processor._generate_batch = original
+    assert calls == [len(batch) for batch in batches]
+    assert [item["processed"]["summary"] for item in processed] == texts
+
+
+def test_parse_batch_response():
+    """
+    测试接受包在对象中的数组，拒绝条数不符的输出
+    """
+    items = [{"title": "a", "summary": "b"}, {"title": "c", "summary": "d"}]
+    assert parse_batch_response(json.dumps({"items": items}), 2) == items
+    assert parse_batch_response(json.dumps(items[0]), 1) == items[:1]
+    try:
+        parse_batch_response(json.dumps(items), 3)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("条数不符时应抛出 ValueError")
+
+
+if __name__ == "__main__":
+    test_iter_batches_respects_limits()
+    test_split_and_retry_on_malformed_output()
+    test_large_batch_size_keeps_batching()
+    test_parse_batch_response()
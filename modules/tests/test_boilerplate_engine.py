@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+固定模式匹配引擎测试脚本
+验证合并后的正则与逐个模式匹配结果一致，并能加载挖掘出的模板文件
+"""
+
+import os
+import re
+import sys
+import tempfile
+# 添加项目根目录到sys.path以便可以导入modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from modules.processor.boilerplate_engine import BoilerplateEngine
+from main import NewsProcessor
+from modules.templates.template_generator import TemplateGenerator
+
+BOILERPLATE_PATTERNS = NewsProcessor(use_cache=False).boilerplate_patterns
+
+
+def test_same_result_as_pattern_loop():
+    """
+    测试引擎命中的规则与逐个模式匹配时第一个命中的模式一致
+    """
+    engine = BoilerplateEngine(BOILERPLATE_PATTERNS)
+    compiled = [re.compile(p) for p in BOILERPLATE_PATTERNS]
+    lines = [
+        "今天是2025年11月4日，星期二，农历九月十五。",
+        "各位观众，晚上好。",
+        "天气预报之后继续播出",
+        "现在播送张三同志简历",
+        "现在为您播送国家统计局公报全文",
+        "19时30分，新闻联播",
+        "下面来看国际新闻",
+        "央视网消息：今天",
+        "国务院召开常务会议",
+        "",
+    ]
+
+    for line in lines:
+        expected = next((i for i, pattern in enumerate(compiled) if pattern.match(line)), None)
+        rule = engine.match(line)
+        print(f"{line!r}: {rule.pattern if rule else '未命中'}")
+        assert (rule.index if rule else None) == expected
+
+
+def test_load_mined_patterns():
+    """
+    测试加载 TemplateGenerator.save_patterns 保存的模板
+    """
+    generator = TemplateGenerator()
+    generator.common_patterns = generator.convert_to_patterns([
+        {'lines': ['本台记者报道 | 今天12点', '本台记者报道 | 今天13点'], 'count': 2, 'frequency': 1.0}
+    ])
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "boilerplate_patterns.txt")
+        generator.save_patterns(filename)
+
+        engine = BoilerplateEngine(BOILERPLATE_PATTERNS)
+        assert engine.load_file(filename) == 1
+
+    rule = engine.match("本台记者报道 | 今天18点")
+    assert rule is not None and rule.source == filename
+    # 挖掘出的模板按整行匹配
+    assert engine.match("本台记者报道 | 今天18点，北京") is None
+
+
+if __name__ == "__main__":
+    test_same_result_as_pattern_loop()
+    test_load_mined_patterns()
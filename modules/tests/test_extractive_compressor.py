@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+抽取式预压缩测试脚本
+验证短新闻原样保留，长新闻在预算内保留导语和信息量高的句子，
+没有可打分句子的文本不会让摘要流程中断
+"""
+
+import os
+import sys
+# 添加项目根目录到sys.path以便可以导入modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from modules.analyzer.extractive_compressor import ExtractiveCompressor
+from modules.utils.token_estimate import estimate_tokens
+
+
+def test_short_text_unchanged():
+    """
+    测试未超出预算的新闻原样返回
+    """
+    compressor = ExtractiveCompressor()
+    text = "国务院总理主持召开国务院常务会议。"
+    assert compressor.compress(text, 100) == text
+
+
+def test_long_text_keeps_lead_and_facts():
+    """
+    测试长新闻保留导语和含实体、数字的句子，并按原文顺序拼接
+    """
+    compressor = ExtractiveCompressor(entity_keywords=['国务院', '国家统计局'], topic_keywords=['经济'])
+    lead = "国务院新闻办公室今天举行新闻发布会。"
+    filler = "与会人员表示将继续努力做好相关工作。" * 6
+    fact = "国家统计局数据显示，前三季度经济增长5.2%。"
+    text = lead + filler + fact + "会议还研究了其他事项。"
+
+    result = compressor.compress(text, 60)
+    print(f"压缩结果: {result}")
+    assert estimate_tokens(result) <= 60
+    assert result.startswith(lead)
+    assert fact in result
+    assert "与会人员表示" not in result.split(fact)[1]
+
+
+def test_lead_longer_than_budget_is_truncated():
+    """
+    测试导语本身超出预算时按预算截断
+    """
+    compressor = ExtractiveCompressor()
+    text = "这是一条没有句号的很长的导语" * 20
+    result = compressor.compress(text, 30)
+    assert estimate_tokens(result) <= 30
+    assert text.startswith(result)
+
+
+def test_text_without_sentences():
+    """
+    测试只有句末标点、切不出句子的长文本按预算截断而不是抛出 IndexError
+    """
+    compressor = ExtractiveCompressor()
+    text = "。" * 200 + "！？" * 100
+    result = compressor.compress(text, 30)
+    assert estimate_tokens(result) <= 30
+    assert text.startswith(result)
+
+
+def test_summarizer_prompt_template_and_fallback():
+    """
+    测试摘要器的提示词模板可以 str.format 填充，压缩或模型出错时退回简单摘要
+    """
+    from modules.analyzer.llm_news_summarizer import NewsSummarizer
+    from modules.analyzer.llm_worker import build_summary_prompt
+
+    summarizer = NewsSummarizer(worker_port=None)
+    assert summarizer.get_prompt_template().format(text="正文") == build_summary_prompt("正文")
+
+    class _BrokenCompressor:
+        def compress(self, text, max_tokens):
+            raise IndexError("list index out of range")
+
+    class _Worker:
+        def summarize(self, text):
+            return {"title": "不应调用"}
+
+    summarizer.worker = _Worker()
+    summarizer.compressor = _BrokenCompressor()
+    summary = summarizer.summarize_with_llm("国务院总理主持召开国务院常务会议。")
+    assert summary == summarizer.simple_summarize("国务院总理主持召开国务院常务会议。")
+
+
+if __name__ == "__main__":
+    test_short_text_unchanged()
+    test_long_text_keeps_lead_and_facts()
+    test_lead_longer_than_budget_is_truncated()
+    test_text_without_sentences()
+    test_summarizer_prompt_template_and_fallback()
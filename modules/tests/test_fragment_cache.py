@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+HTML 片段缓存测试脚本
+验证预览渲染器在多次预览之间只重新渲染改动过的条目，输出与直接渲染一致，
+以及模板变化后缓存失效、超出容量时淘汰最久未使用的片段
+"""
+
+import copy
+import os
+import sys
+import time
+# 添加项目根目录到sys.path以便可以导入modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from modules.publisher import generate_wechat_html as wechat_html
+from modules.publisher import wechat_article_generator_v2 as article_v2
+from modules.publisher.fragment_cache import FragmentCache, PreviewRenderer
+from modules.publisher.template_engine import Section, Theme
+
+
+def _news_data(count=5):
+    """
+    构造测试用的新闻数据
+    """
+    return {
+        "date": "20251104",
+        "domestic": [{"summary": {"title": f"国内新闻标题{i}", "summary": f"国内摘要{i}", "keywords": ["经济"]}}
+                     for i in range(count)],
+        "international": [{"summary": {"title": f"国际新闻标题{i}", "summary": f"国际摘要{i}", "keywords": []}}
+                          for i in range(3)],
+    }
+
+
+def test_only_changed_item_is_rerendered():
+    """
+    测试原地修改一条摘要后再次预览，只有这一条重新渲染，页面与直接渲染一致
+    """
+    renderer = PreviewRenderer(wechat_html.THEME)
+    news_data = _news_data()
+    first = wechat_html.generate_wechat_html(news_data, renderer)
+    assert first == wechat_html.generate_wechat_html(news_data)
+    assert renderer.stats() == {"reused": 0, "rendered": 8}
+
+    # 编辑器原地修改摘要
+    news_data["domestic"][2]["summary"]["summary"] = "修改后的摘要"
+    second = wechat_html.generate_wechat_html(news_data, renderer)
+    print(f"预览统计: {renderer.stats()}")
+
+    assert renderer.stats() == {"reused": 7, "rendered": 9}
+    assert second == wechat_html.generate_wechat_html(news_data)
+    assert first.replace("国内摘要2", "修改后的摘要") == second
+
+    # 撤销修改后直接取回原来的片段
+    news_data["domestic"][2]["summary"]["summary"] = "国内摘要2"
+    assert wechat_html.generate_wechat_html(news_data, renderer) == first
+    assert renderer.stats() == {"reused": 15, "rendered": 9}
+    assert renderer.cache.stats()["hits"] == 1
+
+
+def test_digest_articles_share_renderer():
+    """
+    测试国内、国际两篇文章共用一个预览渲染器时互不覆盖
+    """
+    renderer = PreviewRenderer(article_v2.THEME)
+    news_data = _news_data()
+    expected = article_v2.generate_digest_articles(news_data)
+    for _ in range(2):
+        assert article_v2.generate_digest_articles(news_data, renderer) == expected
+    assert renderer.stats() == {"reused": 8, "rendered": 8}
+
+
+def test_preview_is_fast():
+    """
+    测试 200 条新闻的页面修改一条后重新预览的耗时明显小于整页渲染
+    """
+    news_data = _news_data(200)
+    renderer = PreviewRenderer(wechat_html.THEME)
+    wechat_html.generate_wechat_html(news_data, renderer)
+
+    start = time.perf_counter()
+    for i in range(20):
+        news_data["domestic"][i]["summary"]["summary"] = f"第 {i} 次修改"
+        wechat_html.generate_wechat_html(news_data, renderer)
+    preview = (time.perf_counter() - start) / 20
+
+    start = time.perf_counter()
+    for _ in range(20):
+        wechat_html.generate_wechat_html(news_data)
+    full = (time.perf_counter() - start) / 20
+    print(f"重新预览 {preview * 1000:.2f}ms, 整页渲染 {full * 1000:.2f}ms")
+    assert preview < full
+
+
+def test_template_version_and_lru():
+    """
+    测试主题模板变化后片段重新渲染，超出容量时淘汰最久未使用的片段
+    """
+    def item_context(summary, index):
+        return {"index": index, "title": summary["title"]}
+
+    summaries = [{"title": "a"}, {"title": "b"}]
+    cache = FragmentCache(max_entries=2)
+    theme = Theme('test', '<div>', '</div>', '<p>{index}. {title}</p>', item_context)
+    changed = Theme('test', '<div>', '</div>', '<li>{index}. {title}</li>', item_context)
+    assert theme.version != changed.version
+
+    assert PreviewRenderer(theme, cache).render({}, [Section(summaries)]) == '<div><p>1. a</p><p>2. b</p></div>'
+    assert PreviewRenderer(changed, cache).render({}, [Section(summaries)]) == '<div><li>1. a</li><li>2. b</li></div>'
+    assert cache.stats() == {"entries": 2, "hits": 0, "misses": 4}
+
+    # 旧模板的片段已被淘汰
+    PreviewRenderer(theme, cache).render({}, [Section(copy.deepcopy(summaries))])
+    assert cache.stats()["misses"] == 6
+
+
+if __name__ == "__main__":
+    test_only_changed_item_is_rerendered()
+    test_digest_articles_share_renderer()
+    test_preview_is_fast()
+    test_template_version_and_lru()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+封面图片预处理测试脚本
+验证缩放到封面尺寸、压缩到大小上限，以及处理结果按原图哈希缓存
+"""
+
+import os
+import random
+import sys
+import tempfile
+# 添加项目根目录到sys.path以便可以导入modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from modules.publisher.image_prep import COVER_SIZE, prepare_cover
+
+
+def _noisy_png(path, size):
+    """
+    生成难以压缩的大尺寸 PNG
+    """
+    from PIL import Image
+    rng = random.Random(0)
+    image = Image.frombytes("RGB", size, bytes(rng.getrandbits(8) for _ in range(size[0] * size[1] * 3)))
+    image.save(path)
+
+
+def test_prepare_cover():
+    """
+    测试大图被裁剪缩放到 900x383 且不超过大小上限，再次处理直接使用缓存
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        print("未安装Pillow，跳过")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source = os.path.join(tmp_dir, "cover.png")
+        _noisy_png(source, (1200, 1200))
+        cache_dir = os.path.join(tmp_dir, "cache")
+
+        prepared = prepare_cover(source, max_bytes=80 * 1024, cache_dir=cache_dir)
+        print(f"原图 {os.path.getsize(source)} 字节 -> {os.path.getsize(prepared)} 字节")
+        assert prepared != source and os.path.getsize(prepared) <= 80 * 1024
+        with Image.open(prepared) as image:
+            assert image.format == "JPEG"
+            assert abs(image.width / image.height - COVER_SIZE[0] / COVER_SIZE[1]) < 0.02
+            assert image.width <= COVER_SIZE[0]
+
+        mtime = os.path.getmtime(prepared)
+        assert prepare_cover(source, max_bytes=80 * 1024, cache_dir=cache_dir) == prepared
+        assert os.path.getmtime(prepared) == mtime
+
+        # 无法识别的文件原样返回
+        broken = os.path.join(tmp_dir, "broken.png")
+        with open(broken, "wb") as f:
+            f.write(b"not an image")
+        assert prepare_cover(broken, cache_dir=cache_dir) == broken
+
+
+if __name__ == "__main__":
+    test_prepare_cover()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+关键词自动机测试脚本
+验证单次扫描的命中结果与逐个关键词 in 判断一致
+"""
+
+import os
+import sys
+# 添加项目根目录到sys.path以便可以导入modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from modules.utils.keyword_automaton import KeywordAutomaton
+
+
+def test_overlapping_keywords():
+    """
+    测试重叠关键词和多类别关键词都能被找到
+    """
+    automaton = KeywordAutomaton({
+        'org': ['国务院', '全国人大', '全国人大常委会'],
+        'domestic': ['国务院', '人大常委'],
+    })
+    hits = automaton.scan("全国人大常委会和国务院召开会议")
+
+    print("命中结果:")
+    for offset, keyword, categories in hits.hits:
+        print(f"  {offset}: {keyword} {categories}")
+
+    assert hits.keywords('org') == {'国务院', '全国人大', '全国人大常委会'}
+    assert hits.keywords('domestic') == {'国务院', '人大常委'}
+    assert hits.first_offset('人大常委') == 2
+    assert hits.first_offset('国务院') == 8
+    assert hits.first_offset('欧盟') == -1
+    assert not hits.has('international')
+
+
+def test_matches_substring_search():
+    """
+    测试自动机与逐个关键词的 in / find 结果一致
+    """
+    keywords = ['美国', '美国总统', '国总', '总统', '统', '联合国', '合国', '国']
+    automaton = KeywordAutomaton({'all': keywords})
+    samples = ["美国总统会见联合国秘书长", "国国国", "", "总统府", "合国美"]
+
+    for text in samples:
+        hits = automaton.scan(text)
+        for keyword in keywords:
+            assert hits.contains(keyword) == (keyword in text)
+            assert hits.first_offset(keyword) == text.find(keyword)
+    print("自动机与子串查找结果一致")
+
+
+if __name__ == "__main__":
+    test_overlapping_keywords()
+    test_matches_substring_search()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+大模型后端可用性测试脚本
+验证探测结果缓存、失败后在后台重新探测、成功结果过期后只有一个线程重新探测，
+以及强制关闭后不再探测
+"""
+
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+# 添加项目根目录到sys.path以便可以导入modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from modules.utils.llm_backend import LLMBackend
+
+
+class _TagsHandler(BaseHTTPRequestHandler):
+    requests_seen = 0
+
+    def do_GET(self):
+        _TagsHandler.requests_seen += 1
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(b'{"models": []}')
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _SlowTagsHandler(_TagsHandler):
+    def do_GET(self):
+        time.sleep(0.5)
+        super().do_GET()
+
+
+def test_cached_until_ttl():
+    """
+    测试有效期内只探测一次
+    """
+    server = HTTPServer(("127.0.0.1", 0), _TagsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        _TagsHandler.requests_seen = 0
+        backend = LLMBackend("test", f"http://127.0.0.1:{server.server_port}")
+        assert backend.is_available()
+        assert backend.is_available()
+        assert _TagsHandler.requests_seen == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_background_reprobe_after_failure():
+    """
+    测试失败结果过期后不阻塞调用方，服务恢复后由后台探测更新状态
+    """
+    server = HTTPServer(("127.0.0.1", 0), _TagsHandler)
+    port = server.server_port
+    backend = LLMBackend("test", f"http://127.0.0.1:{port}", fail_ttl=0)
+    backend.set_available(False)
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        # 过期后立即返回缓存的失败结果，同时在后台重新探测
+        assert backend.is_available() is False
+        deadline = time.monotonic() + 5
+        while not backend.is_available() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert backend.is_available()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_disable_is_sticky():
+    """
+    测试强制关闭后即使失败结果过期、服务可用，也不会重新探测并恢复
+    """
+    server = HTTPServer(("127.0.0.1", 0), _TagsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        _TagsHandler.requests_seen = 0
+        backend = LLMBackend("test", f"http://127.0.0.1:{server.server_port}", ok_ttl=0, fail_ttl=0)
+        backend.disable()
+        for _ in range(5):
+            assert backend.is_available() is False
+            time.sleep(0.05)
+        assert _TagsHandler.requests_seen == 0
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_single_refresh_when_ok_expired():
+    """
+    测试成功结果过期后只有一个线程同步重新探测，其他线程立即返回上次的结果
+    """
+    server = HTTPServer(("127.0.0.1", 0), _SlowTagsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        _TagsHandler.requests_seen = 0
+        backend = LLMBackend("test", f"http://127.0.0.1:{server.server_port}", ok_ttl=60)
+        backend.set_available(True)
+        backend.ok_ttl = 0
+
+        results = []
+        durations = []
+
+        def call():
+            started = time.monotonic()
+            results.append(backend.is_available())
+            durations.append(time.monotonic() - started)
+
+        threads = [threading.Thread(target=call) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        print(f"探测次数: {_TagsHandler.requests_seen}, 各线程耗时: {sorted(round(d, 2) for d in durations)}")
+        assert results == [True] * 8
+        assert _TagsHandler.requests_seen == 1
+        assert sum(1 for d in durations if d >= 0.4) == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    test_cached_until_ttl()
+    test_background_reprobe_after_failure()
+    test_disable_is_sticky()
+    test_single_refresh_when_ok_expired()
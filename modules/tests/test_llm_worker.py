@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+常驻摘要服务测试脚本
+用模拟的 llama.cpp 模型验证前缀状态复用和服务的请求、退出流程，
+以及随机密钥认证和只接受 JSON 请求
+"""
+
+import json
+import os
+import socket
+import stat
+import sys
+import tempfile
+import threading
+from multiprocessing.connection import Client
+# 添加项目根目录到sys.path以便可以导入modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from modules.analyzer.llm_worker import (SUMMARY_PROMPT_PREFIX, PrefixCachedSummarizer, connect_worker, load_authkey,
+                                         serve)
+
+TEST_AUTHKEY = b"test-authkey"
+
+# 服务端反序列化 pickle 时会被设置
+_unpickled = threading.Event()
+
+
+def _mark_unpickled():
+    _unpickled.set()
+
+
+class _PickledPayload:
+    def __reduce__(self):
+        return (_mark_unpickled, ())
+
+
+class FakeLlama:
+    """
+    模拟 llama_cpp.Llama：记录每次请求前恢复的状态
+    """
+
+    def __init__(self):
+        self.prompts = []
+        self.loaded_states = []
+
+    def create_chat_completion(self, messages, max_tokens, temperature=0.8):
+        prompt = messages[0]["content"]
+        self.prompts.append(prompt)
+        title = prompt[len(SUMMARY_PROMPT_PREFIX):].strip()[:4]
+        return {"choices": [{"message": {"content": "```json\n" + json.dumps({"title": title}) + "\n```"}}]}
+
+    def save_state(self):
+        return ("state", len(self.prompts))
+
+    def load_state(self, state):
+        self.loaded_states.append(state)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_prefix_state_restored_per_request():
+    """
+    测试启动时只计算一次前缀，每次摘要前恢复前缀状态
+    """
+    llm = FakeLlama()
+    summarizer = PrefixCachedSummarizer(llm)
+    assert llm.prompts == [SUMMARY_PROMPT_PREFIX]
+
+    assert summarizer.summarize("国务院召开常务会议") == {"title": "国务院召"}
+    assert summarizer.summarize("神舟飞船发射成功") == {"title": "神舟飞船"}
+    assert llm.loaded_states == [("state", 1), ("state", 1)]
+    assert all(prompt.startswith(SUMMARY_PROMPT_PREFIX) for prompt in llm.prompts)
+
+
+def _start_server():
+    port = _free_port()
+    server = threading.Thread(target=serve, args=(PrefixCachedSummarizer(FakeLlama()),),
+                              kwargs={"port": port, "authkey": TEST_AUTHKEY}, daemon=True)
+    server.start()
+
+    client = None
+    for _ in range(50):
+        client = connect_worker(port=port, authkey=TEST_AUTHKEY)
+        if client is not None:
+            break
+        threading.Event().wait(0.05)
+    assert client is not None
+    return server, port, client
+
+
+def test_serve_and_shutdown():
+    """
+    测试多个客户端同时连接，并能通过请求让服务退出
+    """
+    server, port, first = _start_server()
+    second = connect_worker(port=port, authkey=TEST_AUTHKEY)
+    assert second.summarize("秋粮收获进展顺利") == {"title": "秋粮收获"}
+    assert first.summarize("国务院召开常务会议") == {"title": "国务院召"}
+
+    second.shutdown()
+    server.join(5)
+    assert not server.is_alive()
+    first.close()
+    second.close()
+
+
+def test_rejects_wrong_key_and_pickle():
+    """
+    测试密钥不对时无法连接；通过认证的连接发送 pickle 数据也不会被反序列化
+    """
+    server, port, client = _start_server()
+    assert connect_worker(port=port, authkey=b"news_day") is None
+
+    conn = Client(("127.0.0.1", port), authkey=TEST_AUTHKEY)
+    conn.send(_PickledPayload())
+    try:
+        conn.recv_bytes()
+    except (EOFError, OSError):
+        pass
+    conn.close()
+    assert not _unpickled.is_set()
+
+    # 服务仍然正常
+    assert client.summarize("国务院召开常务会议") == {"title": "国务院召"}
+    client.shutdown()
+    server.join(5)
+    client.close()
+
+
+def test_authkey_file():
+    """
+    测试首次使用时生成随机密钥，文件只允许当前用户读写，之后读取同一个密钥
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "datas", "llm_worker.key")
+        key = load_authkey(path)
+        assert len(key) == 64
+        assert load_authkey(path) == key
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+        assert load_authkey(os.path.join(tmp_dir, "other.key")) != key
+
+
+if __name__ == "__main__":
+    test_prefix_state_restored_per_request()
+    test_serve_and_shutdown()
+    test_rejects_wrong_key_and_pickle()
+    test_authkey_file()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Ollama 流式客户端测试脚本
+验证 JSON 闭合判断、提前结束、token 上限和取消生成（包括首 token 之前取消）
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+# 添加项目根目录到sys.path以便可以导入modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from modules.utils.ollama_client import JsonCloseDetector, OllamaStreamClient
+
+# 模拟模型输出：JSON 之后还有大量多余的 token
+_OUTPUT = '{"title": "测试", "summary": "含有 } 和 \\" 的摘要"}' + "\n" * 50
+
+
+class _StreamHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.send_response(200)
+        self.end_headers()
+        try:
+            for i in range(0, len(_OUTPUT), 4):
+                self.wfile.write((json.dumps({"response": _OUTPUT[i:i + 4], "done": False}) + "\n").encode())
+                self.wfile.flush()
+            self.wfile.write((json.dumps({"response": "", "done": True}) + "\n").encode())
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    """
+    模拟加载模型：收到请求后迟迟不返回任何数据
+    """
+    release = threading.Event()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.release.wait(30)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _start_server(handler=_StreamHandler):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_json_close_detector():
+    """
+    测试字符串中的括号和转义引号不影响判断
+    """
+    detector = JsonCloseDetector()
+    assert detector.feed('{"a": "}\\"') == -1
+    assert detector.feed(' ]", "b": [1, {"c": 2}]') == -1
+    assert detector.feed('}\n\n') == 1
+
+
+def test_stop_on_json():
+    """
+    测试 JSON 闭合后立即结束，丢弃后面的 token
+    """
+    server = _start_server()
+    try:
+        client = OllamaStreamClient(f"http://127.0.0.1:{server.server_port}/api/generate")
+        content, metrics = client.generate("m", "p", stop_on_json=True)
+        print(f"输出: {content!r}, 指标: {metrics}")
+        assert json.loads(content)["summary"] == '含有 } 和 " 的摘要'
+        assert content.endswith("}")
+        assert metrics.stop_reason == "json"
+
+        content, metrics = client.generate("m", "p", max_tokens=3)
+        assert metrics.tokens == 3 and metrics.stop_reason == "max_tokens"
+        assert content == _OUTPUT[:12]
+        assert client.summary()["requests"] == 2
+
+        # 只汇总快照之后的请求
+        before = client.snapshot()
+        client.generate("m", "p", max_tokens=3)
+        since = client.summary(since=before)
+        assert since["requests"] == 1 and since["tokens"] == 3
+        assert client.summary()["requests"] == 3
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_cancel():
+    """
+    测试设置取消事件后停止读取
+    """
+    server = _start_server()
+    try:
+        client = OllamaStreamClient(f"http://127.0.0.1:{server.server_port}/api/generate")
+        cancel = threading.Event()
+        cancel.set()
+        content, metrics = client.generate("m", "p", cancel=cancel)
+        assert content == "" and metrics.stop_reason == "cancelled"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_cancel_before_first_token():
+    """
+    测试等待首 token 时取消，立即返回而不是等到读取超时
+    """
+    server = _start_server(_SlowHandler)
+    try:
+        client = OllamaStreamClient(f"http://127.0.0.1:{server.server_port}/api/generate")
+        cancel = threading.Event()
+        threading.Timer(0.2, cancel.set).start()
+        started = time.perf_counter()
+        content, metrics = client.generate("m", "p", cancel=cancel)
+        elapsed = time.perf_counter() - started
+        print(f"取消耗时: {elapsed:.3f} 秒")
+        assert content == "" and metrics.stop_reason == "cancelled"
+        assert elapsed < 2
+    finally:
+        _SlowHandler.release.set()
+        server.shutdown()
+        server.server_close()
+
+
+def test_article_fallback_does_not_wait_for_title():
+    """
+    测试正文生成失败时立即回退到默认文章，并取消仍在进行的标题生成
+    """
+    from modules.publisher import wechat_article_generator_v2 as generator
+
+    title_cancelled = threading.Event()
+
+    class FakeClient:
+        def generate(self, model, prompt, max_tokens=None, cancel=None):
+            if cancel is None:
+                raise ConnectionError("正文生成失败")
+            # 标题生成一直进行，直到被取消
+            if cancel.wait(10):
+                title_cancelled.set()
+            return "", type("Metrics", (), {"stop_reason": "cancelled"})()
+
+    news_data = {"date": "20250101",
+                 "domestic": [{"summary": {"title": "国内新闻", "summary": "摘要"}}],
+                 "international": []}
+    original_client, original_check = generator.llm_client, generator.check_ollama_connection
+    generator.llm_client = FakeClient()
+    generator.check_ollama_connection = lambda: True
+    try:
+        started = time.perf_counter()
+        title, content = generator.generate_wechat_article_with_llm(news_data)
+        elapsed = time.perf_counter() - started
+    finally:
+        generator.llm_client, generator.check_ollama_connection = original_client, original_check
+
+    print(f"回退耗时: {elapsed:.3f} 秒")
+    assert elapsed < 2
+    assert (title, content) == generator.generate_wechat_article_default(news_data)
+    assert title_cancelled.wait(2)
+
+
+if __name__ == "__main__":
+    test_json_close_detector()
+    test_stop_on_json()
+    test_cancel()
+    test_cancel_before_first_token()
+    test_article_fallback_does_not_wait_for_title()
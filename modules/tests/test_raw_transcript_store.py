@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+原始文字稿仓库测试脚本
+验证并发请求同一日期只下载一次、索引持久化后可重新加载，以及空结果不做持久化
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+# 添加项目根目录到sys.path以便可以导入modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from modules.scraper import raw_transcript_store
+from modules.scraper.raw_transcript_store import MANIFEST_NAME, RawTranscriptStore
+
+
+class _FakeFrame:
+    """
+    代替 ak.news_cctv 返回的 DataFrame，只实现仓库用到的部分
+    """
+
+    def __init__(self, records):
+        self.records = records
+        self.empty = not records
+
+    def to_dict(self, orient):
+        assert orient == 'records'
+        return [dict(record) for record in self.records]
+
+
+class _FakeNewsCctv:
+    """
+    记录下载次数的 _news_cctv 替身，每次下载耗时 delay 秒
+    """
+
+    def __init__(self, records_by_date, delay=0.0):
+        self.records_by_date = records_by_date
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, date):
+        with self._lock:
+            self.calls.append(date)
+        time.sleep(self.delay)
+        return _FakeFrame(self.records_by_date.get(date, []))
+
+
+def _records(date, count=3):
+    return [{"date": date, "title": f"标题{i}", "content": f"正文{i}"} for i in range(count)]
+
+
+def _with_fake_download(fake, test):
+    original = raw_transcript_store._news_cctv
+    raw_transcript_store._news_cctv = fake
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            test(tmp_dir)
+    finally:
+        raw_transcript_store._news_cctv = original
+
+
+def test_concurrent_requests_download_once():
+    """
+    测试多个线程同时请求同一日期时只下载一次，且都拿到相同的数据
+    """
+    fake = _FakeNewsCctv({"20250101": _records("20250101")}, delay=0.2)
+
+    def run(tmp_dir):
+        store = RawTranscriptStore(tmp_dir)
+        results = [None] * 8
+        start = threading.Barrier(len(results))
+
+        def worker(i):
+            start.wait()
+            results[i] = store.get("20250101")
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(results))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        print(f"下载次数: {len(fake.calls)}")
+        assert fake.calls == ["20250101"]
+        assert all(result == _records("20250101") for result in results)
+
+    _with_fake_download(fake, run)
+
+
+def test_manifest_persists_and_reloads():
+    """
+    测试索引写入磁盘，新建的仓库实例直接读取本地数据而不再下载
+    """
+    fake = _FakeNewsCctv({"20250101": _records("20250101"), "20250102": _records("20250102", 5)})
+
+    def run(tmp_dir):
+        store = RawTranscriptStore(tmp_dir)
+        store.get("20250101")
+        store.get("20250102")
+        assert os.path.exists(os.path.join(tmp_dir, MANIFEST_NAME))
+        assert not any(name.endswith(".tmp") for name in os.listdir(tmp_dir))
+
+        reloaded = RawTranscriptStore(tmp_dir)
+        assert reloaded.manifest["20250101"]["count"] == 3
+        assert reloaded.manifest["20250102"]["count"] == 5
+        assert reloaded.has("20250101") and reloaded.has("20250102")
+        assert reloaded.get("20250102") == _records("20250102", 5)
+        assert fake.calls == ["20250101", "20250102"]
+
+        # 索引损坏时重新建立，数据重新下载
+        with open(os.path.join(tmp_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+            f.write("{")
+        broken = RawTranscriptStore(tmp_dir)
+        assert broken.manifest == {}
+        assert broken.get("20250101") == _records("20250101")
+        assert fake.calls == ["20250101", "20250102", "20250101"]
+
+    _with_fake_download(fake, run)
+
+
+def test_empty_day_not_stored():
+    """
+    测试空结果（当天文字稿尚未发布）不写入仓库，下次请求重新下载
+    """
+    fake = _FakeNewsCctv({})
+
+    def run(tmp_dir):
+        store = RawTranscriptStore(tmp_dir)
+        assert store.get("20250103") == []
+        assert not store.has("20250103")
+        assert "20250103" not in store.manifest
+        assert not os.path.exists(os.path.join(tmp_dir, MANIFEST_NAME))
+
+        # 文字稿发布后再次请求可以拿到数据
+        fake.records_by_date["20250103"] = _records("20250103")
+        assert store.get("20250103") == _records("20250103")
+        assert fake.calls == ["20250103", "20250103"]
+        assert RawTranscriptStore(tmp_dir).has("20250103")
+
+    _with_fake_download(fake, run)
+
+
+if __name__ == "__main__":
+    test_concurrent_requests_download_once()
+    test_manifest_persists_and_reloads()
+    test_empty_day_not_stored()
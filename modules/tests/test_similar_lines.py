@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+相似行查找测试脚本
+验证 MinHash/LSH 候选过滤（短行按长度精确匹配）后的 find_similar_lines 与逐行两两比较的结果一致
+"""
+
+import os
+import random
+import sys
+from difflib import SequenceMatcher
+# 添加项目根目录到sys.path以便可以导入modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from modules.templates.template_generator import TemplateGenerator
+
+# 固定的多期数据，包含日期不同的开场白、少量改动的固定语句和很短的行
+NEWS_CONTENTS = [
+    [
+        "今天是2025年11月4日，星期二，农历九月十五。",
+        "各位观众，晚上好。",
+        "欢迎收看新闻联播节目。",
+        "国务院总理主持召开国务院常务会议",
+        "下面来看国际新闻",
+        "好",
+        "完",
+        "再见",
+        "天气预报",
+    ],
+    [
+        "今天是2025年11月5日，星期三，农历九月十六。",
+        "各位观众，晚上好！",
+        "欢迎收看新闻联播节目",
+        "全国秋粮收购进度过半",
+        "下面来看几条国际新闻",
+        "好",
+        "再会",
+        "天气预报之后",
+    ],
+    [
+        "今天是2025年11月6日，星期四，农历九月十七。",
+        "观众朋友们，晚上好。",
+        "欢迎收看今天的新闻联播节目。",
+        "下面来看国际新闻。",
+        "完",
+        "再见",
+        "天气",
+        "央视网消息：今天发布",
+    ],
+    [
+        "今天是2025年12月16日，星期二，农历十月廿七。",
+        "各位观众，晚上好。",
+        "国际新闻",
+        "再见了",
+        "央视网消息：今日发布",
+    ],
+]
+
+
+def _brute_force(news_contents, similarity_threshold):
+    """
+    参考实现：所有行两两比较（预筛选之前的做法）
+    """
+    similar_groups = []
+    processed = set()
+    for i, content1 in enumerate(news_contents):
+        for line1 in content1:
+            if line1 in processed:
+                continue
+            similar_lines = [line1]
+            for j, content2 in enumerate(news_contents):
+                if i == j:
+                    continue
+                for line2 in content2:
+                    if SequenceMatcher(None, line1, line2).ratio() >= similarity_threshold:
+                        similar_lines.append(line2)
+            unique_lines = list(dict.fromkeys(similar_lines))
+            if len(unique_lines) > 1:
+                similar_groups.append(unique_lines)
+                processed.update(unique_lines)
+    similar_groups.sort(key=len, reverse=True)
+    return similar_groups
+
+
+def test_same_groups_as_brute_force():
+    """
+    测试调用方使用的 0.8 和 0.9 阈值下，分组（包括组内顺序和组的顺序）与两两比较一致
+    """
+    generator = TemplateGenerator()
+    for threshold in (0.8, 0.9):
+        expected = _brute_force(NEWS_CONTENTS, threshold)
+        groups = generator.find_similar_lines(NEWS_CONTENTS, threshold)
+        print(f"阈值 {threshold}: {[group['lines'] for group in groups]}")
+        assert [group['lines'] for group in groups] == expected
+        for group in groups:
+            assert group['count'] == len(group['lines'])
+            assert group['frequency'] == group['count'] / len(NEWS_CONTENTS)
+
+
+def test_short_lines():
+    """
+    测试一两个字的短行（如“好”“完”“再见”）和空行的分组不变
+    """
+    generator = TemplateGenerator()
+    short_contents = [[line for line in content if len(line) <= 3] + [""] for content in NEWS_CONTENTS]
+    for threshold in (0.5, 0.8, 0.9):
+        expected = _brute_force(short_contents, threshold)
+        groups = generator.find_similar_lines(short_contents, threshold)
+        print(f"短行 阈值 {threshold}: {[group['lines'] for group in groups]}")
+        assert [group['lines'] for group in groups] == expected
+
+
+def test_random_corpus():
+    """
+    测试随机生成的多期数据（在若干句子上随机增删改字）与两两比较一致
+    """
+    rng = random.Random(0)
+    alphabet = "新闻联播今天国务院会议观众晚上好国际合作发展经济"
+    bases = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 20))) for _ in range(30)]
+
+    def mutate(line):
+        chars = list(line)
+        for _ in range(rng.randint(0, 3)):
+            op = rng.randrange(3)
+            pos = rng.randrange(len(chars) + 1)
+            if op == 0:
+                chars.insert(pos, rng.choice(alphabet))
+            elif chars and pos < len(chars):
+                if op == 1:
+                    del chars[pos]
+                else:
+                    chars[pos] = rng.choice(alphabet)
+        return "".join(chars)
+
+    news_contents = [[mutate(rng.choice(bases)) for _ in range(25)] for _ in range(6)]
+    generator = TemplateGenerator()
+    for threshold in (0.6, 0.8, 0.9):
+        expected = _brute_force(news_contents, threshold)
+        groups = generator.find_similar_lines(news_contents, threshold)
+        print(f"随机数据 阈值 {threshold}: {len(groups)} 组")
+        assert [group['lines'] for group in groups] == expected
+
+
+if __name__ == "__main__":
+    test_same_groups_as_brute_force()
+    test_short_lines()
+    test_random_corpus()
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+启动导入测试脚本
+验证只读取本地数据的命令不会在导入时加载 akshare / pandas
+"""
+
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def test_entry_modules_skip_heavy_imports():
+    """
+    测试导入主流程和发布模块后 akshare、pandas 均未被加载
+    """
+    code = (
+        "import sys, main, generate_news_html, modules.publisher.wechat_article_generator_v2; "
+        "print(','.join(m for m in ('akshare', 'pandas') if m in sys.modules))"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT,
+                          capture_output=True, text=True, check=True)
+    print(f"已加载的重量级依赖: {proc.stdout.strip() or '无'}")
+    assert proc.stdout.strip() == ""
+
+
+if __name__ == "__main__":
+    test_entry_modules_skip_heavy_imports()
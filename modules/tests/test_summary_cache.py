@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+摘要缓存测试脚本
+验证缓存键规范化、命中统计和按大小淘汰
+"""
+
+import os
+import sys
+import tempfile
+# 添加项目根目录到sys.path以便可以导入modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from modules.utils.summary_cache import SummaryCache
+
+
+def test_hit_and_miss():
+    """
+    测试相同文本（忽略空白差异）命中，模型或提示词版本不同则未命中
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = SummaryCache(os.path.join(tmp_dir, "cache.sqlite3"))
+        summary = {"title": "测试", "summary": "摘要", "keywords": [], "category": "domestic"}
+        cache.put("国务院召开常务会议", "qwen2:7b", 1, summary)
+
+        assert cache.get("  国务院召开常务会议\n", "qwen2:7b", 1) == summary
+        assert cache.get("国务院召开常务会议", "qwen2:7b", 2) is None
+        assert cache.get("国务院召开常务会议", "other-model", 1) is None
+
+        stats = cache.stats()
+        print(f"缓存统计: {stats}")
+        assert stats["hits"] == 1
+        assert stats["misses"] == 2
+        cache.close()
+
+
+def test_lru_eviction():
+    """
+    测试超过容量上限时淘汰最久未使用的条目
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = SummaryCache(os.path.join(tmp_dir, "cache.sqlite3"), max_bytes=250)
+        for i in range(3):
+            cache.put(f"新闻{i}", "m", 1, {"summary": "内容" * 10})
+        # 访问最早的条目，使其成为最近使用
+        assert cache.get("新闻0", "m", 1) is not None
+        cache.put("新闻3", "m", 1, {"summary": "内容" * 10})
+
+        assert cache.stats()["bytes"] <= 250
+        assert cache.get("新闻0", "m", 1) is not None
+        assert cache.get("新闻1", "m", 1) is None
+        cache.close()
+
+
+if __name__ == "__main__":
+    test_hit_and_miss()
+    test_lru_eviction()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+HTML 模板引擎测试脚本
+验证模板编译、逐段写入文件，以及批量渲染一年的每日页面的耗时
+"""
+
+import glob
+import json
+import os
+import sys
+import tempfile
+import time
+# 添加项目根目录到sys.path以便可以导入modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import generate_news_html
+from modules.publisher.template_engine import Template, compile_template
+
+
+def test_template_compile():
+    """
+    测试字段替换、花括号转义、格式说明，以及非法字段在编译时报错
+    """
+    template = compile_template("body {{ color: red; }} <p>{index:02d}. {title}</p>")
+    assert template is compile_template("body {{ color: red; }} <p>{index:02d}. {title}</p>")
+    assert template.fields == ("index", "title")
+    assert template.render(index=3, title="标题") == "body { color: red; } <p>03. 标题</p>"
+    try:
+        Template("{item.title}")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("非名称字段应在编译时抛出 ValueError")
+
+
+def test_write_matches_render():
+    """
+    测试逐段写入文件的内容与渲染出的字符串一致
+    """
+    news_files = sorted(glob.glob(os.path.join(PROJECT_ROOT, "datas", "full_result_*.json")))
+    if not news_files:
+        print("没有 full_result_*.json，跳过")
+        return
+    with open(news_files[0], 'r', encoding='utf-8') as f:
+        news_data = json.load(f)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = generate_news_html.write_html(news_data, os.path.join(tmp_dir, "page.html"))
+        with open(file_path, 'r', encoding='utf-8') as f:
+            assert f.read() == generate_news_html.generate_html(news_data)
+
+
+def test_render_a_year_of_pages():
+    """
+    测试渲染 365 天的每日页面（每天 30 条不同的新闻）在数秒内完成
+    """
+    days = []
+    for day in range(365):
+        days.append({
+            "date": f"2025{day // 31 % 12 + 1:02d}{day % 28 + 1:02d}",
+            "domestic": [{"summary": {"title": f"第{day}天国内新闻{i}", "summary": "国内摘要" * 20,
+                                      "keywords": ["经济", "民生"]}} for i in range(20)],
+            "international": [{"summary": {"title": f"第{day}天国际新闻{i}", "summary": "国际摘要" * 20,
+                                           "keywords": []}} for i in range(10)],
+        })
+
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for index, news_data in enumerate(days):
+            generate_news_html.write_html(news_data, os.path.join(tmp_dir, f"{index}.html"))
+    seconds = time.perf_counter() - start
+    print(f"渲染 365 个页面耗时 {seconds:.2f} 秒")
+    assert seconds < 10
+
+
+if __name__ == "__main__":
+    test_template_compile()
+    test_write_matches_render()
+    test_render_a_year_of_pages()
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+微信接口客户端测试脚本
+使用本地模拟服务验证 access_token 文件缓存、提前刷新和令牌失效后的重试，
+以及封面素材按内容哈希复用、多篇文章合并为一个草稿、HTTP 错误时抛出 WeChatAPIError
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+# 添加项目根目录到sys.path以便可以导入modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from modules.publisher.wechat_api import MAX_DRAFT_ARTICLES, AccessTokenProvider, WeChatAPIClient, WeChatAPIError
+from modules.publisher.wechat_media_cache import MediaCache, file_sha1
+from modules.publisher.wechat_publisher import WeChatPublisher
+
+
+class _FakeWeChat:
+    """
+    模拟微信接口：记录令牌请求次数和上传次数，可让当前令牌或素材失效
+    """
+
+    def __init__(self, expires_in=7200):
+        self.expires_in = expires_in
+        self.token_requests = 0
+        self.valid_tokens = set()
+        self.drafts = []
+        self.uploads = 0
+        self.materials = set()
+        # 不为 None 时所有 POST 请求返回该状态码和 HTML 错误页（模拟网关故障）
+        self.error_status = None
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, data):
+                body = json.dumps(data).encode()
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path.endswith("/token"):
+                    fake.token_requests += 1
+                    token = f"token-{fake.token_requests}"
+                    fake.valid_tokens.add(token)
+                    self._reply({"access_token": token, "expires_in": fake.expires_in})
+                else:
+                    self._reply({"errcode": 404})
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                if fake.error_status is not None:
+                    page = b"<html><body>502 Bad Gateway</body></html>"
+                    self.send_response(fake.error_status)
+                    self.send_header("Content-Type", "text/html")
+                    self.send_header("Content-Length", str(len(page)))
+                    self.end_headers()
+                    self.wfile.write(page)
+                    return
+                token = parse_qs(url.query).get("access_token", [""])[0]
+                if token not in fake.valid_tokens:
+                    self._reply({"errcode": 40001, "errmsg": "invalid credential"})
+                    return
+                if url.path.endswith("/material/add_material"):
+                    fake.uploads += 1
+                    media_id = f"material-{fake.uploads}"
+                    fake.materials.add(media_id)
+                    self._reply({"media_id": media_id, "url": "http://example.com/cover.png"})
+                    return
+                if url.path.endswith("/freepublish/submit"):
+                    self._reply({"errcode": 0, "publish_id": "publish-1"})
+                    return
+                draft = json.loads(body)
+                for article in draft["articles"]:
+                    if article.get("thumb_media_id", "thumb") not in fake.materials | {"thumb"}:
+                        self._reply({"errcode": 40007, "errmsg": "invalid media_id"})
+                        return
+                fake.drafts.append(draft)
+                self._reply({"media_id": f"draft-{len(fake.drafts)}"})
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}/cgi-bin"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+
+def test_token_cached_across_runs():
+    """
+    测试令牌写入缓存文件，新的发布器实例（模拟再次运行脚本）不再请求令牌
+    """
+    fake = _FakeWeChat()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = os.path.join(tmp_dir, "token.json")
+        for _ in range(3):
+            publisher = WeChatPublisher("app", "secret", token_cache=cache_path, base_url=fake.base_url)
+            assert publisher.create_draft("标题", "<p>内容</p>", "thumb").startswith("draft-")
+        print(f"令牌请求次数: {fake.token_requests}")
+        assert fake.token_requests == 1
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            assert json.load(f)["app"]["access_token"] == "token-1"
+        assert fake.drafts[0]["articles"][0]["title"] == "标题"
+    fake.server.shutdown()
+
+
+def test_refresh_before_expiry_and_retry():
+    """
+    测试即将过期的令牌提前刷新，以及接口返回 40001 时刷新令牌并重试一次
+    """
+    fake = _FakeWeChat(expires_in=200)
+    provider = AccessTokenProvider("app", "secret", cache_path=None, base_url=fake.base_url,
+                                   refresh_margin=300)
+    assert provider.get_token() == "token-1"
+    # 有效期短于提前刷新的时间，每次都会刷新
+    assert provider.get_token() == "token-2"
+
+    provider.refresh_margin = 0
+    client = WeChatAPIClient(provider, base_url=fake.base_url)
+    fake.valid_tokens.clear()
+    result = client.post_json("/draft/add", {"articles": []})
+    print(f"重试后的结果: {result}, 令牌请求次数: {fake.token_requests}")
+    assert result == {"media_id": "draft-1"}
+    assert fake.token_requests == 3
+
+    # 重试一次后仍然失败时返回错误，不再继续重试
+    fake.valid_tokens.clear()
+    original_fetch = provider._fetch
+
+    def fetch_invalid():
+        original_fetch()
+        fake.valid_tokens.clear()
+
+    provider._fetch = fetch_invalid
+    assert client.post_json("/draft/add", {"articles": []})["errcode"] == 40001
+    assert fake.token_requests == 4
+    fake.server.shutdown()
+
+
+def test_cover_media_id_reused():
+    """
+    测试同一张封面只上传一次；素材在公众号后台被删除后删除缓存记录并重新上传
+    """
+    fake = _FakeWeChat()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cover_path = os.path.join(tmp_dir, "cover.png")
+        with open(cover_path, "wb") as f:
+            f.write(b"\x89PNG" + os.urandom(1024))
+        media_cache_path = os.path.join(tmp_dir, "media.json")
+
+        def new_publisher():
+            return WeChatPublisher("app", "secret", token_cache=None, base_url=fake.base_url,
+                                   media_cache=MediaCache(media_cache_path))
+
+        for _ in range(3):
+            new_publisher().publish_article("标题", "<p>内容</p>", cover_path)
+        print(f"发布 3 次的上传次数: {fake.uploads}")
+        assert fake.uploads == 1
+
+        fake.materials.clear()
+        result = new_publisher().publish_article("标题", "<p>内容</p>", cover_path)
+        assert fake.uploads == 2
+        assert result["thumb_media_id"] == "material-2"
+        assert new_publisher().upload_image_cached(cover_path) == "material-2"
+
+        # 重新上传失败时失效的记录已被删除，不会在下次发布时再次使用
+        fake.materials.clear()
+        publisher = new_publisher()
+        stale_media_id = publisher.upload_image_cached(cover_path)
+
+        def failing_upload(image_path):
+            raise WeChatAPIError("上传图片失败", {"errcode": 45009, "errmsg": "reach max api daily quota limit"})
+
+        publisher.upload_image = failing_upload
+        try:
+            publisher.create_drafts_with_cover([("标题", "<p>内容</p>")], stale_media_id, cover_path)
+            assert False, "重新上传失败时应抛出异常"
+        except WeChatAPIError as e:
+            assert e.errcode == 45009
+        assert MediaCache(media_cache_path).get("app", file_sha1(cover_path)) is None
+        new_publisher().publish_article("标题", "<p>内容</p>", cover_path)
+        assert fake.uploads == 3
+
+        # 换一张封面时重新上传
+        with open(cover_path, "ab") as f:
+            f.write(b"changed")
+        new_publisher().publish_article("标题", "<p>内容</p>", cover_path)
+        assert fake.uploads == 4
+    fake.server.shutdown()
+
+
+def test_draft_batch():
+    """
+    测试国内、国际两篇文章一次创建为一个草稿并共用封面；超过 8 篇时拆分为多个草稿
+    """
+    from modules.publisher.wechat_article_generator_v2 import generate_digest_articles
+
+    fake = _FakeWeChat()
+    news_data = {
+        "date": "20250101",
+        "domestic": [{"summary": {"title": "国内新闻", "summary": "摘要", "keywords": ["经济"]}}],
+        "international": [{"summary": {"title": "国际新闻", "summary": "摘要", "keywords": ["合作"]}}],
+    }
+    articles = generate_digest_articles(news_data)
+    assert [title for title, _ in articles] == ["【新闻联播每日精读】2025年01月01日：国内要闻",
+                                                "【新闻联播每日精读】2025年01月01日：国际动态"]
+    assert "国际新闻" not in articles[0][1] and "国际新闻" in articles[1][1]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cover_path = os.path.join(tmp_dir, "cover.png")
+        with open(cover_path, "wb") as f:
+            f.write(b"\x89PNG" + os.urandom(1024))
+        publisher = WeChatPublisher("app", "secret", token_cache=None, base_url=fake.base_url,
+                                    media_cache=MediaCache(None))
+
+        result = publisher.publish_articles(articles, cover_path)
+        print(f"2 篇文章: 草稿 {result['draft_media_ids']}, 上传次数 {fake.uploads}")
+        assert result["draft_media_ids"] == ["draft-1"]
+        assert fake.uploads == 1
+        assert [article["thumb_media_id"] for article in fake.drafts[0]["articles"]] == ["material-1"] * 2
+
+        # 素材失效时重新上传，整批重试
+        fake.materials.clear()
+        result = publisher.publish_articles(articles, cover_path)
+        assert fake.uploads == 2
+        assert result["thumb_media_id"] == "material-2"
+
+        batch = [(f"标题{i}", "<p>内容</p>", "thumb") for i in range(MAX_DRAFT_ARTICLES + 1)]
+        fake.drafts.clear()
+        media_ids = publisher.create_draft_batch(batch)
+        print(f"{len(batch)} 篇文章: 草稿 {media_ids}")
+        assert len(media_ids) == 2
+        assert [len(draft["articles"]) for draft in fake.drafts] == [MAX_DRAFT_ARTICLES, 1]
+    fake.server.shutdown()
+
+
+def test_async_draft_shares_cover_retry():
+    """
+    测试异步发布器创建草稿时复用 WeChatPublisher 的封面重传逻辑：缓存的素材失效后重新上传并重试
+    """
+    import asyncio
+    from modules.publisher.async_publisher import AsyncWeChatPublisher, PublishLog
+
+    fake = _FakeWeChat()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cover_path = os.path.join(tmp_dir, "cover.png")
+        with open(cover_path, "wb") as f:
+            f.write(b"\x89PNG" + os.urandom(1024))
+        publisher = WeChatPublisher("app", "secret", token_cache=None, base_url=fake.base_url,
+                                    media_cache=MediaCache(None), prepare_images=False)
+        async_publisher = AsyncWeChatPublisher(publisher, PublishLog(os.path.join(tmp_dir, "log.json")))
+
+        thumb_media_id = publisher.upload_image_cached(cover_path)
+        fake.materials.clear()
+        draft_media_id, thumb_media_id = asyncio.run(
+            async_publisher._create_draft("标题", "<p>内容</p>", thumb_media_id, cover_path))
+        print(f"重传后的封面: {thumb_media_id}, 草稿: {draft_media_id}")
+        assert (draft_media_id, thumb_media_id) == ("draft-1", "material-2")
+        assert fake.uploads == 2
+    fake.server.shutdown()
+
+
+def test_http_error():
+    """
+    测试接口返回 5xx 和 HTML 错误页时抛出带状态码的 WeChatAPIError，而不是 JSON 解析的 ValueError
+    """
+    fake = _FakeWeChat()
+    provider = AccessTokenProvider("app", "secret", cache_path=None, base_url=fake.base_url)
+    client = WeChatAPIClient(provider, base_url=fake.base_url)
+    for status in (502, 200):
+        fake.error_status = status
+        try:
+            client.post_json("/draft/add", {"articles": []})
+        except WeChatAPIError as e:
+            print(f"HTTP {status}: {e}")
+            assert e.status == status
+            assert "502 Bad Gateway" in e.data["body"]
+        else:
+            raise AssertionError("应抛出 WeChatAPIError")
+
+    fake.error_status = None
+    assert client.post_json("/draft/add", {"articles": []}) == {"media_id": "draft-1"}
+    fake.server.shutdown()
+
+
+if __name__ == "__main__":
+    test_token_cached_across_runs()
+    test_refresh_before_expiry_and_retry()
+    test_cover_media_id_reused()
+    test_draft_batch()
+    test_async_draft_shares_cover_retry()
+    test_http_error()
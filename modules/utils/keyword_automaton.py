@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多模式关键词匹配自动机（Aho-Corasick）
+将多张关键词表一次性编译，单次线性扫描即可得到全部命中（关键词、类别、位置）
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+class KeywordHits:
+    """
+    一段文本的关键词命中结果
+    所有分类、实体识别、摘要逻辑共用同一份命中列表，避免重复扫描文本
+    """
+
+    def __init__(self, hits: List[Tuple[int, str, Tuple[str, ...]]]):
+        # 命中列表，元素为 (起始位置, 关键词, 所属类别)，按结束位置排序
+        self.hits = hits
+        self._first_offsets: Dict[str, int] = {}
+        self._by_category: Dict[str, Set[str]] = {}
+
+        for offset, keyword, categories in hits:
+            if keyword not in self._first_offsets or offset < self._first_offsets[keyword]:
+                self._first_offsets[keyword] = offset
+            for category in categories:
+                self._by_category.setdefault(category, set()).add(keyword)
+
+    def has(self, category: str) -> bool:
+        """
+        是否命中了指定类别中的任一关键词
+        """
+        return bool(self._by_category.get(category))
+
+    def keywords(self, category: str) -> Set[str]:
+        """
+        获取指定类别中命中的关键词集合
+        """
+        return self._by_category.get(category, set())
+
+    def contains(self, keyword: str) -> bool:
+        """
+        文本中是否出现了指定关键词（等价于 keyword in text）
+        """
+        return keyword in self._first_offsets
+
+    def first_offset(self, keyword: str) -> int:
+        """
+        关键词首次出现的位置（等价于 text.find(keyword)），未出现返回 -1
+        """
+        return self._first_offsets.get(keyword, -1)
+
+    def __len__(self) -> int:
+        return len(self.hits)
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick 关键词自动机
+    在初始化时由 {类别: 关键词列表} 构建，之后每段文本只需扫描一次
+    """
+
+    def __init__(self, tables: Dict[str, Iterable[str]]):
+        """
+        Args:
+            tables (dict): 类别名到关键词列表的映射，同一关键词可属于多个类别
+        """
+        # 状态转移表、失败指针、每个状态的输出（关键词列表）
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[str]] = [[]]
+        # 关键词到类别的映射
+        self._categories: Dict[str, Tuple[str, ...]] = {}
+
+        keyword_categories: Dict[str, List[str]] = {}
+        for category, keywords in tables.items():
+            for keyword in keywords:
+                if not keyword:
+                    continue
+                names = keyword_categories.setdefault(keyword, [])
+                if category not in names:
+                    names.append(category)
+
+        for keyword, names in keyword_categories.items():
+            self._categories[keyword] = tuple(names)
+            self._add_keyword(keyword)
+
+        self._build_fail_links()
+
+    def _add_keyword(self, keyword: str):
+        """
+        将关键词插入字典树
+        """
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state].append(keyword)
+
+    def _build_fail_links(self):
+        """
+        广度优先构建失败指针，并合并后缀状态的输出
+        """
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find_all(self, text: str) -> List[Tuple[int, str, Tuple[str, ...]]]:
+        """
+        单次线性扫描文本，返回全部命中（包括相互重叠的关键词）
+
+        Returns:
+            list: (起始位置, 关键词, 所属类别) 列表
+        """
+        hits = []
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        categories = self._categories
+
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for keyword in output[state]:
+                hits.append((index - len(keyword) + 1, keyword, categories[keyword]))
+        return hits
+
+    def scan(self, text: str) -> KeywordHits:
+        """
+        扫描文本并返回可供查询的命中结果
+        """
+        return KeywordHits(self.find_all(text))
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+大模型后端可用性登记
+不再在导入时探测 Ollama：首次需要时才探测一次并按 TTL 缓存结果，
+探测失败后在后台线程中重新探测，调用方不会因此阻塞
+"""
+
+import threading
+import time
+
+import requests
+
+from modules.utils.pipeline_logger import get_logger
+
+# 默认的 Ollama 服务地址
+OLLAMA_BASE_URL = "http://localhost:11434"
+
+# 探测超时（秒）
+DEFAULT_PROBE_TIMEOUT = 2
+
+# 探测成功、失败后结果的有效期（秒）
+DEFAULT_OK_TTL = 300
+DEFAULT_FAIL_TTL = 30
+
+logger = get_logger()
+
+
+class LLMBackend:
+    """
+    单个大模型服务的可用性状态
+    首次调用 is_available 时同步探测；成功状态过期后由一个调用方同步重新探测，
+    其他线程在此期间沿用上次的结果；失败状态则先返回缓存结果并在后台重新探测。
+    调用 disable() 后不再探测，始终不可用
+    """
+
+    def __init__(self, name, base_url, probe_path="/api/tags", probe_timeout=DEFAULT_PROBE_TIMEOUT,
+                 ok_ttl=DEFAULT_OK_TTL, fail_ttl=DEFAULT_FAIL_TTL):
+        """
+        Args:
+            name (str): 后端名称
+            base_url (str): 服务地址
+            probe_path (str): 用于探测的接口路径
+            probe_timeout (float): 探测超时（秒）
+            ok_ttl (float): 探测成功后结果的有效期（秒）
+            fail_ttl (float): 探测失败后结果的有效期（秒）
+        """
+        self.name = name
+        self.base_url = base_url.rstrip('/')
+        self.probe_url = self.base_url + probe_path
+        self.probe_timeout = probe_timeout
+        self.ok_ttl = ok_ttl
+        self.fail_ttl = fail_ttl
+
+        self._lock = threading.Lock()
+        self._available = None
+        self._checked_at = 0.0
+        self._background = None
+        self._refreshing = False
+        self._disabled = False
+
+    def _probe(self):
+        """
+        实际请求一次服务并更新状态
+        """
+        try:
+            response = requests.get(self.probe_url, timeout=self.probe_timeout)
+            available = response.status_code == 200
+        except requests.RequestException:
+            available = False
+
+        with self._lock:
+            changed = available != self._available
+            self._available = available
+            self._checked_at = time.monotonic()
+
+        if changed:
+            if available:
+                logger.info(f"{self.name} 服务可用，将使用大模型")
+            else:
+                logger.info(f"提示: 无法连接到 {self.name}，将使用简化版功能")
+        return available
+
+    def _probe_in_background(self):
+        """
+        启动后台重新探测（同一时间最多一个）
+        """
+        with self._lock:
+            if self._background is not None and self._background.is_alive():
+                return
+            self._background = threading.Thread(target=self._probe, name=f"{self.name}-probe", daemon=True)
+            self._background.start()
+
+    def is_available(self):
+        """
+        服务是否可用
+        """
+        with self._lock:
+            if self._disabled:
+                return False
+            available = self._available
+            age = time.monotonic() - self._checked_at
+            # 成功状态过期时只让一个线程重新探测
+            refresh = bool(available) and age >= self.ok_ttl and not self._refreshing
+            if refresh:
+                self._refreshing = True
+
+        if available is None:
+            return self._probe()
+        if available:
+            if not refresh:
+                return True
+            try:
+                return self._probe()
+            finally:
+                with self._lock:
+                    self._refreshing = False
+        if age >= self.fail_ttl:
+            self._probe_in_background()
+        return False
+
+    def set_available(self, available):
+        """
+        直接指定可用性（用于测试）；结果过期后仍会重新探测，强制关闭请使用 disable()
+        """
+        with self._lock:
+            self._available = available
+            self._checked_at = time.monotonic()
+
+    def disable(self):
+        """
+        强制关闭（命令行 --no-llm）：之后不再探测，is_available 始终返回 False
+        """
+        with self._lock:
+            self._disabled = True
+            self._available = False
+
+    def invalidate(self):
+        """
+        清除缓存结果，下次调用时重新探测
+        """
+        with self._lock:
+            self._available = None
+            self._checked_at = 0.0
+
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def register_backend(name, base_url, **kwargs):
+    """
+    登记一个大模型后端，同名后端会被替换
+
+    Returns:
+        LLMBackend: 登记的后端
+    """
+    backend = LLMBackend(name, base_url, **kwargs)
+    with _backends_lock:
+        _backends[name] = backend
+    return backend
+
+
+def get_backend(name="Ollama"):
+    """
+    获取已登记的后端，默认的 Ollama 后端在首次获取时登记
+    """
+    with _backends_lock:
+        backend = _backends.get(name)
+        if backend is None and name == "Ollama":
+            backend = _backends[name] = LLMBackend(name, OLLAMA_BASE_URL)
+    if backend is None:
+        raise KeyError(f"未登记的大模型后端: {name}")
+    return backend
+
+
+def is_llm_available(name="Ollama"):
+    """
+    指定后端当前是否可用（首次调用时才会探测）
+    """
+    return get_backend(name).is_available()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ollama 流式生成客户端
+逐块读取 /api/generate 的流式输出：JSON 对象或数组闭合后立即断开连接（Ollama 随之停止生成），
+超过 token 上限也会提前结束；每次请求记录首 token 延迟和生成速度
+"""
+
+import json
+import threading
+import time
+from collections import namedtuple
+
+import requests
+
+from modules.utils.llm_backend import OLLAMA_BASE_URL
+from modules.utils.pipeline_logger import get_logger
+
+# 默认的生成接口地址
+OLLAMA_GENERATE_URL = OLLAMA_BASE_URL + "/api/generate"
+
+# 连接超时和两次数据块之间的最长等待（秒）；流式读取时不再需要为整段生成设置超时
+DEFAULT_TIMEOUT = (5, 60)
+
+# 带取消事件的请求检查取消的间隔（秒）
+CANCEL_POLL_INTERVAL = 0.05
+
+# 单次生成的指标
+GenerationMetrics = namedtuple('GenerationMetrics', [
+    'ttft',               # 首 token 延迟（秒）
+    'seconds',            # 总耗时（秒）
+    'tokens',             # 生成的 token 数
+    'tokens_per_second',  # 生成速度（不含首 token 之前的时间）
+    'prompt_tokens',      # 提示词 token 数（提前结束时 Ollama 不返回，为 None）
+    'stop_reason',        # done / json / max_tokens
+])
+
+logger = get_logger()
+
+
+class JsonCloseDetector:
+    """
+    增量判断输出的 JSON 顶层对象或数组是否已经闭合
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, chunk):
+        """
+        读入一段输出
+
+        Returns:
+            int: 顶层 JSON 闭合时返回闭合字符之后在 chunk 中的位置，否则返回 -1
+        """
+        for index, char in enumerate(chunk):
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char in '{[':
+                self.depth += 1
+                self.started = True
+            elif char in '}]':
+                self.depth -= 1
+                if self.started and self.depth == 0:
+                    return index + 1
+        return -1
+
+
+class OllamaStreamClient:
+    """
+    流式调用 Ollama，并汇总各次请求的指标
+    """
+
+    def __init__(self, generate_url=OLLAMA_GENERATE_URL, session=None, timeout=DEFAULT_TIMEOUT):
+        """
+        Args:
+            generate_url (str): 生成接口地址
+            session (requests.Session): 可选，复用连接的会话
+            timeout: requests 的超时设置（连接超时, 读取超时）
+        """
+        self.generate_url = generate_url
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self.totals = {"requests": 0, "tokens": 0, "seconds": 0.0, "ttft": 0.0, "stopped_early": 0}
+
+    def generate(self, model, prompt, max_tokens=None, stop_on_json=False, format=None, options=None,
+                 cancel=None):
+        """
+        流式生成文本
+
+        Args:
+            model (str): 模型名称
+            prompt (str): 提示词
+            max_tokens (int): 最多生成的 token 数，同时作为 num_predict 传给 Ollama
+            stop_on_json (bool): 顶层 JSON 闭合后立即结束
+            format (str): 输出格式，如 "json"
+            options (dict): 其他 Ollama 选项
+            cancel (threading.Event): 可选，设置后立即返回并断开连接，等待首 token 时同样有效（结束原因为 cancelled）
+
+        Returns:
+            tuple: (生成的文本, GenerationMetrics)
+
+        Raises:
+            requests.RequestException: 请求失败或读取超时
+        """
+        options = dict(options or {})
+        if max_tokens is not None:
+            options.setdefault("num_predict", max_tokens)
+        payload = {"model": model, "prompt": prompt, "stream": True}
+        if format:
+            payload["format"] = format
+        if options:
+            payload["options"] = options
+
+        detector = JsonCloseDetector() if stop_on_json else None
+        state = {"pieces": [], "tokens": 0, "ttft": None, "final": {}, "stop_reason": "done",
+                 "response": None, "error": None}
+        started = time.perf_counter()
+
+        if cancel is None:
+            self._read_stream(payload, max_tokens, detector, None, state, started)
+        else:
+            # 在守护线程中读取，调用方定期检查取消事件：取消后从这一侧关闭响应并立即返回，
+            # 不必等到下一块数据或读取超时（模型加载、首 token 之前都可能长时间没有数据），
+            # 仍在等待的读取线程也不会拖住进程退出
+            reader = threading.Thread(target=self._read_stream,
+                                      args=(payload, max_tokens, detector, cancel, state, started),
+                                      daemon=True)
+            reader.start()
+            while True:
+                reader.join(CANCEL_POLL_INTERVAL)
+                if not reader.is_alive():
+                    break
+                if cancel.is_set():
+                    state["stop_reason"] = "cancelled"
+                    response = state["response"]
+                    if response is not None:
+                        response.close()
+                    break
+            if state["stop_reason"] != "cancelled" and state["error"] is not None:
+                raise state["error"]
+
+        seconds = time.perf_counter() - started
+        metrics = self._metrics(state["final"], state["ttft"], seconds, state["tokens"], state["stop_reason"])
+        self._record(metrics)
+        return "".join(list(state["pieces"])), metrics
+
+    def _read_stream(self, payload, max_tokens, detector, cancel, state, started):
+        """
+        发送请求并逐行读取流式输出，结果写入 state；设置了取消事件时异常记录在 state["error"] 中
+        """
+        try:
+            if cancel is not None and cancel.is_set():
+                state["stop_reason"] = "cancelled"
+                return
+            response = self.session.post(self.generate_url, json=payload, stream=True, timeout=self.timeout)
+            state["response"] = response
+        except Exception as e:
+            if cancel is None:
+                raise
+            state["error"] = e
+            return
+
+        pieces = state["pieces"]
+        try:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if cancel is not None and cancel.is_set():
+                    state["stop_reason"] = "cancelled"
+                    break
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if "error" in chunk:
+                    raise requests.RequestException(f"Ollama 返回错误: {chunk['error']}")
+                piece = chunk.get("response", "")
+                if piece:
+                    if state["ttft"] is None:
+                        state["ttft"] = time.perf_counter() - started
+                    state["tokens"] += 1
+                    if detector is not None:
+                        end = detector.feed(piece)
+                        if end >= 0:
+                            pieces.append(piece[:end])
+                            state["stop_reason"] = "json"
+                            break
+                    pieces.append(piece)
+                    if max_tokens is not None and state["tokens"] >= max_tokens:
+                        state["stop_reason"] = "max_tokens"
+                        break
+                if chunk.get("done"):
+                    state["final"] = chunk
+                    break
+        except Exception as e:
+            if cancel is None:
+                raise
+            # 取消时从另一侧关闭响应会使读取出错，忽略即可
+            if not cancel.is_set():
+                state["error"] = e
+        finally:
+            # 提前结束时关闭连接，Ollama 检测到断开后停止生成
+            response.close()
+
+    @staticmethod
+    def _metrics(final, ttft, seconds, tokens, stop_reason):
+        """
+        优先使用 Ollama 在最后一块中返回的计数和耗时
+        """
+        ttft = seconds if ttft is None else ttft
+        eval_count = final.get("eval_count")
+        eval_duration = final.get("eval_duration")
+        if eval_count and eval_duration:
+            tokens = eval_count
+            tokens_per_second = eval_count / (eval_duration / 1e9)
+        else:
+            generating = seconds - ttft
+            tokens_per_second = (tokens - 1) / generating if tokens > 1 and generating > 0 else 0.0
+        return GenerationMetrics(ttft, seconds, tokens, tokens_per_second,
+                                 final.get("prompt_eval_count"), stop_reason)
+
+    def _record(self, metrics):
+        with self._lock:
+            self.totals["requests"] += 1
+            self.totals["tokens"] += metrics.tokens
+            self.totals["seconds"] += metrics.seconds
+            self.totals["ttft"] += metrics.ttft
+            if metrics.stop_reason != "done":
+                self.totals["stopped_early"] += 1
+        logger.debug(
+            f"  大模型: 首 token {metrics.ttft:.2f} 秒, {metrics.tokens} tokens, "
+            f"{metrics.tokens_per_second:.1f} tokens/秒, 结束原因 {metrics.stop_reason}",
+            extra={"event": "llm", "ttft": round(metrics.ttft, 4), "seconds": round(metrics.seconds, 4),
+                   "count": metrics.tokens, "tokens_per_second": round(metrics.tokens_per_second, 2),
+                   "stop_reason": metrics.stop_reason}
+        )
+
+    def snapshot(self):
+        """
+        当前的累计指标，传给 summary(since=...) 可得到之后新增部分的汇总
+        """
+        with self._lock:
+            return dict(self.totals)
+
+    def summary(self, since=None):
+        """
+        汇总指标
+
+        Args:
+            since (dict): 可选，snapshot() 的返回值，只汇总此后的请求
+
+        Returns:
+            dict: 请求数、总 token 数、平均首 token 延迟、平均生成速度、提前结束次数
+        """
+        totals = self.snapshot()
+        if since:
+            totals = {key: value - since.get(key, 0) for key, value in totals.items()}
+        requests_count = totals["requests"]
+        return {
+            "requests": requests_count,
+            "tokens": totals["tokens"],
+            "avg_ttft": totals["ttft"] / requests_count if requests_count else 0.0,
+            "tokens_per_second": totals["tokens"] / totals["seconds"] if totals["seconds"] else 0.0,
+            "stopped_early": totals["stopped_early"],
+        }
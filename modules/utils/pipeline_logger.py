@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+处理流程日志
+基于标准库 logging，控制台按级别输出，可选 JSON Lines 文件记录各阶段条数和耗时，
+批量回填时默认不再逐行打印原始数据
+"""
+
+import json
+import logging
+import time
+
+# 项目统一使用的日志名称
+LOGGER_NAME = "news_day"
+
+# 写入 JSON Lines 时额外保留的字段
+_EXTRA_FIELDS = ("event", "date", "stage", "count", "seconds", "ttft", "tokens_per_second", "stop_reason")
+
+
+def get_logger():
+    """
+    获取项目日志对象
+    """
+    return logging.getLogger(LOGGER_NAME)
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    将日志记录格式化为一行 JSON
+    """
+
+    def format(self, record):
+        entry = {
+            "time": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(record.created)),
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        for field in _EXTRA_FIELDS:
+            if hasattr(record, field):
+                entry[field] = getattr(record, field)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def setup_logging(level="INFO", jsonl_path=None):
+    """
+    配置项目日志
+
+    Args:
+        level (str): 控制台日志级别（DEBUG、INFO、WARNING、ERROR）
+        jsonl_path (str): 可选，JSON Lines 日志文件路径（追加写入，记录 INFO 及以上级别）
+
+    Returns:
+        logging.Logger: 项目日志对象
+    """
+    logger = get_logger()
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+    console = logging.StreamHandler()
+    console.setLevel(getattr(logging, level.upper(), logging.INFO))
+    console.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(console)
+
+    if jsonl_path:
+        sink = logging.FileHandler(jsonl_path, encoding="utf-8")
+        sink.setLevel(logging.INFO)
+        sink.setFormatter(JsonLinesFormatter())
+        logger.addHandler(sink)
+
+    return logger
+
+
+def log_stage(stage, count, seconds, date=None):
+    """
+    记录一个处理阶段的条数和耗时
+    """
+    extra = {"event": "stage", "stage": stage, "count": count, "seconds": round(seconds, 4)}
+    if date is not None:
+        extra["date"] = date
+    get_logger().info(f"  阶段 {stage}: {count} 条, 耗时 {seconds:.3f} 秒", extra=extra)
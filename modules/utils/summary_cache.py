@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+新闻摘要持久化缓存
+以（规范化文本、模型名、提示词版本）的哈希为键，将大模型摘要保存在 SQLite 文件中，
+按占用空间做 LRU 淘汰，重复运行或回填历史数据时可直接跳过大模型调用
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+# 默认缓存文件位置
+DEFAULT_CACHE_PATH = os.path.join("datas", "summary_cache.sqlite3")
+
+# 默认缓存上限（字节）
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def normalize_text(text):
+    """
+    规范化新闻文本：去掉首尾空白并合并连续空白
+    """
+    return re.sub(r'\s+', ' ', text.strip())
+
+
+def make_cache_key(text, model, prompt_version):
+    """
+    计算缓存键
+    """
+    raw = "\x1f".join([normalize_text(text), model, str(prompt_version)])
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class SummaryCache:
+    """
+    基于 SQLite 的摘要缓存，线程安全，可供并发摘要线程共用
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+            path (str): SQLite 文件路径
+            max_bytes (int): 缓存内容总大小上限，超过后按最久未使用淘汰
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS summaries ("
+            " key TEXT PRIMARY KEY,"
+            " model TEXT NOT NULL,"
+            " prompt_version TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_summaries_last_used ON summaries (last_used)")
+        self._conn.commit()
+
+    def get(self, text, model, prompt_version):
+        """
+        查询缓存，命中时返回摘要字典并刷新使用时间，未命中返回 None
+        """
+        key = make_cache_key(text, model, prompt_version)
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM summaries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE summaries SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, text, model, prompt_version, summary):
+        """
+        写入缓存，并在超过容量上限时淘汰最久未使用的条目
+        """
+        key = make_cache_key(text, model, prompt_version)
+        value = json.dumps(summary, ensure_ascii=False)
+        size = len(value.encode('utf-8'))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, model, prompt_version, value, size, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, str(prompt_version), value, size, time.time())
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """
+        按最久未使用顺序删除条目，直到总大小不超过上限
+        """
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM summaries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        expired = []
+        for key, size in self._conn.execute("SELECT key, size FROM summaries ORDER BY last_used ASC"):
+            if total <= self.max_bytes:
+                break
+            expired.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM summaries WHERE key = ?", expired)
+
+    def stats(self):
+        """
+        获取命中统计
+        """
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM summaries"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": entries,
+            "bytes": total
+        }
+
+    def close(self):
+        """
+        关闭数据库连接
+        """
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+提示词长度估算
+不加载分词器，按字符类别粗略估算 token 数，用于在模型上下文长度内安排提示词
+"""
+
+import re
+
+# 汉字及中文标点按每字一个 token 计，ASCII 单词和数字按约四个字符一个 token 计
+_TOKEN_RE = re.compile(r'[\u3000-\u303f\u4e00-\u9fff\uff00-\uffef]|[A-Za-z0-9]+|\S')
+
+
+def estimate_tokens(text):
+    """
+    估算文本的 token 数（偏保守，实际通常更少）
+
+    Args:
+        text (str): 文本
+
+    Returns:
+        int: 估算的 token 数
+    """
+    count = 0
+    for piece in _TOKEN_RE.findall(text):
+        if len(piece) > 1:
+            count += (len(piece) + 3) // 4
+        else:
+            count += 1
+    return count
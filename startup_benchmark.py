@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+启动耗时基准
+在独立子进程中用 python -X importtime 导入各命令的入口模块，统计导入耗时、
+最慢的依赖，并检查是否意外导入了 akshare / pandas 等重量级依赖
+
+用法:
+    python startup_benchmark.py                       # 输出到控制台
+    python startup_benchmark.py --output startup_benchmark.md
+    python startup_benchmark.py --max-seconds 1       # 超过阈值时返回非零退出码
+"""
+
+import argparse
+import os
+import platform
+import statistics
+import subprocess
+import sys
+
+# 每晚运行的命令入口模块
+ENTRY_MODULES = [
+    "main",
+    "generate_news_html",
+    "process_latest_news",
+    "modules.publisher.generate_wechat_html",
+    "modules.publisher.news_summary_generator",
+    "modules.publisher.wechat_article_generator_v2",
+    "modules.publisher.wechat_publisher",
+]
+
+# 只有联网下载时才应该导入的重量级依赖
+HEAVY_MODULES = ("akshare", "pandas", "numpy", "llama_cpp")
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def parse_importtime(stderr):
+    """
+    解析 -X importtime 的输出
+
+    Returns:
+        list: [(模块名, 自身耗时微秒, 累计耗时微秒, 缩进层级)]
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_part, cumulative_part, name = line.split("|", 2)
+        self_us = int(self_part.split(":")[1])
+        cumulative_us = int(cumulative_part)
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        entries.append((name.strip(), self_us, cumulative_us, depth))
+    return entries
+
+
+def measure(module, repeat=3):
+    """
+    多次在子进程中导入模块，取中位数
+
+    Returns:
+        dict: 总耗时（秒）、最慢的依赖、导入的重量级依赖；导入失败时包含 error
+    """
+    totals = []
+    entries = []
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            return {"module": module, "error": proc.stderr.strip().splitlines()[-1]}
+        entries = parse_importtime(proc.stderr)
+        totals.append(sum(self_us for _, self_us, _, _ in entries) / 1e6)
+
+    # 入口模块的直接依赖排在它自己那一行之前、缩进为一级
+    direct = []
+    for name, _, cumulative, depth in reversed(entries[:-1]):
+        if depth == 0:
+            break
+        if depth == 1:
+            direct.append((name, cumulative))
+    direct.sort(key=lambda e: e[1], reverse=True)
+    imported = {name for name, _, _, _ in entries}
+    return {
+        "module": module,
+        "seconds": statistics.median(totals),
+        "slowest": [(name, cumulative / 1e6) for name, cumulative in direct[:3]],
+        "heavy": [name for name in HEAVY_MODULES if name in imported],
+    }
+
+
+def describe_environment():
+    """
+    测量环境：Python 版本、系统、CPU 数和当前提交，数值只在同一环境下可比
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return (f"Python {sys.version.split()[0]}，{platform.system()} {platform.machine()}，"
+            f"{os.cpu_count()} 个 CPU，提交 {commit or '未知'}")
+
+
+def format_report(results):
+    """
+    生成 Markdown 格式的报告
+    """
+    lines = [
+        "# 启动耗时基准",
+        "",
+        f"{describe_environment()}，由 `python startup_benchmark.py` 生成，"
+        "数值为多次导入的中位数（含解释器 site 初始化）。",
+        "",
+        "| 入口模块 | 导入耗时 | 最慢的依赖 | 重量级依赖 |",
+        "| --- | --- | --- | --- |",
+    ]
+    for r in results:
+        if "error" in r:
+            lines.append(f"| {r['module']} | 导入失败 | {r['error']} | |")
+            continue
+        slowest = ", ".join(f"{name} {seconds:.3f}s" for name, seconds in r["slowest"])
+        lines.append(f"| {r['module']} | {r['seconds']:.3f}s | {slowest} | {', '.join(r['heavy']) or '无'} |")
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='各命令入口模块的启动耗时基准')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='每个模块导入次数 (默认: 3)')
+    parser.add_argument('--output', type=str,
+                        help='将 Markdown 报告写入该文件')
+    parser.add_argument('--max-seconds', type=float,
+                        help='任一模块导入耗时超过该值或导入了重量级依赖时返回非零退出码')
+    parser.add_argument('modules', nargs='*', default=ENTRY_MODULES,
+                        help='要测量的模块 (默认: 全部命令入口)')
+    args = parser.parse_args()
+
+    results = [measure(module, args.repeat) for module in args.modules]
+    report = format_report(results)
+    print(report)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report)
+        print(f"报告已保存到 {args.output}")
+
+    if args.max_seconds is not None:
+        slow = [r["module"] for r in results
+                if "error" in r or r["seconds"] > args.max_seconds or r["heavy"]]
+        if slow:
+            print(f"超出启动耗时要求: {', '.join(slow)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,58 @@
 
 import sys
 import os
+import random
+import re
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from main import NewsProcessor
 
+
+def _reference_split_by_numeric_markers(text):
+    """
+    原先 O(m²) 的数字标识分割实现，作为等价性测试的参照
+    """
+    pattern = r'(?:(?:[一二三四五六七八九十]+|[1-9]\d*)[:：]\s*)'
+    matches = list(re.finditer(pattern, text))
+    if not matches:
+        return [text]
+
+    sub_segments = []
+    last_end = 0
+    for match in matches:
+        if match.start() > last_end:
+            prev_text = text[last_end:match.start()].strip()
+            if prev_text:
+                sub_segments.append(prev_text)
+
+        marker = match.group(0)
+        marker_end = match.end()
+
+        next_start = len(text)
+        for next_match in matches:
+            if next_match.start() > match.end():
+                next_start = next_match.start()
+                break
+
+        segment_content = text[marker_end:next_start].strip()
+        if segment_content:
+            sub_segments.append(marker + segment_content)
+        else:
+            sub_segments.append(marker)
+
+        last_end = next_start
+
+    if last_end < len(text):
+        remaining_text = text[last_end:].strip()
+        if remaining_text:
+            if re.match(r'^(?:[一二三四五六七八九十]+|[1-9]\d*)[:：]\s*$', sub_segments[-1]):
+                sub_segments[-1] = sub_segments[-1] + remaining_text
+            else:
+                sub_segments.append(remaining_text)
+
+    sub_segments = [seg for seg in sub_segments if seg.strip()]
+    return sub_segments if sub_segments else [text]
+
 def test_numeric_segmentation():
     """
     测试数字标识分割功能
@@ -78,7 +126,69 @@ def test_real_news_segmentation():
         print(f"{i+1}: {segment}")
         print(f"   (长度: {len(segment)} 字符)\n")
 
+def test_numeric_split_equivalence():
+    """
+    随机生成大量包含数字标识的文本，验证单次遍历的分割结果与原实现完全一致
+    """
+    processor = NewsProcessor()
+    rng = random.Random(20251104)
+    # 覆盖相邻标识、多位数字、中文数字、全角冒号、空白和普通文字
+    alphabet = ['1', '2', '9', '0', '10', '一', '十', ':', '：', ' ', '\n', '新', '闻', '。', '、']
+
+    cases = ["", "1:", "1:2:3:", "一：国内 二：国际", "10: 20:  ", "会议 1: 开幕 2:"]
+    for _ in range(5000):
+        cases.append(''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 40))))
+
+    for text in cases:
+        assert processor._split_by_numeric_markers(text) == _reference_split_by_numeric_markers(text), text
+    print(f"{len(cases)} 个随机用例分割结果一致")
+
+
+def test_summaries_stream_before_international_marker():
+    """
+    验证国内新闻在读到国际新闻标识之前就开始摘要，且分类结果不变
+    """
+    processor = NewsProcessor(use_cache=False, llm_workers=1, llm_batch_size=1)
+    events = []
+
+    def summarize(text, hits=None):
+        events.append(('summary', text))
+        return processor.simple_summarize(text, hits), "简单程序"
+
+    processor._summarize_segment = summarize
+
+    raw_lines = [
+        "一、国务院召开常务会议，部署推进经济高质量发展。",
+        "二、全国秋粮收购进度过半，各地加强粮食储备。",
+        "三、北京举办科技创新成果展，展示人工智能等领域成果。",
+        "下面来看几条国际新闻。",
+        "当地时间11月3日，联合国大会通过决议，呼吁加强国际合作。",
+    ]
+
+    def raw_content():
+        for line in raw_lines:
+            events.append(('read', line))
+            yield line
+
+    items = list(processor.stream_raw_content(raw_content()))
+    marker_read = events.index(('read', raw_lines[3]))
+    first_summary = next(i for i, event in enumerate(events) if event[0] == 'summary')
+    print(f"第一条摘要在第 {first_summary} 个事件，国际新闻标识在第 {marker_read} 个事件读入")
+    assert first_summary < marker_read
+
+    segments = [item['text'] for item in items]
+    assert [item['category'] for item in items] == [
+        category for category, _, _ in processor.iter_classified(segments)
+    ]
+    assert [item['category'] for item in items[:3]] == ['domestic'] * 3
+    assert items[-1]['category'] == 'international'
+
+
 if __name__ == "__main__":
     test_numeric_segmentation()
     print("\n" + "="*50 + "\n")
-    test_real_news_segmentation()
\ No newline at end of file
+    test_real_news_segmentation()
+    print("\n" + "="*50 + "\n")
+    test_numeric_split_equivalence()
+    print("\n" + "="*50 + "\n")
+    test_summaries_stream_before_international_marker()
\ No newline at end of file